@@ -0,0 +1,366 @@
+import re
+import math
+import unicodedata
+from collections import Counter
+from urllib.parse import unquote
+
+'''
+Country names input to the country_name endpoints are matched against the ISO 3166-1 country
+names using rapidfuzz's fuzz.ratio, scoring every one of the ~250 names for each input name. The
+vast majority of inputs are an exact country name, or a common alias of one, e.g "Russia", so
+the CountryNameIndex below precomputes a table of every country name and alias, normalized,
+mapped to its alpha-2 code. An exact match is then a single dict lookup, with the fuzzy scoring
+only needed when the input name isn't in the table.
+
+When a lower likeness score is input, the fuzzy matching can't be skipped, but most country names
+can't possibly reach the score. The ratio of two strings is 100 * (1 - d / (len_a + len_b)), where
+d is their insertion/deletion distance, so a minimum score bounds d, and so the number of edits.
+Each edit changes at most 3 of a string's padded character trigrams, so a name within d edits of
+the input shares at least max(len_a, len_b) + 2 - 3d trigrams with it. A trigram inverted index
+over the names then gives the smaller set of candidate names that can reach the score, with only
+those scored by fuzz.ratio, already processed. The names are only processed, and the trigram index
+built, on the first fuzzy match, with rapidfuzz imported then, so a worker serving only exact
+names never imports it.
+
+Country codes input to the alpha endpoints are resolved by the CountryCodeIndex, a single table of
+every ISO 3166-1 alpha-2, alpha-3 and numeric code to its alpha-2 code, built once, rather than
+scanning lists of each kind of code per input code. A comma separated list of codes is resolved
+in one pass, collecting every invalid code so they can all be reported together.
+'''
+
+#character used to pad names before splitting them into trigrams, not found in names processed by rapidfuzz
+_TRIGRAM_PAD = "$"
+
+def trigrams(processed_name: str) -> Counter:
+    """ Get the multiset of character trigrams of a name, as processed by rapidfuzz, padded with 2 characters either side. """
+    padded = f"{_TRIGRAM_PAD * 2}{processed_name}{_TRIGRAM_PAD * 2}"
+    return Counter(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a country name for lookup in the alias table: percent-decoded, e.g "Cura%C3%A7ao",
+    case-folded, accents stripped, e.g "Côte" -> "cote", and any punctuation replaced by whitespace,
+    with consecutive whitespace collapsed, e.g "Virgin Islands, (British)" -> "virgin islands british".
+
+    Parameters
+    ==========
+    :name: str
+        country name.
+
+    Returns
+    =======
+    :normalized_name: str
+        normalized country name.
+    """
+    name = unicodedata.normalize("NFKD", unquote(name).casefold())
+    name = "".join(char for char in name if not unicodedata.combining(char))
+    return " ".join(re.sub(r"[\W_]+", " ", name).split())
+
+class CountryNameIndex():
+    """
+    Precomputed lookup table of country names and aliases to their ISO 3166-1 alpha-2 codes, keyed
+    by normalized name. Each alias maps to the official name it is converted to, and through it to
+    that country's alpha-2 code. The country names are also kept, in order, as the choices that
+    input names not found in the table are fuzzy matched against, with a trigram inverted index
+    over them pruning the choices that can't reach the minimum score.
+
+    Parameters
+    ==========
+    :names: dict
+        alpha-2 code of each official country name, e.g {"FRANCE": "FR", ...}.
+    :aliases: dict (default=None)
+        official country name of each alias, e.g {"Russia": "Russian Federation", ...}.
+        Aliases whose official name isn't found in the names aren't resolvable to an
+        alpha-2 code, but are still converted into their official name.
+
+    Methods
+    =======
+    resolve(name):
+        get the alpha-2 code of a country name or alias, None if not in the table.
+    convert(name):
+        get the official name of an alias, else the input name.
+    alpha2(name):
+        get the alpha-2 code of an official country name, as output by the fuzzy matching.
+    candidates(names, score_cutoff):
+        get the indices of the country names that could fuzzy match each input name with at least the score.
+    extract(names, score_cutoff, limit):
+        get the best fuzzy matches of each input name from its candidate country names.
+
+    Usage
+    =====
+    from country_lookup import CountryNameIndex
+
+    country_name_index = CountryNameIndex({name: country.alpha2 for name, country in iso3166.countries_by_name.items()})
+
+    #get the alpha-2 code of France, "FR"
+    country_name_index.resolve("france")
+    """
+    def __init__(self, names: dict[str, str], aliases: dict[str, str]|None=None) -> None:
+
+        #official country names, whitespace stripped, the choices for fuzzy matching
+        self.names = tuple(name.strip(' ') for name in names)
+        self._alpha2_by_name = {name.strip(' ').upper(): alpha2 for name, alpha2 in names.items()}
+
+        #country names as processed by rapidfuzz and their trigram index, built on the first fuzzy match
+        self._processed_names = None
+
+        #(input name length, score cutoff) -> minimum shared trigrams per country name length, memoized
+        self._length_bounds = {}
+
+        #normalized alias -> official name
+        self._converted = {normalize_name(alias): official_name for alias, official_name in (aliases or {}).items()}
+
+        #normalized country name or alias -> alpha-2 code, an alias takes precedence over a name normalized the same
+        self._alias_table = {normalize_name(name): alpha2 for name, alpha2 in names.items()}
+        for alias, official_name in self._converted.items():
+            alpha2 = self._alias_table.get(normalize_name(official_name))
+            if (alpha2 is not None):
+                self._alias_table[alias] = alpha2
+
+    def _build_fuzzy_index(self) -> None:
+        """ Process the country names with rapidfuzz's default processor, group them by length and build their trigram index, once, on the first fuzzy match. """
+        from rapidfuzz.utils import default_process
+
+        #country names as processed by rapidfuzz, with their lengths, grouped by length
+        processed_names = tuple(default_process(name) for name in self.names)
+        self._name_lengths = tuple(len(processed_name) for processed_name in processed_names)
+        self._names_by_length = {}
+        for name_index, length in enumerate(self._name_lengths):
+            self._names_by_length.setdefault(length, []).append(name_index)
+
+        #trigram -> indices of the country names containing it, an index repeated for each occurrence of the trigram
+        self._trigram_index = {}
+        for name_index, processed_name in enumerate(processed_names):
+            for trigram, count in trigrams(processed_name).items():
+                self._trigram_index.setdefault(trigram, []).extend([name_index] * count)
+
+        #set last, so other threads only use the index once it's complete
+        self._processed_names = processed_names
+
+    def resolve(self, name: str) -> str|None:
+        """
+        Get the alpha-2 code of the country name or alias, a single lookup of the normalized name.
+
+        Parameters
+        ==========
+        :name: str
+            country name or alias.
+
+        Returns
+        =======
+        :alpha2: str|None
+            alpha-2 code of the country, None if the name isn't in the table.
+        """
+        return self._alias_table.get(normalize_name(name))
+
+    def convert(self, name: str) -> str:
+        """ Get the official country name of the alias, e.g "Russia" -> "Russian Federation", else the input name. """
+        return self._converted.get(normalize_name(name), name)
+
+    def alpha2(self, name: str) -> str:
+        """ Get the alpha-2 code of one of the official country names, e.g as output by the fuzzy matching. """
+        return self._alpha2_by_name[name.upper()]
+
+    def candidates(self, names: list[str], score_cutoff: int=0) -> dict[str, list[int]]:
+        """
+        Get the indices of the country names that could have a fuzz.ratio score of at least the
+        score cutoff with each input name, once both are processed by rapidfuzz, with all other names
+        pruned. For each name length, the score cutoff bounds the number of edits between the names,
+        and so the minimum number of trigrams they share, which is checked against the number of
+        the input name's trigrams in each country name, counted from the inverted index's postings
+        in one pass for all input names.
+
+        Parameters
+        ==========
+        :names: list
+            input names to fuzzy match.
+        :score_cutoff: int (default=0)
+            minimum score of a match, as rounded by thefuzz.
+
+        Returns
+        =======
+        :candidates: dict
+            indices of the candidate country names of each input name, in ascending order.
+        """
+        from rapidfuzz.utils import default_process
+        if (self._processed_names is None):
+            self._build_fuzzy_index()
+        processed_names = {name: default_process(name) for name in names}
+
+        #minimum number of trigrams shared with each input name, per country name length
+        min_shared_trigrams = {name: self._min_shared_trigrams(len(processed_name), score_cutoff) for name, processed_name in processed_names.items()}
+
+        #count the input names' trigrams in each country name, walking each trigram's postings once, a count is never less than 
+        # the number shared, only for names with a positive minimum
+        input_trigrams = {}
+        for name, processed_name in processed_names.items():
+            if any(min_shared > 0 for min_shared in min_shared_trigrams[name].values()):
+                for trigram in trigrams(processed_name):
+                    input_trigrams.setdefault(trigram, []).append(name)
+        shared_trigrams = {name: Counter() for name in processed_names}
+        for trigram, trigram_names in input_trigrams.items():
+            postings = self._trigram_index.get(trigram)
+            if (postings):
+                for name in trigram_names:
+                    shared_trigrams[name].update(postings)
+
+        candidates = {}
+        for name in processed_names:
+            name_indices = []
+            for length, min_shared in min_shared_trigrams[name].items():
+                if (min_shared <= 0):
+                    name_indices.extend(self._names_by_length[length])
+            name_indices.extend(name_index for name_index, count in shared_trigrams[name].items()
+                                if 0 < min_shared_trigrams[name].get(self._name_lengths[name_index], 0) <= count)
+            candidates[name] = sorted(name_indices)
+        return candidates
+
+    def _min_shared_trigrams(self, input_length: int, score_cutoff: int) -> dict[int, int]:
+        """
+        Get the minimum number of trigrams a country name of each length must share with an input name of the input length to 
+        reach the score cutoff, lengths whose names can't reach the cutoff excluded. Memoized, as it only depends on the lengths.
+        """
+        key = (input_length, score_cutoff)
+        if (key not in self._length_bounds):
+            min_shared_trigrams = {}
+            for length in self._names_by_length:
+                #maximum distance of a name of this length with a score that rounds to at least the cutoff
+                max_distance = math.floor((input_length + length) * (100.5 - score_cutoff) / 100 + 1e-9)
+                if (abs(input_length - length) <= max_distance):
+                    min_shared_trigrams[length] = max(input_length, length) + 2 - 3 * max_distance
+            self._length_bounds[key] = min_shared_trigrams
+        return self._length_bounds[key]
+
+    def extract(self, names: list[str], score_cutoff: int=0, limit: int=5) -> dict[str, list[tuple[str, int]]]:
+        """
+        Fuzzy match each input name against the country names, as per thefuzz's process.extract
+        with the fuzz.ratio scorer, but only scoring each name's candidates from the trigram
+        index, using the country names already processed by rapidfuzz. The best matches at or above
+        the score cutoff are the same as process.extract's, in the same order.
+
+        Parameters
+        ==========
+        :names: list
+            input names to fuzzy match.
+        :score_cutoff: int (default=0)
+            minimum score of a match, as rounded by thefuzz.
+        :limit: int (default=5)
+            maximum number of matches of each name.
+
+        Returns
+        =======
+        :name_matches: dict
+            (country name, score) matches of each input name, best first.
+        """
+        if not (names):
+            return {}
+        from rapidfuzz import fuzz as rfuzz, process as rprocess
+        from rapidfuzz.utils import default_process
+        name_matches = {}
+        for name, name_indices in self.candidates(names, score_cutoff).items():
+            #matches are ordered on their unrounded scores, as per thefuzz, with those that can round to the cutoff included
+            matches = rprocess.extract(default_process(name), [self._processed_names[name_index] for name_index in name_indices], 
+                                       scorer=rfuzz.ratio, processor=None, score_cutoff=max(score_cutoff - 0.5, 0), limit=limit)
+            name_matches[name] = [(self.names[name_indices[choice_index]], int(round(score))) for _, score, choice_index in matches]
+        return name_matches
+
+    def __contains__(self, name: str) -> bool:
+        return normalize_name(name) in self._alias_table
+
+    def __len__(self) -> int:
+        return len(self._alias_table)
+
+    def __repr__(self) -> str:
+        return f"CountryNameIndex(names={len(self.names)}, aliases={len(self._converted)})"
+
+class CountryCodeIndex():
+    """
+    Precomputed, case-insensitive lookup table of every ISO 3166-1 alpha-2, alpha-3 and numeric
+    country code to its alpha-2 code.
+
+    Parameters
+    ==========
+    :countries: iterable
+        countries with alpha2, alpha3 and numeric attributes, e.g iso3166.countries.
+
+    Methods
+    =======
+    resolve(code):
+        get the alpha-2 code of an alpha-2, alpha-3 or numeric code, None if invalid.
+    resolve_all(codes):
+        get the alpha-2 codes of a comma separated list of codes, and all of its invalid codes.
+
+    Usage
+    =====
+    from country_lookup import CountryCodeIndex
+
+    country_code_index = CountryCodeIndex(iso3166.countries)
+
+    #get the alpha-2 codes of France, Germany and Italy, (["FR", "DE", "IT"], [])
+    country_code_index.resolve_all("fr, DEU, 380")
+    """
+    def __init__(self, countries) -> None:
+
+        #uppercase alpha-2, alpha-3 and numeric code -> alpha-2 code
+        self._alpha2_by_code = {}
+        for country in countries:
+            for code in (country.alpha2, country.alpha3, country.numeric):
+                self._alpha2_by_code[code.upper()] = country.alpha2
+
+    def resolve(self, code: str) -> str|None:
+        """
+        Get the alpha-2 code of the ISO 3166-1 alpha-2, alpha-3 or numeric code, in any case and
+        without surrounding whitespace, a single lookup in the table.
+
+        Parameters
+        ==========
+        :code: str
+            alpha-2, alpha-3 or numeric country code.
+
+        Returns
+        =======
+        :alpha2: str|None
+            alpha-2 code of the country, None if the code is invalid.
+        """
+        return self._alpha2_by_code.get(code.strip().upper())
+
+    def resolve_all(self, codes: str|list[str]) -> tuple[list[str], list[str]]:
+        """
+        Resolve each of the comma separated, or listed, ISO 3166-1 alpha-2, alpha-3 and numeric codes
+        into its alpha-2 code in one pass, skipping empty codes, e.g from a trailing comma. Rather than
+        stopping at the first invalid code, every invalid code is output, so all can be reported.
+
+        Parameters
+        ==========
+        :codes: str|list
+            comma separated string, or list, of country codes.
+
+        Returns
+        =======
+        :alpha2_codes: list
+            alpha-2 codes of the valid codes, without duplicates, in input order.
+        :invalid_codes: list
+            invalid codes, without surrounding whitespace, in input order.
+        """
+        if isinstance(codes, str):
+            codes = codes.split(",")
+        alpha2_codes, invalid_codes = {}, []
+        for code in codes:
+            code = code.strip()
+            if not (code):
+                continue
+            alpha2 = self._alpha2_by_code.get(code.upper())
+            if (alpha2 is None):
+                invalid_codes.append(code)
+            else:
+                alpha2_codes.setdefault(alpha2)
+        return list(alpha2_codes), invalid_codes
+
+    def __contains__(self, code: str) -> bool:
+        return self.resolve(code) is not None
+
+    def __len__(self) -> int:
+        return len(self._alpha2_by_code)
+
+    def __repr__(self) -> str:
+        return f"CountryCodeIndex(codes={len(self._alpha2_by_code)})"
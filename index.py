@@ -1,14 +1,30 @@
-from flask import Flask, request, render_template, jsonify, send_from_directory
+import time
+#time the API started importing, the start of a worker's cold start
+_import_start = time.perf_counter()
+from flask import Flask, Response, g, request, render_template, jsonify, send_from_directory, has_request_context
 import iso3166
-from iso3166_updates import *
 import re
 import os
+import sys
+import threading
+import json
+import base64
+import hashlib
 import urllib.parse
-from thefuzz import fuzz, process
+import importlib.metadata
 from urllib.parse import unquote
 from datetime import datetime, timezone
-from functools import lru_cache
+from functools import lru_cache, wraps
+from itertools import chain
+from typing import NamedTuple
 from flask_cors import CORS
+from updates_store import UpdatesStore
+from snapshot import open_snapshot, default_snapshot_path
+from query_engine import QueryEngine, QuerySpec
+from search_cache import SearchCache
+from country_lookup import CountryNameIndex, CountryCodeIndex
+from suggest_index import SuggestIndex, Suggestion, suggestion_types, word_keys
+from response_cache import ResponseCache, canonical_query_key, encodings, compress, compress_stream
 
 ########################################################## Endpoints ##########################################################
 '''
@@ -26,6 +42,16 @@ from flask_cors import CORS
 /api/date_range/<input_date_range> -  return all updates data within the specified date range.
 /api/date_range/<input_date_range>/alpha/<input_alpha> - return all updates data within the specified date range for input country
       using its ISO 3166-1 alpha-2, alpha-3 or numeric codes
+/api/country_name/<input_country_name>/date_range/<input_date_range> - return all updates data within the specified date range for 
+      input country name
+/api/search/<search_term>/year/<input_year> - return all updates that have the inputted search term/terms, published in the input 
+      year, list of years, year range, greater/less than input year or not equal to a year
+/api/search/<search_term>/date_range/<input_date_range> - return all updates that have the inputted search term/terms, published 
+      within the specified date range
+/api/batch - run a POSTed JSON array of queries, each combining the alpha, country_name, year, date_range and search filters,
+      returning each query's updates keyed by its id
+/api/suggest/<input_prefix> - return the top completions of a prefix, from the country names and aliases, ISO 3166-1 alpha-2, 
+      alpha-3 and numeric codes and the words of the updates, ranked by their number of updates
 '''
 ###############################################################################################################################
 
@@ -47,6 +73,28 @@ excludeMatchScore - this parameter allows you to exclude the matchScore attribut
 /api/search endpoint. The match score is the % of a match each returned updates data object is to the search terms, with 100% 
 being an exact match. By default the match score is returned for each object, e.g /api/search/addition?excludeMatchScore=1, 
 /api/search/New York?excludeMatchScore=1 (default=0).
+
+timeout_ms - this parameter sets the time budget in milliseconds of the /api/search endpoint, by default _SEARCH_TIMEOUT_MS. If the
+search terms aren't all matched within it, the best matches found so far are returned, with partial=true and the fraction of the 
+search done as scanned in the metadata object, e.g /api/search/Paris?likeness=10&timeout_ms=50.
+
+cursor - this parameter allows you to page through results using the opaque next_cursor token output in the metadata object of
+a paginated response, e.g /api/all?limit=20 followed by /api/all?limit=20&cursor=<next_cursor>. Each page starts directly after 
+the last country or update of the previous page, rather than skipping over an offset. It cannot be used alongside the offset 
+parameter and must be used with the same endpoint, sortBy and search parameters as the request that output it.
+'''
+###############################################################################################################################
+
+##################################################### Cold Start ##############################################################
+'''
+On serverless hosting each cold start imports the API and loads the updates data before serving its first request. The updates
+store is loaded from the prebuilt snapshot (see snapshot.py) rather than built from the iso3166-updates dataset, and the heavy 
+packages only needed by some endpoints are imported on first use: iso3166-updates, with requests, pycountry and thefuzz, only 
+when the store has to be built from the dataset or a search term is checked for a date, and rapidfuzz only by the 
+first fuzzy country name match or search. Likewise, each index is built by the first request that needs it, so e.g /api/alpha
+never builds the search index. The time taken by each stage of start up, importing the API, loading the updates store and 
+building each index, is recorded and output by the startup report, via /startup-report in debug mode or from a terminal with
+"python index.py --startup-report", which cold starts a worker and builds every index.
 '''
 ###############################################################################################################################
 
@@ -64,15 +112,212 @@ app.url_map.strict_slashes = False
 _RATE_LIMIT_PER_HOUR = 500
 _RATE_LIMIT_WINDOW_SECS = 3600  # 1 hour
 
-@lru_cache()
+#minimum size in bytes of a data endpoint response body for it to be compressed on the fly, smaller bodies gain little from compression
+_COMPRESSION_MIN_SIZE = 1024
+
+#approximate size in bytes of each chunk yielded by streamed responses
+_STREAM_CHUNK_SIZE = 16384
+
+#maximum total number of matches of the searches held in the search cache, and the time to live of each cached search
+_SEARCH_CACHE_MAX_SIZE = 50000
+_SEARCH_CACHE_TTL_SECS = 3600
+
+#path of the prebuilt binary snapshot of the updates dataset and its indexes, built via "python snapshot.py", memory mapped 
+#and shared by all worker processes, if it exists and is of the installed iso3166-updates version
+_SNAPSHOT_PATH = os.environ.get("ISO3166_UPDATES_SNAPSHOT", default_snapshot_path)
+
+#maximum total size in bytes of the pre-serialized response payloads held in the response cache
+_RESPONSE_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+#default time budget of a search in milliseconds, after which the best matches found so far are returned, overridden by timeout_ms
+_SEARCH_TIMEOUT_MS = 2000
+
+#default and maximum number of suggestions returned by the suggest endpoint
+_SUGGEST_DEFAULT_LIMIT = 10
+_SUGGEST_MAX_LIMIT = 100
+
+#data endpoints whose GET responses have ETag and Last-Modified validators, supporting conditional requests with 304 responses,
+#and are compressed with the gzip or deflate Content-Encoding accepted by the client
+data_endpoints = {"all", "api_alpha", "api_year", "api_alpha_year", "api_country_name", "api_country_name_year", 
+                         "api_search", "api_date_range", "api_date_range_alpha", "api_batch", "api_suggest"}
+
+#data endpoints whose ETag is computed from the canonical key of their query, once parsed, so every URL of the same query shares 
+#one ETag, rather than from the request URL, with their conditional requests checked via get_cached_query_response
+query_endpoints = {"all", "api_alpha", "api_year", "api_alpha_year", "api_date_range", "api_date_range_alpha", "api_country_name", "api_country_name_year"}
+
+#maximum number of queries in the JSON array body of a batch request
+_BATCH_MAX_QUERIES = 500
+
+#keys accepted in each query of a batch request, the filters and parameters of the GET endpoints
+_BATCH_QUERY_KEYS = {"id", "alpha", "country_name", "year", "date_range", "search", "sortBy", "sortby", "fields", "likeness", 
+                     "excludeMatchScore", "excludematchscore", "exclude", "limit", "offset", "cursor"}
+
+#packages imported on first use rather than on start up, as they're slow to import, reported as loaded or not by the startup report
+deferred_imports = ("iso3166_updates", "requests", "pycountry", "thefuzz", "rapidfuzz")
+
+#seconds taken by each stage of start up, recorded by each cache function as it's first run, excluding the stages it runs in
+#turn, and the source the updates store was loaded from, a snapshot or the dataset
+startup_timings = {"stages": {}, "load_source": None}
+_startup_stack = threading.local()
+
+def startup_stage(stage: str):
+    """
+    Decorator recording the seconds taken by a stage of start up, the decorated function, in startup_timings. 
+    The time of any stages run by the function is excluded, e.g the updates store loaded while building an 
+    index, so each stage is only counted once. Applied beneath lru_cache, so only the first run is timed.
+
+    Parameters
+    ==========
+    :stage: str
+        name of the stage of start up.
+
+    Returns
+    =======
+    :decorator: function
+        decorator timing the function.
+    """
+    def decorator(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            #seconds taken by the stages nested in each running stage of this thread
+            nested_secs = _startup_stack.__dict__.setdefault("nested_secs", [])
+            nested_secs.append(0.0)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                startup_timings["stages"][stage] = elapsed - nested_secs.pop()
+                if (nested_secs):
+                    nested_secs[-1] += elapsed
+        return wrapper
+    return decorator
+
+def startup_report() -> dict:
+    """
+    Get the startup report of this worker, the milliseconds taken by each stage of its start up: importing
+    the API, loading the updates store, and where it was loaded from, and building each index, with the
+    deferred packages imported so far. Stages not yet run, e.g an index no request has needed, are absent.
+
+    Parameters
+    ==========
+    None
+
+    Returns
+    =======
+    :startup_report: dict
+        import, load and index build times in milliseconds, with their total.
+    """
+    stages = {stage: round(secs * 1000, 2) for stage, secs in startup_timings["stages"].items()}
+    import_ms, load_ms = stages.pop("import", None), stages.pop("load", None)
+    return {"import_ms": import_ms, "load_ms": load_ms, "load_source": startup_timings["load_source"], "index_build_ms": stages, 
+            "total_ms": round((import_ms or 0) + (load_ms or 0) + sum(stages.values()), 2), 
+            "deferred_imports": {module: module in sys.modules for module in deferred_imports}}
+
+def warm_up() -> dict:
+    """ Load the updates store and build every index, as a cold started worker would over its first requests, outputting the startup report. """
+    get_query_engine().search_index
+    get_country_code_index()
+    get_country_name_index().extract(["france"])
+    get_suggest_index()
+    get_response_cache()
+    return startup_report()
+
 def get_updates_instance():
-    """ Cache function for initialization of Updates instance. """
+    """ 
+    Initialization of Updates instance, loading all updates data. Not cached, the compact updates store is the only copy of the 
+    data kept. iso3166-updates is imported on first use, as it imports requests, pycountry and thefuzz. 
+    """
+    from iso3166_updates import Updates
     return Updates()
 
+def convert_search_date(term: str) -> datetime|None:
+    """ 
+    Parse a search term into a datetime, as per the iso3166-updates convert_date_format function, None if it isn't a date. 
+    Every accepted date format has digits, so a term without any isn't a date, without importing iso3166-updates.
+    """
+    if not any(char.isdigit() for char in term):
+        return None
+    from iso3166_updates import Updates
+    return Updates.convert_date_format(term)
+
+@lru_cache()
+@startup_stage("load")
+def get_updates_store():
+    """ 
+    Cache function for the pre-parsed, immutable, compact record store of all updates data, loaded from the memory mapped 
+    snapshot if one has been built for the installed iso3166-updates version, else built from the updates data. 
+    """
+    installed_version = get_installed_version()
+    snapshot = open_snapshot(_SNAPSHOT_PATH, version=installed_version) if installed_version else None
+    if (snapshot is not None):
+        startup_timings["load_source"] = "snapshot"
+        return UpdatesStore.from_snapshot(snapshot)
+    startup_timings["load_source"] = "dataset"
+    updates = get_updates_instance()
+    return UpdatesStore(updates.all, version=updates.__version__)
+
+def get_installed_version() -> str|None:
+    """ Get the version of the installed iso3166-updates package, from its metadata, without loading its dataset. None if not found. """
+    try:
+        return importlib.metadata.version("iso3166-updates")
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+@lru_cache()
+@startup_stage("query_engine")
+def get_query_engine():
+    """ Cache function for the query engine answering the filters of each endpoint from the updates store's indexes. """
+    return QueryEngine(get_updates_store(), convert_date=convert_search_date, search_cache=get_search_cache(), search_index=get_search_index)
+
+@lru_cache()
+@startup_stage("search_index")
+def get_search_index():
+    """ Cache function for the inverted index of the words of the updates, built by the first search, importing rapidfuzz. """
+    from search_index import SearchIndex
+    return SearchIndex(get_updates_store())
+
+@lru_cache()
+def get_search_cache():
+    """ Cache function for the bounded LRU cache of recent searches' matches, keyed by normalized query and dataset version. """
+    return SearchCache(max_size=_SEARCH_CACHE_MAX_SIZE, ttl=_SEARCH_CACHE_TTL_SECS)
+
 @lru_cache()
-def get_all_updates():
-    """ Cache function for all data variable of Updates instance. """
-    return get_updates_instance().all
+@startup_stage("country_name_index")
+def get_country_name_index():
+    """ Cache function for the lookup table of normalized country names and aliases to their alpha-2 codes. """
+    return CountryNameIndex({name: country.alpha2 for name, country in iso3166.countries_by_name.items()}, aliases=names_converted)
+
+@lru_cache()
+@startup_stage("country_code_index")
+def get_country_code_index():
+    """ Cache function for the lookup table of every ISO 3166-1 alpha-2, alpha-3 and numeric code to its alpha-2 code. """
+    return CountryCodeIndex(iso3166.countries)
+
+@lru_cache()
+@startup_stage("suggest_index")
+def get_suggest_index():
+    """ Cache function for the sorted prefix index of country names, aliases, codes and search words, ranked by their number of updates. """
+    update_counts = {country_code: len(records) for country_code, records in get_updates_store().records_by_country.items()}
+    suggestions = []
+    for country in iso3166.countries_by_name.values():
+        count = update_counts.get(country.alpha2, 0)
+        suggestions.append((word_keys(country.name), Suggestion(country.name, "country_name", count, country.alpha2)))
+        suggestions.extend([([country.alpha2], Suggestion(country.alpha2, "alpha2", count, country.alpha2)), 
+                            ([country.alpha3], Suggestion(country.alpha3, "alpha3", count, country.alpha2)),
+                            ([country.numeric], Suggestion(country.numeric, "numeric", count, country.alpha2))])
+    for alias in names_converted:
+        alpha2 = get_country_name_index().resolve(alias)
+        if (alpha2 is not None):
+            suggestions.append((word_keys(alias), Suggestion(alias, "country_name", update_counts.get(alpha2, 0), alpha2)))
+    for word, postings in get_query_engine().search_index.postings.items():
+        suggestions.append(([word], Suggestion(word, "search", len(postings))))
+    return SuggestIndex(suggestions)
+
+@lru_cache()
+def get_response_cache():
+    """ Cache function for the pre-serialized JSON response payloads, keyed by canonical query and dataset version. """
+    return ResponseCache(dumps=dumps_compact, max_bytes=_RESPONSE_CACHE_MAX_BYTES)
 
 @app.route('/api')
 @app.route('/')
@@ -116,45 +361,35 @@ def all() -> tuple[dict, int]:
     #pull fields projection query string parameter (comma-separated field names to include in each update record)
     fields = request.args.get('fields', default="").strip()
 
-    #pull pagination parameters (limit/offset, applied at the country level for dict responses, record level for sorted list responses)
-    try:
-        limit = int(request.args.get('limit', default=0))
-        offset = int(request.args.get('offset', default=0))
-    except ValueError:
-        return jsonify(create_error_message("The limit and offset parameters must be non-negative integers.", request.url)), 400
-
-    if limit < 0 or offset < 0:
-        return jsonify(create_error_message("The limit and offset parameters must be non-negative integers.", request.url)), 400
+    #pull and validate pagination parameters (limit/offset/cursor, applied at the country level for dict responses, record level for sorted list responses)
+    cursor = request.args.get('cursor', default="").strip()
+    limit, offset, pagination_error, pagination_error_message = validate_pagination(request.args.get('limit', default="0"), request.args.get('offset', default="0"), cursor)
+    if (pagination_error):
+        return jsonify(create_error_message(pagination_error_message, request.url)), 400
 
-    #output var of all updates
-    all_updates = get_all_updates()
+    #all updates data is returned from the pre-serialized response cache, under the query's canonical key, if available
+    query_key = canonical_query_key("all", sort_by=sort_by, fields=parse_fields(fields), limit=limit, offset=offset, cursor=cursor)
+    cached_response = get_cached_query_response(query_key)
+    if (cached_response):
+        return cached_response
 
-    #if sortBy query string parameter set, call sort_by_date function to sort all updates data via the publication date
+    #if sortBy query string parameter set, get the page of all updates data pre-sorted via the publication date from the updates store,
+    #otherwise get the page of countries from all updates data
     if (sort_by == 'dateasc' or sort_by == 'datedesc'):
-        all_updates = sort_by_date(get_all_updates(), date_asc_desc=sort_by)
-
-    #calculate total record count before pagination (used in metadata)
-    if isinstance(all_updates, list):
-        total_records = len(all_updates)
+        all_updates, next_cursor = paginate_records_by_date(get_updates_store().records_by_country, date_asc_desc=sort_by, limit=limit, offset=offset, cursor=cursor,
+                                                            streamed=is_streamed_request())
     else:
-        total_records = sum(len(v) for v in all_updates.values() if isinstance(v, list))
-
-    #apply pagination when limit or offset are explicitly specified
-    metadata_extra = {}
-    if limit > 0 or offset > 0:
-        if isinstance(all_updates, dict):
-            country_keys = list(all_updates.keys())
-            paginated_keys = country_keys[offset:offset + limit] if limit > 0 else country_keys[offset:]
-            all_updates = {k: all_updates[k] for k in paginated_keys}
-        else:  # flat list (sortBy case) — paginate by record
-            all_updates = all_updates[offset:offset + limit] if limit > 0 else all_updates[offset:]
-        metadata_extra = {"total": total_records, "offset": offset, "limit": limit if limit > 0 else None}
+        all_updates, next_cursor = paginate(get_updates_store().records_by_country, limit, offset, cursor)
+        all_updates = records_to_updates(all_updates, streamed=is_streamed_request())
+
+    #total record count before pagination and cursor of the next page, included in metadata when limit, offset or cursor are explicitly specified
+    metadata_extra = pagination_metadata(len(get_updates_store()), limit, offset, cursor, next_cursor)
 
     #apply fields projection filter
     if fields:
         all_updates = apply_fields_filter(all_updates, fields)
 
-    return create_response(all_updates, **metadata_extra), 200
+    return create_query_response(query_key, all_updates, **metadata_extra), 200
 
 @app.route('/alpha', methods=['GET'])
 @app.route('/api/alpha', methods=['GET'])
@@ -195,21 +430,26 @@ def api_alpha(input_alpha: str="") -> tuple[dict, int]:
     if (input_alpha == ""):
         return jsonify(create_error_message("The ISO 3166-1 alpha input parameter cannot be empty.", request.url)), 400    
 
-    #get the country updates data using the input alpha codes, return error if invalid codes input
-    try:
-        iso3166_updates = get_updates_instance()[input_alpha]
-    except ValueError as ve:
-        return jsonify(create_error_message(str(ve), request.url)), 400    
+    #resolve the input alpha codes into their alpha-2 codes, return error if invalid codes input
+    alpha2_codes, alpha_error_message = resolve_alpha_codes(input_alpha)
+    if (alpha_error_message):
+        return jsonify(create_error_message(alpha_error_message, request.url)), 400
 
-    #if sortBy query string parameter set, call sort_by_date function to sort all updates data via the publication date, ascending or descending, don't sort if just one country object present
-    if (sort_by == 'dateasc' or sort_by == 'datedesc') and len(iso3166_updates) > 1:
-        iso3166_updates = sort_by_date(iso3166_updates, date_asc_desc=sort_by)
+    #the countries' updates data is returned from the pre-serialized response cache, under the query's canonical key, if available
+    query_key = canonical_query_key("api_alpha", alpha2_codes, sort_by=sort_by, fields=parse_fields(fields))
+    cached_response = get_cached_query_response(query_key)
+    if (cached_response):
+        return cached_response
+
+    #get the countries' updates using the alpha-2 codes, sorted by alpha-2 code, or sorted via the publication date, ascending or descending, if sortBy query string 
+    #parameter set, don't sort if just one country object present
+    iso3166_updates, _ = paginate_query_results(QuerySpec(country_codes=tuple(sorted(alpha2_codes))), sort_by, streamed=is_streamed_request())
 
     #apply fields projection filter
     if fields:
         iso3166_updates = apply_fields_filter(iso3166_updates, fields)
 
-    return create_response(iso3166_updates), 200
+    return create_query_response(query_key, iso3166_updates), 200
 
 @app.route('/year', methods=['GET'])
 @app.route('/api/year', methods=['GET'])
@@ -245,6 +485,12 @@ def api_year(input_year: str="") -> tuple[dict, int]:
     #pull fields projection query string parameter
     fields = request.args.get('fields', default="").strip()
 
+    #pull and validate pagination parameters (limit/offset/cursor, applied at the country level for dict responses, record level for sorted list responses)
+    cursor = request.args.get('cursor', default="").strip()
+    limit, offset, pagination_error, pagination_error_message = validate_pagination(request.args.get('limit', default="0"), request.args.get('offset', default="0"), cursor)
+    if (pagination_error):
+        return jsonify(create_error_message(pagination_error_message, request.url)), 400
+
     #support ?exclude=YEAR as a clean URL-safe alternative to the <> path syntax (e.g. /api/year?exclude=2020)
     exclude_year = request.args.get('exclude', default="").strip()
     if exclude_year:
@@ -257,21 +503,35 @@ def api_year(input_year: str="") -> tuple[dict, int]:
     #remove any unicode characters
     input_year = urllib.parse.unquote(input_year)
 
-    #get the country updates fot the input years, return error if invalid years input
-    try:
-        iso3166_updates = get_updates_instance().year(input_year)
-    except ValueError as ve:
-        return jsonify(create_error_message(str(ve), request.url)), 400    
+    #parse and validate input year parameter 
+    year, year_range, year_greater_than, year_less_than, year_not_equal, year_error, year_error_message = validate_year(input_year)
+
+    #return error if error found when parsing and validating the year input parameter
+    if (year_error):
+        return jsonify(create_error_message(year_error_message, request.url)), 400    
 
-    #if sortBy query string parameter set, call sort_by_date function to sort all updates data via the publication date, ascending or descending, don't sort if just one country object present
-    if (sort_by == 'dateasc' or sort_by == 'datedesc') and len(iso3166_updates) > 1:
-        iso3166_updates = sort_by_date(iso3166_updates, date_asc_desc=sort_by)
+    #return error if any input year is before 1996, when the first updates were published
+    for year_ in input_year.replace(' ', '').split(','):
+        if any(int(y) < 1996 for y in re.findall(r"[0-9]{4}", year_)):
+            return jsonify(create_error_message(f"Invalid year input, must be a valid year >= 1996, got {year_}.", request.url)), 400    
+
+    #the years' updates data is returned from the pre-serialized response cache, under the query's canonical key, if available
+    query_key = canonical_query_key("api_year", year=(year, year_range, year_greater_than, year_less_than, year_not_equal), sort_by=sort_by, 
+                                    fields=parse_fields(fields), limit=limit, offset=offset, cursor=cursor)
+    cached_response = get_cached_query_response(query_key)
+    if (cached_response):
+        return cached_response
+
+    #get the page of the country update records for the input years, from the year index in the updates store via the query engine, sorted via 
+    #the publication date if sortBy query string parameter set, with its pagination metadata
+    iso3166_updates, metadata_extra = paginate_query_results(QuerySpec(year=(year, year_range, year_greater_than, year_less_than, year_not_equal)), 
+                                                             sort_by, limit, offset, cursor, streamed=is_streamed_request())
 
     #apply fields projection filter
     if fields:
         iso3166_updates = apply_fields_filter(iso3166_updates, fields)
 
-    return create_response(iso3166_updates), 200
+    return create_query_response(query_key, iso3166_updates, **metadata_extra), 200
 
 @app.route('/api/year/<input_year>/alpha/<input_alpha>', methods=['GET'])
 @app.route('/api/alpha/<input_alpha>/year/<input_year>', methods=['GET'])
@@ -306,7 +566,6 @@ def api_alpha_year(input_alpha: str="", input_year: str="") -> tuple[dict, int]:
         invalid parameter input.
     """
     #initialise vars
-    iso3166_updates = {}
     alpha2_code = []
 
     #pull sortBy query string parameter, that allows sorting by country code or publication date, descending/ascending
@@ -338,111 +597,57 @@ def api_alpha_year(input_alpha: str="", input_year: str="") -> tuple[dict, int]:
     if (year_error):
         return jsonify(create_error_message(year_error_message, request.url)), 400    
 
-    #iterate over each input alpha code, validating and converting into its corresponding alpha-2, if applicable
-    if (alpha2_code != []):
-        for code in range(0, len(alpha2_code)):
-            #api can accept 3 letter alpha-3 or numeric code for country, this has to be converted into its alpha-2 counterpart
-            temp_code = convert_to_alpha2(alpha2_code[code])
-            #return error message if invalid alpha code input
-            if (temp_code is None):
-                return jsonify(create_error_message(f"Invalid ISO 3166-1 country code input, cannot convert into corresponding alpha-2 code: {''.join(alpha2_code[code])}.", request.url)), 400 
-            alpha2_code[code] = temp_code
-
-    #get updates from iso3166_updates object per country using alpha-2 code
-    for code in alpha2_code:
-        iso3166_updates[code] = get_all_updates()[code]
-
-    #temporary updates object
-    temp_iso3166_updates = {}
-
-    #if no valid alpha-2 codes input, use all alpha-2 codes from iso3166 and all updates data
-    if ((year != [] and alpha2_code == []) or ((year == [] or year != []) and alpha2_code == [])):
-        input_alpha_codes  = list(iso3166.countries_by_alpha2.keys())
-        input_data = get_all_updates()
-    #else set input alpha-2 codes to input parameter value and use corresponding updates data
-    else:
-        input_alpha_codes = alpha2_code
-        input_data = iso3166_updates
-    
-    #use temp object to get updates data either for specific country/alpha-2 code or for all
-    #countries, dependant on input_alpha_codes and input_data vars above
-    if (year != []):
-        for code in input_alpha_codes:
-            temp_iso3166_updates[code] = []
-            for update in range(0, len(input_data[code])):
-
-                #convert year in Date Issued column to str of year, remove "corrected" date if applicable
-                if ("corrected" in input_data[code][update]["Date Issued"]):
-                    temp_year = str(datetime.strptime(re.sub("[(].*[)]", "", input_data[code][update]["Date Issued"]).replace(' ', "").
-                                                      replace(".", '').replace('\n', ''), '%Y-%m-%d').year)
-                else:
-                    temp_year = str(datetime.strptime(input_data[code][update]["Date Issued"].replace('\n', ''), '%Y-%m-%d').year)
-
-                #if year range true then get country updates within specified range inclusive
-                if (year_range):
-                    if (temp_year != "" and (temp_year >= year[0] and temp_year <= year[1])):
-                        temp_iso3166_updates[code].append(input_data[code][update])
-                
-                #if greater than true then get country updates greater than or equal to specified year
-                elif (year_greater_than):
-                    if (temp_year != "" and (temp_year >= year[0])):
-                        temp_iso3166_updates[code].append(input_data[code][update])    
-
-                #if less than true then get country updates less than specified year 
-                elif (year_less_than):
-                    if (temp_year != "" and (temp_year < year[0])):
-                        temp_iso3166_updates[code].append(input_data[code][update]) 
-
-                #get all country updates not equal to current year
-                elif (year_not_equal):
-                    if (temp_year != "" and temp_year not in year):
-                        temp_iso3166_updates[code].append(input_data[code][update])
-
-                #get country updates equal to specified year
-                else:
-                    for year_ in year:
-                        if (temp_year != "" and (temp_year == year_)):
-                            temp_iso3166_updates[code].append(input_data[code][update])
-
-            #if current alpha-2 has no rows for selected year/year range etc, remove from temp object
-            if (temp_iso3166_updates[code] == []):
-                temp_iso3166_updates.pop(code, None)
-    else:
-        temp_iso3166_updates = input_data
-    
-    #if sortBy query string parameter set, call sort_by_date function to sort all updates data via the publication date, ascending or descending, don't sort if just one country object present
-    if (sort_by == 'dateasc' or sort_by == 'datedesc') and len(temp_iso3166_updates) > 1:
-        iso3166_updates = sort_by_date(temp_iso3166_updates, date_asc_desc=sort_by)
-    else:
-        #set main updates dict to temp one
-        iso3166_updates = temp_iso3166_updates
+    #validate and convert each input alpha code into its corresponding alpha-2, the api can accept 3 letter alpha-3 or numeric codes, 
+    #return error message listing all invalid alpha codes input
+    alpha2_code, alpha_error_message = resolve_alpha_codes(",".join(alpha2_code))
+    if (alpha_error_message):
+        return jsonify(create_error_message(alpha_error_message, request.url)), 400
+
+    #the countries' updates data for the years is returned from the pre-serialized response cache, under the query's canonical key, if available
+    query_key = canonical_query_key("api_alpha_year", alpha2_code, year=(year, year_range, year_greater_than, year_less_than, year_not_equal) if year != [] else None, 
+                                    sort_by=sort_by, fields=parse_fields(fields))
+    cached_response = get_cached_query_response(query_key)
+    if (cached_response):
+        return cached_response
+
+    #get the input countries' update records published in the input years, via the query engine, sorted via the publication date if sortBy query 
+    #string parameter set, don't sort if just one country object present
+    iso3166_updates, _ = paginate_query_results(QuerySpec(country_codes=tuple(alpha2_code), 
+                                                          year=(year, year_range, year_greater_than, year_less_than, year_not_equal) if year != [] else None), 
+                                                sort_by, streamed=is_streamed_request())
 
     #apply fields projection filter
     if fields:
         iso3166_updates = apply_fields_filter(iso3166_updates, fields)
 
-    return create_response(iso3166_updates), 200
+    return create_query_response(query_key, iso3166_updates), 200
 
 @app.route('/api/country_name', methods=['GET'])
 @app.route('/api/country_name/<input_country_name>', methods=['GET'])
-@app.route('/api/country_name/<input_country_name>/year', methods=['GET'])
-@app.route('/api/country_name/<input_country_name>/date_range', methods=['GET'])
+@app.route('/api/country_name/<input_country_name>/date_range/<input_date_range>', methods=['GET'])
+@app.route('/api/date_range/<input_date_range>/country_name/<input_country_name>', methods=['GET'])
 @app.route('/country_name/<input_country_name>', methods=['GET'])
-@app.route('/country_name/<input_country_name>/year', methods=['GET'])
-@app.route('/country_name/<input_country_name>/date_range', methods=['GET'])
-def api_country_name(input_country_name: str="") -> tuple[dict, int]:
+@app.route('/country_name/<input_country_name>/date_range/<input_date_range>', methods=['GET'])
+@app.route('/date_range/<input_date_range>/country_name/<input_country_name>', methods=['GET'])
+@app.route('/country_name/<input_country_name>/date_range', defaults={'input_date_range': ""}, methods=['GET'])
+@app.route('/api/country_name/<input_country_name>/date_range', defaults={'input_date_range': ""}, methods=['GET'])
+def api_country_name(input_country_name: str="", input_date_range: str|None=None) -> tuple[dict, int]:
     """
     Flask route for '/api/country_name' path/endpoint. Return all ISO 3166 updates for the 
     inputted country name/names, as they are commonly known in English. A closeness 
     function is used to find the most approximate name to a high degree from the one input. 
-    If invalid name or no matching name found then return error. Route can accept the path 
-    with or without the trailing slash.
+    If invalid name or no matching name found then return error. The endpoint can also be 
+    used in conjunction with the date range endpoint. Route can accept the path with or 
+    without the trailing slash.
 
     Parameters
     ==========
     :input_country_name: str (default="")
         one or more country names as they are commonly known in english, according
         to the ISO 3166-1.
+    :input_date_range: str (default=None)
+        start and end date to get updates from, if input. If a single date input it will 
+        act as the start date, with the current date being the end date. 
 
     Returns 
     =======
@@ -452,11 +657,6 @@ def api_country_name(input_country_name: str="") -> tuple[dict, int]:
         response status code. 200 is a successful response, 400 means there was an 
         invalid parameter input.
     """
-    #initialise vars
-    iso3166_updates_ = {}
-    alpha2_code = []
-    names = []    
-
     #if no input parameters set then return error message
     if (input_country_name == ""):
         return jsonify(create_error_message("The name input parameter cannot be empty.", request.url)), 400 
@@ -477,76 +677,51 @@ def api_country_name(input_country_name: str="") -> tuple[dict, int]:
     #pull fields projection query string parameter
     fields = request.args.get('fields', default="").strip()
 
-    #remove unicode space (%20) from input parameter
-    input_country_name = input_country_name.replace('%20', ' ').title()
-    
-    #check if input country is in above list, if not add to sorted comma separated list    
-    if (input_country_name.upper() in name_comma_exceptions):
-        names = [input_country_name]
-    else:
-        names = sorted(input_country_name.split(','))
-    
-    #iterate over list of names, convert country names from names_converted dict, if applicable
-    for name_ in range(0, len(names)):
-        if (names[name_].title() in list(names_converted.keys())):
-            names[name_] = names_converted[names[name_]]
-
-    #remove all whitespace in any of the country names
-    names = [name_.strip(' ') for name_ in names]
-
-    #get list of available country names from iso3166 library, remove whitespace
-    all_names_no_space = [name_.strip(' ') for name_ in list(iso3166.countries_by_name.keys())]
-    
-    #iterate over all input country names, get corresponding 2 letter alpha-2 code
-    for name_ in names:
-
-        #using thefuzz library, get all countries that match the input country name, 
-        # by default an exact match is sought, but the % likeness the match has to be can be reduced using likeness parameter 
-        name_matches = process.extract(name_.upper(), all_names_no_space, scorer=fuzz.ratio)
-
-        #filter all matches above the likeness threshold
-        valid_matches = [match for match in name_matches if match[1] >= search_likeness_score]
-
-        #% of likeness that a country name has to be to an erroneous input name
-        country_name_suggestion_threshold = 75  
-
-        #if no exact match found, return error message with suggested similar country name
-        if not valid_matches:
-            if name_matches and name_matches[0][1] >= country_name_suggestion_threshold:
-                suggestion = name_matches[0][0].title()
-                error_message= f"No matching country name found for input: {name_}, did you mean {suggestion}?"
-            else:
-                error_message = f"No matching country name found for input: {name_}."
-            return jsonify(create_error_message(error_message, request.url)), 400
-
-        #iterate over valid matches and append to output object
-        for match_name, score in valid_matches:
-            alpha2 = iso3166.countries_by_name[match_name.upper()].alpha2
-            if alpha2 not in iso3166_updates_:
-                iso3166_updates_[alpha2] = get_all_updates()[alpha2]
-
-        #use iso3166 package to find corresponding alpha-2 code from its name
-        alpha2_code.append(iso3166.countries_by_name[name_matches[0][0].upper()].alpha2)
-    
-    #get country data from ISO 3166-2 object, using alpha-2 code
-    for code in alpha2_code:
-        iso3166_updates_[code] = get_all_updates()[code]
-
-    #if sortBy query string parameter set, call sort_by_date function to sort all updates data via the publication date, ascending or descending, don't sort if just one country object present
-    if (sort_by == 'dateasc' or sort_by == 'datedesc') and len(iso3166_updates_) > 1:
-        iso3166_updates_ = sort_by_date(iso3166_updates_, date_asc_desc=sort_by)
+    #pull and validate pagination parameters (limit/offset/cursor, applied at the country level for dict responses, record level for sorted list responses)
+    cursor = request.args.get('cursor', default="").strip()
+    limit, offset, pagination_error, pagination_error_message = validate_pagination(request.args.get('limit', default="0"), request.args.get('offset', default="0"), cursor)
+    if (pagination_error):
+        return jsonify(create_error_message(pagination_error_message, request.url)), 400
+
+    #get the alpha-2 codes of the countries matching the input country names, return error if no matching name found
+    iso3166_updates_, alpha2_code, name_error_message = match_country_names(input_country_name, search_likeness_score)
+    if (name_error_message):
+        return jsonify(create_error_message(name_error_message, request.url)), 400
+
+    #parse and validate input date range parameter, if input
+    date_range = None
+    if (input_date_range is not None):
+        start_ordinal, end_ordinal, date_range_error_message = parse_date_range(input_date_range)
+        if (date_range_error_message):
+            return jsonify(create_error_message(date_range_error_message, request.url)), 400
+        date_range = (start_ordinal, end_ordinal)
+
+    #the matched countries' updates data is returned from the pre-serialized response cache, under the query's canonical key, if available,
+    #the input names and likeness only select the matched countries, so the query is keyed on their alpha-2 codes, sorted by alpha-2 code
+    alpha2_codes = sorted(iso3166_updates_)
+    query_key = canonical_query_key("api_country_name", alpha2_codes, date_range=date_range, sort_by=sort_by, fields=parse_fields(fields), 
+                                    limit=limit, offset=offset, cursor=cursor)
+    cached_response = get_cached_query_response(query_key)
+    if (cached_response):
+        return cached_response
+
+    #get the page of the matched countries' update records, published within the date range if input, via the query engine, sorted via the 
+    #publication date if sortBy query string parameter set, with its pagination metadata
+    iso3166_updates_, metadata_extra = paginate_query_results(QuerySpec(country_codes=tuple(alpha2_codes), date_range=date_range), sort_by, limit, offset, cursor, 
+                                                              streamed=is_streamed_request())
 
     #apply fields projection filter
     if fields:
         iso3166_updates_ = apply_fields_filter(iso3166_updates_, fields)
 
-    return create_response(iso3166_updates_), 200
+    return create_query_response(query_key, iso3166_updates_, **metadata_extra), 200
 
 @app.route('/api/year/<input_year>/country_name/<input_country_name>', methods=['GET'])
 @app.route('/api/country_name/<input_country_name>/year/<input_year>', methods=['GET'])
 @app.route('/year/<input_year>/country_name/<input_country_name>', methods=['GET'])
 @app.route('/country_name/<input_country_name>/year/<input_year>', methods=['GET'])
 @app.route('/api/year/<input_year>/country_name/', defaults={'input_country_name': ""}, methods=['GET'])
+@app.route('/country_name/<input_country_name>/year', defaults={'input_year': ""}, methods=['GET'])
 @app.route('/api/country_name/<input_country_name>/year/', defaults={'input_year': ""}, methods=['GET'])
 def api_country_name_year(input_country_name: str="", input_year: str="") -> tuple[dict, int]:
     """
@@ -573,11 +748,6 @@ def api_country_name_year(input_country_name: str="", input_year: str="") -> tup
         response status code. 200 is a successful response, 400 means there was an 
         invalid parameter input.
     """
-    #initialise vars
-    iso3166_updates_ = {}
-    alpha2_code = []
-    names = []    
-
     #if no input parameters set then return error message
     if (input_country_name == ""):
         return jsonify(create_error_message("The name input parameter cannot be empty.", request.url)), 400 
@@ -603,60 +773,14 @@ def api_country_name_year(input_country_name: str="", input_year: str="") -> tup
     if exclude_year:
         input_year = f"<>{exclude_year}"
 
-    #remove unicode space (%20) from input parameter
-    input_country_name = input_country_name.replace('%20', ' ').title()
-    
-    #check if input country is in above list, if not add to sorted comma separated list    
-    if (input_country_name.upper() in name_comma_exceptions):
-        names = [input_country_name]
-    else:
-        names = sorted(input_country_name.split(','))
-    
-    #iterate over list of names, convert country names from names_converted dict, if applicable
-    for name_ in range(0, len(names)):
-        if (names[name_].title() in list(names_converted.keys())):
-            names[name_] = names_converted[names[name_]]
-
-    #remove all whitespace in any of the country names
-    names = [name_.strip(' ') for name_ in names]
-
-    #get list of available country names from iso3166 library, remove whitespace
-    all_names_no_space = [name_.strip(' ') for name_ in list(iso3166.countries_by_name.keys())]
-    
-    #iterate over all input country names, get corresponding 2 letter alpha-2 code
-    for name_ in names:
-
-        #using thefuzz library, get all countries that match the input country name, 
-        # by default an exact match is sought, but the % likeness the match has to be can be reduced using likeness parameter 
-        name_matches = process.extract(name_.upper(), all_names_no_space, scorer=fuzz.ratio)
-
-        #filter all matches above the likeness threshold
-        valid_matches = [match for match in name_matches if match[1] >= search_likeness_score]
-
-        #% of likeness that a country name has to be to an erroneous input name
-        country_name_suggestion_threshold = 75  
-
-        #if no exact match found, return error message with suggested similar country name
-        if not valid_matches:
-            if name_matches and name_matches[0][1] >= country_name_suggestion_threshold:
-                suggestion = name_matches[0][0].title()
-                error_message= f"No matching country name found for input: {name_}, did you mean {suggestion}?"
-            else:
-                error_message = f"No matching country name found for input: {name_}."
-            return jsonify(create_error_message(error_message, request.url)), 400
-
-        #iterate over valid matches and append to output object
-        for match_name, score in valid_matches:
-            alpha2 = iso3166.countries_by_name[match_name.upper()].alpha2
-            if alpha2 not in iso3166_updates_:
-                iso3166_updates_[alpha2] = get_all_updates()[alpha2]
+    #get the alpha-2 codes of the countries matching the input country names, return error if no matching name found
+    iso3166_updates_, alpha2_code, name_error_message = match_country_names(input_country_name, search_likeness_score)
+    if (name_error_message):
+        return jsonify(create_error_message(name_error_message, request.url)), 400
 
-        #use iso3166 package to find corresponding alpha-2 code from its name
-        alpha2_code.append(iso3166.countries_by_name[name_matches[0][0].upper()].alpha2)
-    
-    #get country data from ISO 3166-2 object, using alpha-2 code
-    for code in alpha2_code:
-        iso3166_updates_[code] = get_all_updates()[code]
+    #if no input year parameter then return error message
+    if (input_year == ""):
+        return jsonify(create_error_message("The year input parameter cannot be empty. Use ?exclude=YEAR for year exclusion.", request.url)), 400    
 
     #parse and validate input year parameter 
     year, year_range, year_greater_than, year_less_than, year_not_equal, year_error, year_error_message = validate_year(input_year)
@@ -665,79 +789,42 @@ def api_country_name_year(input_country_name: str="", input_year: str="") -> tup
     if (year_error):
         return jsonify(create_error_message(year_error_message, request.url)), 400   
     
-    #temporary updates object
-    temp_iso3166_updates = {}
-
-    #use temp object to get updates data either for specific country/alpha-2 code or for all
-    #countries, dependant on input_alpha_codes and input_data vars above
-    if (year != []):
-        for code in alpha2_code:
-            temp_iso3166_updates[code] = []
-            for update in range(0, len(iso3166_updates_[code])):
-
-                #convert year in Date Issued column to str of year, remove "corrected" date if applicable
-                if ("corrected" in iso3166_updates_[code][update]["Date Issued"]):
-                    temp_year = str(datetime.strptime(re.sub("[(].*[)]", "", iso3166_updates_[code][update]["Date Issued"]).replace(' ', "").
-                                                      replace(".", '').replace('\n', ''), '%Y-%m-%d').year)
-                else:
-                    temp_year = str(datetime.strptime(iso3166_updates_[code][update]["Date Issued"].replace('\n', ''), '%Y-%m-%d').year)
-
-                #if year range true then get country updates within specified range inclusive
-                if (year_range):
-                    if (temp_year != "" and (temp_year >= year[0] and temp_year <= year[1])):
-                        temp_iso3166_updates[code].append(iso3166_updates_[code][update])
-                
-                #if greater than true then get country updates greater than or equal to specified year
-                elif (year_greater_than):
-                    if (temp_year != "" and (temp_year >= year[0])):
-                        temp_iso3166_updates[code].append(iso3166_updates_[code][update])    
-
-                #if less than true then get country updates less than specified year 
-                elif (year_less_than):
-                    if (temp_year != "" and (temp_year < year[0])):
-                        temp_iso3166_updates[code].append(iso3166_updates_[code][update]) 
-
-                #get all country updates not equal to current year
-                elif (year_not_equal):
-                    if (temp_year != "" and temp_year not in year):
-                        temp_iso3166_updates[code].append(iso3166_updates_[code][update])
-
-                #get country updates equal to specified year
-                else:
-                    for year_ in year:
-                        if (temp_year != "" and (temp_year == year_)):
-                            temp_iso3166_updates[code].append(iso3166_updates_[code][update])
-
-            #if current alpha-2 has no rows for selected year/year range etc, remove from temp object
-            if (temp_iso3166_updates[code] == []):
-                temp_iso3166_updates.pop(code, None)
-    else:
-        temp_iso3166_updates = iso3166_updates_
-
-    #if sortBy query string parameter set, call sort_by_date function to sort all updates data via the publication date, ascending or descending, don't sort if just one country object present
-    if (sort_by == 'dateasc' or sort_by == 'datedesc') and len(temp_iso3166_updates) > 1:
-        iso3166_updates_ = sort_by_date(temp_iso3166_updates, date_asc_desc=sort_by)
-    else:
-        #set main updates dict to temp one
-        iso3166_updates_ = temp_iso3166_updates
+    #the matched countries' updates data for the years is returned from the pre-serialized response cache, under the query's canonical key, if 
+    #available, the input names and likeness only select the matched countries, so the query is keyed on their alpha-2 codes, sorted by alpha-2 code
+    alpha2_codes = sorted(set(alpha2_code) if year != [] else iso3166_updates_)
+    query_key = canonical_query_key("api_country_name_year", alpha2_codes, year=(year, year_range, year_greater_than, year_less_than, year_not_equal) if year != [] else None, 
+                                    sort_by=sort_by, fields=parse_fields(fields))
+    cached_response = get_cached_query_response(query_key)
+    if (cached_response):
+        return cached_response
+
+    #get the matched countries' update records published in the input years, via the query engine, sorted via the publication date if sortBy 
+    #query string parameter set, don't sort if just one country object present
+    iso3166_updates_, _ = paginate_query_results(QuerySpec(country_codes=tuple(alpha2_codes), 
+                                                           year=(year, year_range, year_greater_than, year_less_than, year_not_equal) if year != [] else None), 
+                                                 sort_by, streamed=is_streamed_request())
 
     #apply fields projection filter
     if fields:
         iso3166_updates_ = apply_fields_filter(iso3166_updates_, fields)
 
-    return create_response(iso3166_updates_), 200
+    return create_query_response(query_key, iso3166_updates_), 200
 
 @app.route('/api/search/', methods=['GET'])
 @app.route('/api/search/<input_search_term>', methods=['GET'])
-@app.route('/api/search/<input_search_term>/year', methods=['GET'])
-@app.route('/api/search/<input_search_term>/date_range', methods=['GET'])
+@app.route('/api/search/<input_search_term>/year/<input_year>', methods=['GET'])
+@app.route('/api/search/<input_search_term>/date_range/<input_date_range>', methods=['GET'])
 @app.route('/search/<input_search_term>', methods=['GET'])
-@app.route('/search/<input_search_term>/year', methods=['GET'])
-@app.route('/search/<input_search_term>/date_range', methods=['GET'])
-def api_search(input_search_term: str="") -> tuple[dict, int]:
+@app.route('/search/<input_search_term>/year/<input_year>', methods=['GET'])
+@app.route('/search/<input_search_term>/date_range/<input_date_range>', methods=['GET'])
+@app.route('/search/<input_search_term>/year', defaults={'input_year': ""}, methods=['GET'])
+@app.route('/search/<input_search_term>/date_range', defaults={'input_date_range': ""}, methods=['GET'])
+@app.route('/api/search/<input_search_term>/year', defaults={'input_year': ""}, methods=['GET'])
+@app.route('/api/search/<input_search_term>/date_range', defaults={'input_date_range': ""}, methods=['GET'])
+def api_search(input_search_term: str="", input_year: str|None=None, input_date_range: str|None=None) -> tuple[dict, int]:
     """
     Flask route for '/api/search' path/endpoint. Return all ISO 3166 updates for the 
-    inputted search terms/keywords. A closeness function via thefuzz package is used 
+    inputted search terms/keywords. A closeness function via rapidfuzz package is used 
     to find the most approximate update objects that contain the inputted search terms. 
     A likeness query string parameter allows for you to set the % of likeness that the 
     attributes in the updates (Change & Desc of Change) have to be to the input search 
@@ -749,11 +836,22 @@ def api_search(input_search_term: str="") -> tuple[dict, int]:
 
     If a date is inputted to the endpoint, the Date Issued attribute will be explicitly 
     searched as well. If invalid search term or no matching updates found then return error. 
+    The endpoint can also be used in conjunction with the year and date range endpoints, 
+    only searching the updates published in the input years or date range.
+
+    Each search has a time budget, set by the timeout_ms query string parameter or the 
+    default of _SEARCH_TIMEOUT_MS. If the search terms aren't all matched within it, the 
+    best matches found so far are returned, with partial set to true and the fraction of 
+    the search that was done in the metadata, and no ETag.
 
     Parameters
     ==========
     :input_search_term: str (default-"")
         1 or more sought search terms.
+    :input_year: str (default=None)
+        year, comma separated list of years, or year range to search updates from, if input.
+    :input_date_range: str (default=None)
+        start and end date to search updates from, if input. 
 
     Returns
     =======
@@ -773,6 +871,12 @@ def api_search(input_search_term: str="") -> tuple[dict, int]:
     #pull fields projection query string parameter
     fields = request.args.get('fields', default="").strip()
 
+    #pull and validate pagination parameters (limit/offset/cursor, applied at the record level for list responses, country level for dict responses)
+    cursor = request.args.get('cursor', default="").strip()
+    limit, offset, pagination_error, pagination_error_message = validate_pagination(request.args.get('limit', default="0"), request.args.get('offset', default="0"), cursor)
+    if (pagination_error):
+        return jsonify(create_error_message(pagination_error_message, request.url)), 400
+
     #split search terms into comma separated list, remove all whitespace & unicode characters
     search_terms = unquote(input_search_term)
     # search_terms = [term.strip().lower() for term in decoded_term.split(",")]
@@ -790,22 +894,57 @@ def api_search(input_search_term: str="") -> tuple[dict, int]:
     #parse query string parameter that allows user to exclude the Matching % score from search results, by default it is included in results
     exclude_match_score = (request.args.get('excludeMatchScore') or request.args.get('excludematchscore') or "false").lower().rstrip('/') in ['true', '1', 'yes']
 
-    #call search function in iso3166-updates package, passing in likeness score & includeMatchScore parameters
-    search_results = get_updates_instance().search(search_terms, likeness_score=search_likeness_score, include_match_score=not exclude_match_score)
+    #parse time budget query string parameter in milliseconds, raise error if it isn't a positive integer
+    try:
+        timeout_ms = int(request.args.get('timeout_ms', default=str(_SEARCH_TIMEOUT_MS)).rstrip('/'))
+    except ValueError:
+        timeout_ms = 0
+    if (timeout_ms <= 0):
+        return jsonify(create_error_message("The timeout_ms query string parameter must be a positive integer of milliseconds.", request.url)), 400
+
+    #parse and validate input year parameter, if input
+    year_filter = None
+    if (input_year is not None):
+        if (input_year == ""):
+            return jsonify(create_error_message("The year input parameter cannot be empty.", request.url)), 400
+        year, year_range, year_greater_than, year_less_than, year_not_equal, year_error, year_error_message = validate_year(urllib.parse.unquote(input_year))
+        if (year_error):
+            return jsonify(create_error_message(year_error_message, request.url)), 400
+        year_filter = (year, year_range, year_greater_than, year_less_than, year_not_equal)
+
+    #parse and validate input date range parameter, if input
+    date_range = None
+    if (input_date_range is not None):
+        start_ordinal, end_ordinal, date_range_error_message = parse_date_range(input_date_range)
+        if (date_range_error_message):
+            return jsonify(create_error_message(date_range_error_message, request.url)), 400
+        date_range = (start_ordinal, end_ordinal)
+
+    #search the updates published in the input years or date range, if input, via the query engine, passing in likeness score & includeMatchScore parameters,
+    # stopping once the time budget is spent, getting the page of search results, sorted via the publication date if sortBy query string parameter set, 
+    # with only the page's updates built
+    try:
+        search_results, metadata_extra, scanned = paginate_search_results(QuerySpec(year=year_filter, date_range=date_range, search_terms=search_terms, likeness=search_likeness_score), 
+                                                                          not exclude_match_score, sort_by, limit, offset, cursor, timeout_ms / 1000)
+    except ValueError as ve:
+        return jsonify(create_error_message(str(ve), request.url)), 400
 
-    #return message that no search results were found
-    if not search_results:
-        return create_response({"Message": f"No matching updates found with the given search term(s): {search_terms}. Try using the query string parameter '?likeness' and reduce the likeness score to expand the search space, '?likeness=30' will return subdivision data that have a 30% match to the input name. The current likeness score is set to {search_likeness_score}."}), 200
+    #partial search results, found within the time budget, have no ETag as they aren't the full response of the request
+    partial_metadata = {}
+    if (scanned < 1):
+        partial_metadata = {"partial": True, "scanned": round(scanned, 4)}
+        g.pop("etag", None)
 
-    #if sortBy query string parameter set, call sort_by_date function to sort all updates data via the publication date, ascending or descending, don't sort if just one country object present
-    if (sort_by == 'dateasc' or sort_by == 'datedesc') and len(search_results) > 1:
-        search_results = sort_by_date(search_results, date_asc_desc=sort_by)
+    #return message that no search results were found
+    if not (search_results or metadata_extra.get("total")):
+        return create_response({"Message": f"No matching updates found with the given search term(s): {search_terms}. Try using the query string parameter '?likeness' and reduce the likeness score to expand the search space, '?likeness=30' will return subdivision data that have a 30% match to the input name. The current likeness score is set to {search_likeness_score}."}, **partial_metadata), 200
+    metadata_extra = {**metadata_extra, **partial_metadata}
 
     #apply fields projection filter
     if fields:
         search_results = apply_fields_filter(search_results, fields)
 
-    return create_response(search_results), 200
+    return create_response(search_results, **metadata_extra), 200
 
 @app.route('/api/date_range/<input_date_range>', methods=['GET'])
 @app.route('/api/date_range', methods=['GET'])
@@ -844,77 +983,38 @@ def api_date_range(input_date_range: str="") -> tuple[dict, int]:
     #pull fields projection query string parameter
     fields = request.args.get('fields', default="").strip()
 
+    #pull and validate pagination parameters (limit/offset/cursor, applied at the country level for dict responses, record level for sorted list responses)
+    cursor = request.args.get('cursor', default="").strip()
+    limit, offset, pagination_error, pagination_error_message = validate_pagination(request.args.get('limit', default="0"), request.args.get('offset', default="0"), cursor)
+    if (pagination_error):
+        return jsonify(create_error_message(pagination_error_message, request.url)), 400
+
     #return error if input data empty
     if (input_date_range == ""):
         return jsonify(create_error_message("Input date cannot be empty, expecting at least one date in the format YYYY-MM-DD.", request.url)), 400 
     
-    #split multiple dates into list, remove whitespace
-    date_parts = input_date_range.split(",")
-    date_parts = [d.strip() for d in date_parts] 
-
-    #if only one date input, treat this as the starting date, setting the end date as today
-    if len(date_parts) == 1:
-        date_parts.append(datetime.today().strftime("%Y-%m-%d"))
-    elif len(date_parts) != 2:
-        return jsonify(create_error_message(f"Date input must contain either one or two dates: {date_parts}.", request.url)), 400 
-
-    #extract start and end date and convert each
-    start_date, end_date = date_parts[0], date_parts[1]
-    start_date = convert_date_format(start_date)
-    end_date = convert_date_format(end_date)
-
-    #return error if start or end date can't be converted into valid format 
-    if (start_date is None or end_date is None):
-        return jsonify(create_error_message(f"Invalid date format, expected YYYY-MM-DD format: {input_date_range}.", request.url)), 400 
-
-    #swap dates if start_date is later than end_date
-    if start_date > end_date:
-        start_date, end_date = end_date, start_date
-
-    #iterate over all updates data, adding all data that's within desired date range
-    for country_code, updates in get_all_updates().items():
-        filtered_changes = []
-        for update in updates:
-
-            #parse the original publication date from attribute
-            original_date_str = update["Date Issued"].split(" ")[0]  
-            original_date = datetime.strptime(original_date_str, "%Y-%m-%d")
-
-            #parse corrected date from publication date attribute, if applicable 
-            cleaned_date_row = re.sub(r"\(.*?\)", "", update["Date Issued"])
-            corrected_date = re.sub(r'\s+', ' ', cleaned_date_row.replace('.', '').strip())
-
-            #convert corrected date to datetime object, if applicable 
-            if corrected_date:
-                corrected_date = datetime.strptime(corrected_date, "%Y-%m-%d")
-            
-            #track if current date has been added to object
-            update_added = False
-
-            #check if the original date falls within the input range
-            if (start_date <= original_date <= end_date): 
-                filtered_changes.append(update)
-                update_added = True
-
-            #check if the corrected date falls within the input range
-            if (corrected_date):
-                if (start_date <= corrected_date <= end_date):
-                    if not (update_added):
-                        filtered_changes.append(update)
-
-        #add filtered changes to main date filtered object
-        if filtered_changes:
-            iso3166_updates[country_code] = filtered_changes
-
-    #if sortBy query string parameter set, call sort_by_date function to sort all updates data via the publication date, ascending or descending, don't sort if just one country object present
-    if (sort_by == 'dateasc' or sort_by == 'datedesc') and len(iso3166_updates) > 1:
-        iso3166_updates = sort_by_date(iso3166_updates, date_asc_desc=sort_by)
+    #parse and validate input date range parameter, into the start and end dates' ordinals
+    start_ordinal, end_ordinal, date_range_error_message = parse_date_range(input_date_range)
+    if (date_range_error_message):
+        return jsonify(create_error_message(date_range_error_message, request.url)), 400
+
+    #the date range's updates data is returned from the pre-serialized response cache, under the query's canonical key, if available
+    query_key = canonical_query_key("api_date_range", date_range=(start_ordinal, end_ordinal), sort_by=sort_by, fields=parse_fields(fields), 
+                                    limit=limit, offset=offset, cursor=cursor)
+    cached_response = get_cached_query_response(query_key)
+    if (cached_response):
+        return cached_response
+
+    #get the page of the update records whose original or corrected publication date is within desired date range, via the query engine, sorted 
+    #via the publication date if sortBy query string parameter set, with its pagination metadata
+    iso3166_updates, metadata_extra = paginate_query_results(QuerySpec(date_range=(start_ordinal, end_ordinal)), sort_by, limit, offset, cursor, 
+                                                             streamed=is_streamed_request())
 
     #apply fields projection filter
     if fields:
         iso3166_updates = apply_fields_filter(iso3166_updates, fields)
 
-    return create_response(iso3166_updates), 200
+    return create_query_response(query_key, iso3166_updates, **metadata_extra), 200
 
 @app.route('/api/date_range/<input_date_range>/alpha/<input_alpha>', methods=['GET'])
 @app.route('/api/alpha/<input_alpha>/date_range/<input_date_range>', methods=['GET'])
@@ -963,79 +1063,278 @@ def api_date_range_alpha(input_alpha: str="", input_date_range: str="") -> tuple
     if (input_alpha == ""):
         return jsonify(create_error_message("The alpha code input parameter cannot be empty." , request.url)), 400 
 
-    #get the country updates data using the input alpha codes, return error if invalid codes input
-    try:
-        all_iso3166_updates_ = get_updates_instance()[input_alpha]
-    except ValueError as ve:
-        return jsonify(create_error_message(str(ve) , request.url)), 400 
+    #get the alpha-2 codes of the input alpha codes, sorted, return error if invalid codes input
+    all_iso3166_updates_, alpha_error_message = resolve_alpha_codes(input_alpha)
+    if (alpha_error_message):
+        return jsonify(create_error_message(alpha_error_message, request.url)), 400
+    all_iso3166_updates_ = sorted(all_iso3166_updates_)
 
-    #split multiple dates into list, remove whitespace
-    date_parts = input_date_range.split(",")
-    date_parts = [d.strip() for d in date_parts] 
+    #parse and validate input date range parameter, into the start and end dates' ordinals
+    start_ordinal, end_ordinal, date_range_error_message = parse_date_range(input_date_range)
+    if (date_range_error_message):
+        return jsonify(create_error_message(date_range_error_message, request.url)), 400
 
-    #if only one date input, treat this as the starting date, setting the end date as today
-    if len(date_parts) == 1:
-        date_parts.append(datetime.today().strftime("%Y-%m-%d"))
-    elif len(date_parts) != 2:
-        return jsonify(create_error_message(f"Date input must contain either one or two dates: {date_parts}." , request.url)), 400 
+    #the countries' updates data for the date range is returned from the pre-serialized response cache, under the query's canonical key, if available
+    query_key = canonical_query_key("api_date_range_alpha", all_iso3166_updates_, date_range=(start_ordinal, end_ordinal), sort_by=sort_by, fields=parse_fields(fields))
+    cached_response = get_cached_query_response(query_key)
+    if (cached_response):
+        return cached_response
 
-    #extra start and end date and convert each
-    start_date, end_date = date_parts[0], date_parts[1]
-    start_date = convert_date_format(start_date)
-    end_date = convert_date_format(end_date)
+    #get the input countries' update records whose original or corrected publication date is within desired date range, via the query engine, 
+    #sorted via the publication date if sortBy query string parameter set, don't sort if just one country object present
+    iso3166_updates, _ = paginate_query_results(QuerySpec(country_codes=tuple(all_iso3166_updates_), date_range=(start_ordinal, end_ordinal)), sort_by, 
+                                                streamed=is_streamed_request())
 
-    #return error if start or end date can't be converted into valid format 
-    if (start_date is None or end_date is None):
-        return jsonify(create_error_message(f"Invalid date format, expected YYYY-MM-DD format: {input_date_range}." , request.url)), 400 
+    #apply fields projection filter
+    if fields:
+        iso3166_updates = apply_fields_filter(iso3166_updates, fields)
 
-    #swap dates if start_date is later than end_date
-    if start_date > end_date:
-        start_date, end_date = end_date, start_date
+    return create_query_response(query_key, iso3166_updates), 200
 
-    #iterate over all updates data, adding all data that's within desired date range
-    for country_code, updates in all_iso3166_updates_.items():
-        filtered_changes = []
-        for update in updates:
+@app.route('/api/batch', methods=['POST'])
+@app.route('/batch', methods=['POST'])
+def api_batch() -> tuple[dict, int]:
+    """
+    Flask route for '/api/batch' path/endpoint. Run a JSON array of queries, posted as the request 
+    body, in one request, returning each query's updates keyed by its id. Each query is an object 
+    using the same vocabulary as the other endpoints: the alpha, country_name, year, date_range and 
+    search filters, which can be combined, and the sortBy, fields, likeness, excludeMatchScore, 
+    exclude, limit, offset and cursor parameters, e.g [{"id": "fr", "alpha": "FR"}, {"id": "2016", 
+    "year": "2016", "sortBy": "dateDesc"}]. A query without an id is keyed by its index in the array. 
+    All queries are answered from the same in-memory indexes, via the query engine, identical queries 
+    are only run once, and the results are serialized into a single response, replacing a request 
+    and response per query. An invalid query returns its error message in place of its results, 
+    without failing the other queries.
 
-            #parse the original publication date from attribute
-            original_date_str = update["Date Issued"].split(" ")[0]  
-            original_date = datetime.strptime(original_date_str, "%Y-%m-%d")
+    Parameters
+    ==========
+    None
 
-            #parse corrected date from publication date attribute, if applicable 
-            cleaned_date_row = re.sub(r"\(.*?\)", "", update["Date Issued"])
-            corrected_date = re.sub(r'\s+', ' ', cleaned_date_row.replace('.', '').strip())
+    Returns
+    =======
+    :iso3166_updates: json
+        jsonified response of each query's updates and metadata, or error message, per query id.
+    :status_code: int
+        response status code. 200 is a successful response, 400 means the request body isn't
+        a valid array of queries.
+    """
+    #parse the request body, return error if it isn't a non-empty array of queries
+    queries = request.get_json(silent=True)
+    if not (isinstance(queries, list) and queries):
+        return jsonify(create_error_message("The batch request body must be a non-empty JSON array of query objects.", request.url)), 400
+
+    #return error if too many queries in batch
+    if (len(queries) > _BATCH_MAX_QUERIES):
+        return jsonify(create_error_message(f"The batch request body cannot contain more than {_BATCH_MAX_QUERIES} queries, got {len(queries)}.", request.url)), 400
+
+    #initialise vars, results of identical queries are shared rather than run again
+    results = {}
+    query_results = {}
+
+    #iterate over the queries, running each or reusing the results of an identical query in the batch
+    for index, query in enumerate(queries):
+        if not (isinstance(query, dict)):
+            results[str(index)] = create_batch_result("", {}, f"Each batch query must be a JSON object, got {type(query).__name__}.")
+            continue
+
+        #return error if query ids aren't unique, as the results are keyed by them
+        query_id = str(query.get("id", index))
+        if (query_id in results):
+            return jsonify(create_error_message(f"The batch query ids must be unique, got duplicate id: {query_id}.", request.url)), 400
+
+        query_key = json.dumps({key: value for key, value in query.items() if key != "id"}, sort_keys=True)
+        if (query_key not in query_results):
+            #an unexpected error running a query is returned as its result, rather than failing the other queries of the batch
+            try:
+                query_results[query_key] = create_batch_result(*run_batch_query(query))
+            except Exception:
+                app.logger.exception("Error running batch query: %s", query_key)
+                query_results[query_key] = create_batch_result("", {}, "An unexpected error occurred running the batch query.", status=500)
+        results[query_id] = query_results[query_key]
+
+    #serialize all queries' results once, in the standard response envelope
+    metadata = {
+        "count": sum(result["metadata"]["count"] for result in results.values() if "metadata" in result),
+        "generated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "queries": len(results),
+        "errors": sum("metadata" not in result for result in results.values())
+    }
+    return jsonify({"data": results, "metadata": metadata}), 200
 
-            #convert corrected date to datetime object, if applicable 
-            if corrected_date:
-                corrected_date = datetime.strptime(corrected_date, "%Y-%m-%d")
-            
-            #track if current date has been added to object
-            update_added = False
+def run_batch_query(query: dict) -> tuple[dict|list, dict, str]:
+    """
+    Run a single query of a batch request against the updates store's indexes, via the query 
+    engine. The query's keys are validated and parsed as per the path and query string 
+    parameters of the equivalent GET endpoint, e.g {"alpha": "FR", "year": "2016"} returns 
+    the same updates as '/api/alpha/FR/year/2016'.
 
-            #check if the original date falls within the input range
-            if (start_date <= original_date <= end_date): 
-                filtered_changes.append(update)
-                update_added = True
+    Parameters
+    ==========
+    :query: dict
+        batch query of filters and parameters, alongside its optional id.
 
-            #check if the corrected date falls within the input range
-            if (corrected_date):
-                if (start_date <= corrected_date <= end_date):
-                    if not (update_added):
-                        filtered_changes.append(update)
-
-        #add filtered changes to main date filtered object
-        if filtered_changes:
-            iso3166_updates[country_code] = filtered_changes
-
-    #if sortBy query string parameter set, call sort_by_date function to sort all updates data via the publication date, ascending or descending, don't sort if just one country object present
-    if (sort_by == 'dateasc' or sort_by == 'datedesc') and len(iso3166_updates) > 1:
-        iso3166_updates = sort_by_date(iso3166_updates, date_asc_desc=sort_by)
+    Returns
+    =======
+    :iso3166_updates: dict|list
+        page of the query's updates per country, or sorted updates.
+    :metadata_extra: dict
+        total record count before pagination and cursor of the next page, when limit, offset 
+        or cursor are explicitly specified.
+    :query_error_message: str
+        error message to output if the query is invalid, else empty.
+    """
+    #return error if any query keys aren't recognised
+    unknown_keys = sorted(set(query) - _BATCH_QUERY_KEYS)
+    if (unknown_keys):
+        return {}, {}, f"Invalid batch query key(s): {', '.join(map(str, unknown_keys))}, expected any of: {', '.join(sorted(_BATCH_QUERY_KEYS))}."
+
+    #each value as a string, as per the path and query string parameters of a GET request
+    params = {key: str(value).strip() for key, value in query.items() if value is not None}
+
+    #return error if no filters input or both country filters input
+    if not any(key in params for key in ("alpha", "country_name", "year", "date_range", "search")):
+        return {}, {}, "Each batch query must have at least one of the alpha, country_name, year, date_range or search keys."
+    if ("alpha" in params and "country_name" in params):
+        return {}, {}, "The alpha and country_name batch query keys cannot be used together."
+
+    #sortBy and fields parameters
+    sort_by = (params.get('sortBy') or params.get('sortby') or "").lower()
+    fields = params.get('fields', "")
+
+    #parse and validate pagination parameters
+    cursor = params.get('cursor', "")
+    limit, offset, pagination_error, pagination_error_message = validate_pagination(params.get('limit', "0"), params.get('offset', "0"), cursor)
+    if (pagination_error):
+        return {}, {}, pagination_error_message
+
+    #parse likeness parameter, used by the country_name and search filters
+    try:
+        likeness = int(params.get('likeness', "100"))
+    except ValueError:
+        return {}, {}, "Likeness query string parameter must be an integer between 0 and 100."
+    if not (0 <= likeness <= 100):
+        return {}, {}, "Likeness query string parameter value must be between 0 and 100."
+
+    #validate and convert each input alpha code into its alpha-2 code
+    country_codes = None
+    if ("alpha" in params):
+        if (params["alpha"] == ""):
+            return {}, {}, "The ISO 3166-1 alpha input parameter cannot be empty."
+        country_codes, alpha_error_message = resolve_alpha_codes(params["alpha"])
+        if (alpha_error_message):
+            return {}, {}, alpha_error_message
+        country_codes = tuple(country_codes)
+
+    #get the alpha-2 codes of the countries matching the input country names
+    if ("country_name" in params):
+        if (params["country_name"] == ""):
+            return {}, {}, "The name input parameter cannot be empty."
+        iso3166_updates_, _, name_error_message = match_country_names(params["country_name"], likeness)
+        if (name_error_message):
+            return {}, {}, name_error_message
+        country_codes = tuple(iso3166_updates_)
+
+    #parse and validate year parameter, the exclude parameter being an alternative to the <> syntax
+    year_filter = None
+    if (params.get("exclude")):
+        params["year"] = f"<>{params['exclude']}"
+    if ("year" in params):
+        if (params["year"] == ""):
+            return {}, {}, "The year input parameter cannot be empty. Use the exclude key for year exclusion."
+        year, year_range, year_greater_than, year_less_than, year_not_equal, year_error, year_error_message = validate_year(urllib.parse.unquote(params["year"]))
+        if (year_error):
+            return {}, {}, year_error_message
+        year_filter = (year, year_range, year_greater_than, year_less_than, year_not_equal)
+
+    #parse and validate date range parameter
+    date_range = None
+    if ("date_range" in params):
+        start_ordinal, end_ordinal, date_range_error_message = parse_date_range(params["date_range"])
+        if (date_range_error_message):
+            return {}, {}, date_range_error_message
+        date_range = (start_ordinal, end_ordinal)
+
+    spec = QuerySpec(country_codes=country_codes, year=year_filter, date_range=date_range)
+    try:
+        #search the updates matching the other filters, sorting and paginating the results as per the search endpoint
+        if ("search" in params):
+            if (params["search"] == ""):
+                return {}, {}, "The search input parameter cannot be empty."
+            exclude_match_score = (params.get('excludeMatchScore') or params.get('excludematchscore') or "false").lower() in ['true', '1', 'yes']
+            iso3166_updates, metadata_extra, _ = paginate_search_results(spec._replace(search_terms=unquote(params["search"]), likeness=likeness), not exclude_match_score, 
+                                                                         sort_by, limit, offset, cursor)
+        #get the page of update records matching the filters
+        else:
+            iso3166_updates, metadata_extra = paginate_query_results(spec, sort_by, limit, offset, cursor)
+    except ValueError as ve:
+        return {}, {}, str(ve)
 
     #apply fields projection filter
     if fields:
         iso3166_updates = apply_fields_filter(iso3166_updates, fields)
 
-    return create_response(iso3166_updates), 200
+    return iso3166_updates, metadata_extra, ""
+
+def create_batch_result(data, metadata_extra: dict, error_message: str, status: int=400) -> dict:
+    """ Helper function that returns the result object of a batch query, its updates and metadata, or its error message and status. """
+    if (error_message):
+        return {"message": error_message, "status": status}
+    return {"data": data, "metadata": {"count": get_response_count(data), **metadata_extra}}
+
+@app.route('/api/suggest/<input_prefix>', methods=['GET'])
+@app.route('/api/suggest', methods=['GET'])
+@app.route('/suggest/<input_prefix>', methods=['GET'])
+@app.route('/suggest', methods=['GET'])
+def api_suggest(input_prefix: str="") -> tuple[dict, int]:
+    """
+    Flask route for '/api/suggest' path/endpoint. Return the top completions of the input prefix, 
+    e.g as typed so far in a search box, from the country names and their aliases, the ISO 3166-1 
+    alpha-2, alpha-3 and numeric codes and the words of the updates' Change and Description of 
+    Change attributes. The prefix is normalized as per the country name lookup (case-folded, 
+    accents stripped and punctuation collapsed), and matches the start of any word of a country 
+    name. Completions are ranked by their number of updates, most first, via the suggest index's
+    precomputed ranks, so no fuzzy matching is run. The limit query string parameter sets the 
+    number of completions, by default _SUGGEST_DEFAULT_LIMIT, and the types query string parameter 
+    a comma separated list of the types of completions, by default all of them.
+
+    Parameters
+    ==========
+    :input_prefix: str (default="")
+        prefix of the sought completions.
+
+    Returns
+    =======
+    :suggestions: json
+        jsonified response of the completions, each with its text, type, number of updates and 
+        the alpha-2 code of its country, if it's a country name or code.
+    :status_code: int
+        response status code. 200 is a successful response, 400 means there was an invalid 
+        parameter input.
+    """
+    #if no input prefix then return error message
+    if (unquote(input_prefix).strip() == ""):
+        return jsonify(create_error_message("The suggest prefix input parameter cannot be empty.", request.url)), 400
+
+    #parse limit query string parameter, raise error if it isn't an integer between 1 and the maximum
+    try:
+        limit = int(request.args.get('limit', default=str(_SUGGEST_DEFAULT_LIMIT)).rstrip('/'))
+    except ValueError:
+        limit = 0
+    if not (1 <= limit <= _SUGGEST_MAX_LIMIT):
+        return jsonify(create_error_message(f"Limit query string parameter must be an integer between 1 and {_SUGGEST_MAX_LIMIT}.", request.url)), 400
+
+    #parse types query string parameter, raise error if any type is invalid
+    types = None
+    if (request.args.get('types')):
+        types = {type_.strip().lower() for type_ in request.args.get('types').rstrip('/').split(",") if type_.strip()}
+        invalid_types = sorted(types - set(suggestion_types))
+        if (invalid_types or not types):
+            return jsonify(create_error_message(f"Invalid suggestion type(s) input: {', '.join(invalid_types)}. Valid types are: {', '.join(suggestion_types)}.", request.url)), 400
+
+    suggestions = [{"Suggestion": suggestion.text, "Type": suggestion.type, "Updates": suggestion.count, **({"Country Code": suggestion.alpha2} if suggestion.alpha2 else {})}
+                   for suggestion in get_suggest_index().suggest(unquote(input_prefix), limit, types)]
+
+    return create_response(suggestions), 200
 
 '''
 /api/country_name and /api/country_name/year path/endpoints can accept multiple country names, 
@@ -1062,7 +1361,7 @@ name_comma_exceptions = ["BOLIVIA, PLURINATIONAL STATE OF",
 #list of country name exceptions that are converted into their more official name
 names_converted = {"UAE": "United Arab Emirates", "Brunei": "Brunei Darussalam", "Bolivia": "Bolivia, Plurinational State of", 
                     "Bosnia": "Bosnia and Herzegovina", "Bonaire": "Bonaire, Sint Eustatius and Saba", "DR Congo": 
-                    "Congo, the Democratic Republic of the", "Ivory Coast": "Côte d'Ivoire", "Cape Verde": "Cabo Verde", 
+                    "Congo, Democratic Republic of the", "Ivory Coast": "Côte d'Ivoire", "Cape Verde": "Cabo Verde", 
                     "Cocos Islands": "Cocos (Keeling) Islands", "Cura%C3%A7Ao": "Curaçao", "Falkland Islands": "Falkland Islands (Malvinas)", 
                     "Micronesia": "Micronesia, Federated States of", "United Kingdom": "United Kingdom of Great Britain and Northern Ireland",
                     "South Georgia": "South Georgia and the South Sandwich Islands", "Iran": "Iran, Islamic Republic of",
@@ -1079,6 +1378,151 @@ names_converted = {"UAE": "United Arab Emirates", "Brunei": "Brunei Darussalam",
                     "United States": "United States of America", "Vatican City": "Holy See", "Vatican": "Holy See", "Venezuela": 
                     "Venezuela, Bolivarian Republic of", "British Virgin Islands": "Virgin Islands, (British)", "US Virgin Islands": "Virgin Islands, (U.S.)"} 
 
+def match_country_names(input_country_name: str, likeness: int=100) -> tuple[dict, list, str]:
+    """
+    Get the countries matching the input country name/names, as they are commonly known in
+    English. Using rapidfuzz library, each name is compared to the names in the iso3166 package,
+    every country whose name's likeness is at least the likeness score is a match, and the
+    best matching country for each name is also returned separately. With the default likeness
+    of 100, i.e an exact match, each name is first looked up in the precomputed table of country
+    names and aliases, only being fuzzy matched if it isn't found. Only the candidate names from
+    the trigram index that could reach the likeness, or be suggested, are fuzzy matched.
+
+    Parameters
+    ==========
+    :input_country_name: str
+        one or more comma separated country names.
+    :likeness: int (default=100)
+        % likeness that a country name has to be to the input name to match.
+
+    Returns
+    =======
+    :iso3166_updates: dict
+        update records per matching country.
+    :alpha2_code: list
+        alpha-2 code of the best matching country of each input name.
+    :name_error_message: str
+        error message to output if an input name has no matching country, else empty.
+    """
+    #initialise vars
+    iso3166_updates_ = {}
+    alpha2_code = []
+    names = []    
+    search_likeness_score = likeness
+
+    #remove unicode space (%20) from input parameter
+    input_country_name = input_country_name.replace('%20', ' ').title()
+    
+    #check if input country is in above list, if not add to sorted comma separated list    
+    if (input_country_name.upper() in name_comma_exceptions):
+        names = [input_country_name]
+    else:
+        names = sorted(input_country_name.split(','))
+    
+    #convert country name aliases into their official names, from the names_converted dict, remove all whitespace in any of the country names
+    country_name_index = get_country_name_index()
+    names = [country_name_index.convert(name_).strip(' ') for name_ in names]
+
+    #% of likeness that a country name has to be to an erroneous input name
+    country_name_suggestion_threshold = 75  
+
+    #using rapidfuzz's fuzz.ratio, get the best matching country names of each name that isn't an exact match, scoring only the candidate names from the 
+    # trigram index that could match or be suggested, by default an exact match is sought, but the % likeness the match has to be can be reduced using likeness parameter 
+    all_name_matches = country_name_index.extract([name_.upper() for name_ in names if search_likeness_score != 100 or name_ not in country_name_index], 
+                                                  score_cutoff=min(search_likeness_score, country_name_suggestion_threshold))
+
+    #iterate over all input country names, get corresponding 2 letter alpha-2 code
+    for name_ in names:
+
+        #an exact match is a single lookup of the normalized name in the table of country names and aliases
+        if (search_likeness_score == 100):
+            alpha2 = country_name_index.resolve(name_)
+            if (alpha2 is not None):
+                iso3166_updates_.setdefault(alpha2, get_updates_store()[alpha2])
+                alpha2_code.append(alpha2)
+                continue
+
+        #best matching country names of the input country name
+        name_matches = all_name_matches[name_.upper()]
+
+        #filter all matches above the likeness threshold
+        valid_matches = [match for match in name_matches if match[1] >= search_likeness_score]
+
+        #if no exact match found, return error message with suggested similar country name
+        if not valid_matches:
+            if name_matches and name_matches[0][1] >= country_name_suggestion_threshold:
+                suggestion = name_matches[0][0].title()
+                error_message= f"No matching country name found for input: {name_}, did you mean {suggestion}?"
+            else:
+                error_message = f"No matching country name found for input: {name_}."
+            return {}, [], error_message
+
+        #iterate over valid matches and append to output object
+        for match_name, score in valid_matches:
+            alpha2 = country_name_index.alpha2(match_name)
+            if alpha2 not in iso3166_updates_:
+                iso3166_updates_[alpha2] = get_updates_store()[alpha2]
+
+        #find corresponding alpha-2 code of best match from its name
+        alpha2_code.append(country_name_index.alpha2(name_matches[0][0]))
+    
+    #get country update records from the updates store, using alpha-2 code
+    for code in alpha2_code:
+        iso3166_updates_[code] = get_updates_store()[code]
+
+    return iso3166_updates_, alpha2_code, ""
+
+def parse_date_range(input_date_range: str) -> tuple[int, int, str]:
+    """
+    Parse and validate the input date range parameter, a comma separated start and end date
+    in the format YYYY-MM-DD, although other formats are supported. A single date acts as the
+    start date, with the current date being the end date, and the dates are swapped if the
+    start date is later than the end date.
+
+    Parameters
+    ==========
+    :input_date_range: str
+        start and end date.
+
+    Returns
+    =======
+    :start_ordinal: int
+        proleptic Gregorian ordinal of the start date.
+    :end_ordinal: int
+        proleptic Gregorian ordinal of the end date.
+    :date_range_error_message: str
+        error message to output if the date range is invalid, else empty.
+    """
+    #return error if input data empty
+    if (input_date_range == ""):
+        return 0, 0, "Input date cannot be empty, expecting at least one date in the format YYYY-MM-DD."
+
+    #split multiple dates into list, remove whitespace
+    date_parts = input_date_range.split(",")
+    date_parts = [d.strip() for d in date_parts] 
+
+    #if only one date input, treat this as the starting date, setting the end date as today
+    if len(date_parts) == 1:
+        date_parts.append(datetime.today().strftime("%Y-%m-%d"))
+    elif len(date_parts) != 2:
+        return 0, 0, f"Date input must contain either one or two dates: {date_parts}."
+
+    #extract start and end date and convert each
+    start_date, end_date = date_parts[0], date_parts[1]
+    start_date = convert_date_format(start_date)
+    end_date = convert_date_format(end_date)
+
+    #return error if start or end date can't be converted into valid format 
+    if (start_date is None or end_date is None):
+        return 0, 0, f"Invalid date format, expected YYYY-MM-DD format: {input_date_range}."
+
+    #swap dates if start_date is later than end_date
+    if start_date > end_date:
+        start_date, end_date = end_date, start_date
+
+    #date range as ordinals, to compare against the pre-parsed publication dates in the updates store
+    return start_date.toordinal(), end_date.toordinal(), ""
+
 def convert_to_alpha2(alpha_code: str) -> str:
     """ 
     Auxiliary function that converts an ISO 3166 country's 3 letter alpha-3 
@@ -1107,26 +1551,32 @@ def convert_to_alpha2(alpha_code: str) -> str:
     if not (isinstance(alpha_code, str)):
         raise TypeError(f"Expected input alpha code to be a string, got {type(alpha_code)}.")
 
-    #uppercase alpha code, initial_alpha_code var maintains the original alpha code pre-uppercasing
-    alpha_code = alpha_code.upper()
-    
-    #use iso3166 package to find corresponding alpha-2 code from its numeric code, return error if numeric code not found
-    if (alpha_code.isdigit()):
-        if not (alpha_code in list(iso3166.countries_by_numeric.keys())):
-            return None
-        return iso3166.countries_by_numeric[alpha_code].alpha2
-
-    #return input alpha code if its valid, return error if alpha-2 code not found
-    if len(alpha_code) == 2:
-        if not (alpha_code in list(iso3166.countries_by_alpha2.keys())):
-            return None
-        return alpha_code
-
-    #use iso3166 package to find corresponding alpha-2 code from its alpha-3 code, return error if code not found
-    if len(alpha_code) == 3:
-        if not (alpha_code in list(iso3166.countries_by_alpha3.keys())):
-            return None
-        return iso3166.countries_by_alpha3[alpha_code].alpha2
+    #look up the alpha-2 code of the alpha-2, alpha-3 or numeric code, in any case, in the precomputed code table
+    return get_country_code_index().resolve(alpha_code)
+
+def resolve_alpha_codes(input_alpha: str) -> tuple[list, str]:
+    """
+    Auxiliary function that converts a comma separated list of ISO 3166-1 alpha-2, alpha-3 
+    or numeric country codes into their alpha-2 codes, in one pass over the precomputed code 
+    table. Rather than stopping at the first invalid code, all invalid codes are listed in 
+    the error message.
+
+    Parameters
+    ==========
+    :input_alpha: str
+        comma separated list of ISO 3166-1 alpha-2, alpha-3 or numeric country codes.
+
+    Returns
+    =======
+    :alpha2_codes: list
+        converted alpha-2 codes, without duplicates, in input order.
+    :error_message: str
+        error message listing the invalid codes, empty if all codes are valid.
+    """
+    alpha2_codes, invalid_codes = get_country_code_index().resolve_all(input_alpha.strip(",").replace('%20', ''))
+    if (invalid_codes):
+        return [], f"Invalid ISO 3166-1 country code input, cannot convert into corresponding alpha-2 code: {', '.join(invalid_codes)}."
+    return alpha2_codes, ""
 
 def validate_year(year: str) -> tuple[list,bool,bool,bool,bool,bool,str]:
     """
@@ -1169,8 +1619,8 @@ def validate_year(year: str) -> tuple[list,bool,bool,bool,bool,bool,str]:
     year_error = False
     year_error_message = ""
 
-    #parse alpha code parameter, split into list, remove any whitespace and sort
-    year = sorted(year.replace(' ', '').replace('%20', '').split(','))
+    #parse year parameter, split into list and remove any whitespace, the first year determines any symbol used so the list isn't sorted
+    year = year.replace(' ', '').replace('%20', '').split(',')
     
     #convert > or < symbol from unicode to str ("%3E" and "%3C", respectively)
     year = [urllib.parse.unquote(s) for s in year]
@@ -1183,8 +1633,11 @@ def validate_year(year: str) -> tuple[list,bool,bool,bool,bool,bool,str]:
         #if it's a range, split and validate each part
         years = sanitized_year.split('-')
         for y in years:
-            #skip empty strings
+            #skip empty strings, unless a symbol is input without a year e.g '>' or '2010-'
             if not y:
+                if year_:
+                    year_error, year_error_message = True, f"Invalid year input, must be a valid year >= 1996, got {year_}."
+                    return [], False, False, False, False, year_error, year_error_message
                 continue
 
             #validate year format
@@ -1240,43 +1693,6 @@ def validate_year(year: str) -> tuple[list,bool,bool,bool,bool,bool,str]:
     
     return year, year_range, year_greater_than, year_less_than, year_not_equal, year_error, year_error_message
 
-def sort_by_date(input_iso3166_updates: dict, date_asc_desc="datedesc") -> dict:
-    """
-    Sort the inputted updates object by publication date. The date_asc_desc 
-    parameter determines if the output is sorted latest or earliest first. 
-    The 2 accepted values are dateDesc and dateAsc, meaning to sort the date
-    descending or ascending, respectively. The "Country Code" attribute is 
-    added to each update object.
-
-    Parameters
-    ==========
-    :input_iso3166_updates: dict    
-        object of unsorted ISO 3166 updates. 
-    :date_asc_desc: str
-        parameter to determine whether to sort ascending or descending.
-
-    Returns
-    =======
-    :all_updates: dict
-        sorted object of ISO 3166 updates by publication date. 
-    """
-    #iterate over all updates, create updates object with Country Code added to identify the update's country, flatten into a list and append to array 
-    flattened_iso3166_updates = []
-    for country_code, updates in input_iso3166_updates.items():
-        for update in updates:
-            flattened_iso3166_updates.append({**update, "Country Code": country_code})
-
-    #sort flattened array by publication date, ascending or descending according to parameter, if invalid value input, descending by default
-    if (date_asc_desc == "dateasc"):
-        flattened_iso3166_updates.sort(key=lambda update: datetime.strptime(update["Date Issued"].split(" (")[0].strip(), "%Y-%m-%d"), reverse=False)
-    else:
-        flattened_iso3166_updates.sort(key=lambda update: datetime.strptime(update["Date Issued"].split(" (")[0].strip(), "%Y-%m-%d"), reverse=True)
-
-    #set flattened data to output object
-    all_updates = flattened_iso3166_updates
-
-    return all_updates
-    
 def convert_date_format(date: str) -> str|None:
     """
     Convert inputted date string into the YYYY-MM-DD format. There
@@ -1334,6 +1750,354 @@ def convert_date_format(date: str) -> str|None:
         #return None if date cannot be converted into desired format
         return None
 
+class StreamedRecords(NamedTuple):
+    """
+    Update records of a streamed response, grouped per country or sorted by date, that are only converted
+    into the updates output by the API, with any fields projection, as each country's records, or each
+    sorted record, is serialized by generate_response_chunks or generate_ndjson_chunks, rather than the
+    whole response data being built before its first chunk is sent.
+    """
+    records: dict|list
+    fields: tuple = ()
+
+    @property
+    def by_country(self) -> bool:
+        """ Whether the records are grouped per country, a mapping of alpha-2 code to records, else a list of records sorted by date. """
+        return not isinstance(self.records, list)
+
+    def updates(self, records, tagged: bool=False):
+        """ Generate the updates of the records, as output by the API, with their Country Code attribute if tagged, then their fields projected. """
+        for record in records:
+            update = record.compact_update.to_dict(record.country_code if tagged else None)
+            yield {key: value for key, value in update.items() if key in self.fields} if self.fields else update
+
+def paginate_query_results(spec: QuerySpec, sort_by: str="", limit: int=0, offset: int=0, cursor: str="", 
+                           streamed: bool=False) -> tuple[dict|list|StreamedRecords, dict]:
+    """
+    Get the page of the update records matching the query, via the query engine, as the updates 
+    output by the API. If the sortBy parameter is dateAsc or dateDesc, and there is more than one
+    country, the page of updates sorted via the publication date is output, else the page of 
+    countries, with only the page's countries' records selected by the query engine. For a 
+    streamed response, the page of records is output as StreamedRecords, converted into updates 
+    as they're serialized.
+
+    Parameters
+    ==========
+    :spec: QuerySpec
+        country, year and date range filters of the query.
+    :sort_by: str (default="")
+        lowercased sortBy query string parameter.
+    :limit: int (default=0)
+        maximum number of countries or updates to output, 0 meaning no limit.
+    :offset: int (default=0)
+        number of countries or updates to skip.
+    :cursor: str (default="")
+        cursor token of the country or update the page starts after.
+    :streamed: bool (default=False)
+        whether the response is streamed, see is_streamed_request.
+
+    Returns
+    =======
+    :iso3166_updates: dict|list|StreamedRecords
+        page of updates per country, or sorted updates, or their records for a streamed response.
+    :metadata_extra: dict
+        total record count before pagination and cursor of the next page, when limit, offset 
+        or cursor are explicitly specified.
+    """
+    if (sort_by == 'dateasc' or sort_by == 'datedesc'):
+        records_by_country = get_query_engine().select(spec)
+        if (len(records_by_country) > 1):
+            iso3166_updates, next_cursor = paginate_records_by_date(records_by_country, date_asc_desc=sort_by, limit=limit, offset=offset, cursor=cursor, streamed=streamed)
+            return iso3166_updates, pagination_metadata(sum(len(records) for records in records_by_country.values()), limit, offset, cursor, next_cursor)
+
+    #get the page of countries, starting after the country of the cursor, if input, the other countries' records only being counted
+    try:
+        records_by_country, total, more = get_query_engine().select_page(spec, limit, offset, decode_cursor(cursor, "country") if cursor else None)
+    except KeyError:
+        raise InvalidCursorError(f"Invalid cursor query string parameter, it doesn't belong to the requested results: {cursor}.")
+    next_cursor = encode_cursor("country", next(reversed(records_by_country))) if (more and records_by_country) else None
+
+    return records_to_updates(records_by_country, streamed=streamed), pagination_metadata(total, limit, offset, cursor, next_cursor)
+
+def paginate_search_results(spec: QuerySpec, include_match_score: bool=True, sort_by: str="", limit: int=0, offset: int=0, cursor: str="",
+                            timeout: float|None=None) -> tuple[dict|list, dict, float]:
+    """
+    Get the page of the updates matching the search terms and other filters of the query, found 
+    within the time budget, via the query engine, with only the page's updates built from the 
+    matches. The search results are a list of updates, sorted by their match score, or via their
+    publication date if the sortBy parameter is dateAsc or dateDesc, with the page of updates 
+    output, else the updates per country, with the page of countries output.
+
+    Parameters
+    ==========
+    :spec: QuerySpec
+        filters of the query, including the search terms and likeness score.
+    :include_match_score: bool (default=True)
+        output the Match Score attribute of the updates, else the updates per country.
+    :sort_by: str (default="")
+        lowercased sortBy query string parameter.
+    :limit: int (default=0)
+        maximum number of updates, or countries, to output, 0 meaning no limit.
+    :offset: int (default=0)
+        number of updates, or countries, to skip.
+    :cursor: str (default="")
+        cursor token of the update, or country, the page starts after.
+    :timeout: float (default=None)
+        time budget of the search in seconds, None for no budget.
+
+    Returns
+    =======
+    :search_results: dict|list
+        page of the matching updates, empty if none match.
+    :metadata_extra: dict
+        total count of the matching updates before pagination and cursor of the next page, when 
+        limit, offset or cursor are explicitly specified.
+    :scanned: float
+        fraction of the search's work done, 1 if it finished within the time budget.
+
+    Raises
+    ======
+    ValueError:
+        likeness score not between 1 and 100.
+    InvalidCursorError:
+        cursor can't be decoded or it doesn't belong to the search results.
+    """
+    #the order of the search results, a list of updates or updates per country, is only known once searched, so either cursor is decoded 
+    start_after = decode_cursor(cursor, ("index", "country")) if cursor else None
+    try:
+        search_results, total, more, scanned = get_query_engine().search_page(spec, timeout, include_match_score, sort_by_date=(sort_by == 'dateasc' or sort_by == 'datedesc'), 
+                                                                              descending=(sort_by != 'dateasc'), limit=limit, offset=offset, start_after=start_after)
+    except LookupError:
+        raise InvalidCursorError(f"Invalid cursor query string parameter, it doesn't belong to the requested results: {cursor}.")
+
+    #cursor of the page's last update or country, if there are more after it
+    next_cursor = None
+    if (more and search_results):
+        if isinstance(search_results, list):
+            next_cursor = encode_cursor("index", (start_after + 1 if start_after is not None else offset) + len(search_results) - 1)
+        else:
+            next_cursor = encode_cursor("country", next(reversed(search_results)))
+
+    return search_results, pagination_metadata(total, limit, offset, cursor, next_cursor), scanned
+
+def validate_pagination(limit: str, offset: str, cursor: str="") -> tuple[int, int, bool, str]:
+    """
+    Parse and validate the limit, offset and cursor pagination query string parameters, 
+    the limit and offset must be non-negative integers. A limit of 0 means no limit. As
+    a cursor marks the start of a page, it can't be used alongside an offset.
+
+    Parameters
+    ==========
+    :limit: str
+        maximum number of countries or updates to output.
+    :offset: str
+        number of countries or updates to skip.
+    :cursor: str (default="")
+        opaque cursor token of the position the page starts after.
+
+    Returns
+    =======
+    :limit: int
+        parsed limit.
+    :offset: int
+        parsed offset.
+    :pagination_error: bool
+        bool to track if an error has occurred when parsing the parameters.
+    :pagination_error_message: str
+        error message to output if error has occurred.
+    """
+    try:
+        limit, offset = int(limit), int(offset)
+    except ValueError:
+        return 0, 0, True, "The limit and offset parameters must be non-negative integers."
+
+    if limit < 0 or offset < 0:
+        return 0, 0, True, "The limit and offset parameters must be non-negative integers."
+
+    if cursor and offset > 0:
+        return 0, 0, True, "The cursor and offset parameters cannot be used together."
+
+    return limit, offset, False, ""
+
+class InvalidCursorError(ValueError):
+    """ Error raised when a cursor query string parameter can't be decoded, or doesn't belong to the requested results. """
+
+def encode_cursor(order: str, position) -> str:
+    """ 
+    Encode the position of the last country or update of a page, in the order of the paginated results, into an 
+    opaque URL-safe cursor token. The order is one of dateasc/datedesc, for updates sorted by date, country, for
+    countries, or index, for lists of updates in their output order. 
+    """
+    return base64.urlsafe_b64encode(json.dumps([order, position], separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, order: str):
+    """
+    Decode a cursor token, as output by encode_cursor, into the position of the last country or 
+    update of the previous page.
+
+    Parameters
+    ==========
+    :cursor: str
+        cursor token.
+    :order: str|tuple
+        order of the results being paginated, the cursor must have been encoded for the same order,
+        or for any of the orders if a tuple of orders is input.
+
+    Returns
+    =======
+    :position: str|int|list
+        alpha-2 code of the last country, index of the last update in a list of updates, or 
+        [date ordinal, alpha-2 code, position] of the last update sorted by date.
+
+    Raises
+    ======
+    InvalidCursorError:
+        cursor can't be decoded or it was encoded for a different order.
+    """
+    try:
+        cursor_order, position = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError):
+        raise InvalidCursorError(f"Invalid cursor query string parameter: {cursor}.")
+
+    #validate the cursor's position is of the expected type for the order
+    if (cursor_order not in (order if isinstance(order, tuple) else (order,))):
+        raise InvalidCursorError(f"Invalid cursor query string parameter, it doesn't belong to the requested results: {cursor}.")
+    if (cursor_order in ("dateasc", "datedesc")):
+        valid_position = (isinstance(position, list) and len(position) == 3 and isinstance(position[0], int) 
+                          and isinstance(position[1], str) and isinstance(position[2], int))
+    elif (cursor_order == "country"):
+        valid_position = isinstance(position, str)
+    else:
+        valid_position = isinstance(position, int) and position >= 0
+    if not (valid_position):
+        raise InvalidCursorError(f"Invalid cursor query string parameter: {cursor}.")
+
+    return position
+
+def paginate_records_by_date(records_by_country: dict, date_asc_desc: str="datedesc", limit: int=0, offset: int=0, cursor: str="", 
+                             streamed: bool=False) -> tuple[list|StreamedRecords, str|None]:
+    """
+    Get the page of the inputted update records sorted by publication date, using the pre-sorted dates
+    in the updates store rather than re-parsing and re-sorting the updates, as updates with their 
+    "Country Code" attribute added. The page starts after the update of the cursor, if input, which is 
+    found by a binary search of the sorted updates, and only the page of sorted updates is selected, 
+    rather than sorting all the updates and then slicing. The cursor of the page's last update is also 
+    output, if there are more updates after it.
+
+    Parameters
+    ==========
+    :records_by_country: dict
+        update records per country, from the updates store.
+    :date_asc_desc: str (default="datedesc")
+        parameter to determine whether to sort ascending or descending.
+    :limit: int (default=0)
+        maximum number of sorted updates to output, 0 meaning no limit.
+    :offset: int (default=0)
+        number of sorted updates to skip.
+    :cursor: str (default="")
+        cursor token of the update the page starts after.
+    :streamed: bool (default=False)
+        whether the response is streamed, see is_streamed_request.
+
+    Returns
+    =======
+    :all_updates: list|StreamedRecords
+        page of ISO 3166 updates sorted by publication date, or their records for a streamed response.
+    :next_cursor: str|None
+        cursor token of the page's last update, None if it's the last page.
+    """
+    updates_store = get_updates_store()
+    order = "dateasc" if date_asc_desc == "dateasc" else "datedesc"
+    after = tuple(decode_cursor(cursor, order)) if cursor else None
+
+    #get one more update than the limit, to find out if there is a next page
+    try:
+        records = updates_store.sort_by_date(records_by_country, descending=(order == "datedesc"), limit=(limit + 1 if limit > 0 else None), 
+                                             offset=offset, after=after)
+    except ValueError:
+        raise InvalidCursorError(f"Invalid cursor query string parameter, it doesn't belong to the requested results: {cursor}.")
+
+    next_cursor = None
+    if (limit > 0 and len(records) > limit):
+        records = records[:limit]
+        next_cursor = encode_cursor(order, [records[-1].ordinal, records[-1].country_code, records[-1].position])
+
+    if (streamed):
+        return StreamedRecords(records), next_cursor
+    return [updates_store.tagged_update(record) for record in records], next_cursor
+
+def paginate(data: dict|list, limit: int=0, offset: int=0, cursor: str="") -> tuple[dict|list, str|None]:
+    """
+    Get the page of countries from a dict of updates/records per country, or the page of updates from a list 
+    of updates, starting after the country or update of the cursor, if input. The start of the page is found 
+    by looking up the cursor's country or index, rather than iterating over all the preceding countries. The 
+    cursor of the page's last country or update is also output, if there are more after it.
+
+    Parameters
+    ==========
+    :data: dict|list
+        updates/records per country, or list of updates.
+    :limit: int (default=0)
+        maximum number of countries or updates to output, 0 meaning no limit.
+    :offset: int (default=0)
+        number of countries or updates to skip.
+    :cursor: str (default="")
+        cursor token of the country or update the page starts after.
+
+    Returns
+    =======
+    :page: dict|list
+        page of countries or updates.
+    :next_cursor: str|None
+        cursor token of the page's last country or update, None if it's the last page.
+    """
+    if limit == 0 and offset == 0 and not cursor:
+        return data, None
+
+    #alpha-2 codes of the countries in order, using the updates store's codes for all updates data
+    if not isinstance(data, list):
+        order = "country"
+        updates_store = get_updates_store()
+        keys = updates_store.country_codes if (data is updates_store.records_by_country) else tuple(data)
+    else:
+        order = "index"
+        keys = data
+
+    #index of the first country or update of the page
+    start = offset
+    if (cursor):
+        position = decode_cursor(cursor, order)
+        if (order == "country"):
+            if (position not in data):
+                raise InvalidCursorError(f"Invalid cursor query string parameter, it doesn't belong to the requested results: {cursor}.")
+            start = (updates_store.country_index(position) if keys is updates_store.country_codes else keys.index(position)) + 1
+        else:
+            start = position + 1
+    stop = start + limit if limit > 0 else len(keys)
+
+    next_cursor = None
+    if (stop < len(keys)):
+        next_cursor = encode_cursor(order, keys[stop - 1] if order == "country" else stop - 1)
+
+    if (order == "country"):
+        return {country_code: data[country_code] for country_code in keys[start:stop]}, next_cursor
+    return data[start:stop], next_cursor
+
+def pagination_metadata(total: int, limit: int=0, offset: int=0, cursor: str="", next_cursor: str|None=None) -> dict:
+    """ Get the pagination metadata for the response, only when limit, offset or cursor are explicitly specified. """
+    if limit == 0 and offset == 0 and not cursor:
+        return {}
+    return {"total": total, "offset": offset, "limit": limit if limit > 0 else None, "next_cursor": next_cursor}
+
+def records_to_updates(records_by_country: dict, streamed: bool=False) -> dict|StreamedRecords:
+    """ 
+    Helper function that converts update records grouped per country into the updates object output by the API, 
+    or for a streamed response, see is_streamed_request, into StreamedRecords, converted as they're serialized. 
+    """
+    if (streamed):
+        return StreamedRecords(records_by_country)
+    return {country_code: [record.update for record in records] for country_code, records in records_by_country.items()}
+
 def create_error_message(message: str, path: str, status: int = 400) -> dict:
     """ Helper function that returns error message when one occurs in Flask app. """
     return {"message": message, "path": path, "status": status}
@@ -1341,11 +2105,16 @@ def create_error_message(message: str, path: str, status: int = 400) -> dict:
 def create_response(data, **metadata_extra):
     """
     Build a standardised response envelope: {"data": ..., "metadata": {"count": N, "generated": "...", ...}}.
-    This ensures a consistent response shape across all successful endpoints.
+    This ensures a consistent response shape across all successful endpoints. If the stream query 
+    string parameter is set, the envelope is streamed in chunks, via generate_response_chunks, 
+    instead of the entire body being built in memory before the first byte is sent. If the NDJSON 
+    format is requested, one update per line is streamed instead, via generate_ndjson_chunks.
+    The payload of a streamed response can be StreamedRecords, converted into updates as they're
+    streamed.
 
     Parameters
     ==========
-    :data: dict | list
+    :data: dict | list | StreamedRecords
         The payload to return inside the envelope.
     :**metadata_extra:
         Any additional key/value pairs to merge into the metadata object (e.g. pagination fields).
@@ -1355,47 +2124,264 @@ def create_response(data, **metadata_extra):
     :flask.Response:
         jsonified envelope response.
     """
-    if isinstance(data, list):
-        count = len(data)
-    elif isinstance(data, dict):
-        count = sum(len(v) for v in data.values() if isinstance(v, list))
-    else:
-        count = 0
-
     metadata = {
-        "count": count,
+        "count": get_response_count(data),
         "generated": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
     }
     metadata.update(metadata_extra)
-    return jsonify({"data": data, "metadata": metadata})
+
+    #if NDJSON format requested, stream one update per line, with no envelope
+    if (get_response_format() == "ndjson"):
+        response = Response(generate_ndjson_chunks(data), mimetype="application/x-ndjson")
+        response.implicit_sequence_conversion = False
+    #if stream query string parameter set, serialize and send the envelope incrementally, rather than building the whole body first
+    elif (is_streamed_request()):
+        response = Response(generate_response_chunks(data, metadata), mimetype="application/json")
+        #don't let the conditional request handling buffer the stream to compute its Content-Length
+        response.implicit_sequence_conversion = False
+    else:
+        response = jsonify({"data": data, "metadata": metadata})
+    last_modified = get_response_last_modified(data)
+    if (last_modified):
+        response.last_modified = last_modified
+    return response
+
+def generate_response_chunks(data, metadata: dict):
+    """
+    Generate the JSON of the {"data": ..., "metadata": {...}} response envelope incrementally, 
+    serializing each country's updates, or each update of a list, in turn and yielding chunks of 
+    roughly _STREAM_CHUNK_SIZE bytes. The output is identical to the jsonified envelope. The 
+    records of StreamedRecords are converted into updates a country, or a sorted record, at a 
+    time as they're serialized, so the whole payload is never built in memory.
+
+    Parameters
+    ==========
+    :data: dict | list | StreamedRecords
+        The payload to return inside the envelope.
+    :metadata: dict
+        The metadata object of the envelope.
+
+    Returns
+    =======
+    :chunk: str
+        chunk of the JSON response envelope.
+    """
+    if isinstance(data, StreamedRecords) and data.by_country:
+        opening, closing = '{"data":{', '}'
+        parts = (dumps_compact(key) + ":" + dumps_compact(list(data.updates(data.records[key]))) for key in (sorted(data.records) if app.json.sort_keys else data.records))
+    elif isinstance(data, StreamedRecords):
+        opening, closing = '{"data":[', ']'
+        parts = (dumps_compact(update) for update in data.updates(data.records, tagged=True))
+    elif isinstance(data, dict):
+        opening, closing = '{"data":{', '}'
+        parts = (dumps_compact(key) + ":" + dumps_compact(data[key]) for key in (sorted(data) if app.json.sort_keys else data))
+    elif isinstance(data, list):
+        opening, closing = '{"data":[', ']'
+        parts = (dumps_compact(item) for item in data)
+    else:
+        opening, closing = '{"data":' + dumps_compact(data), ''
+        parts = ()
+
+    def envelope_parts():
+        yield opening
+        for i, part in enumerate(parts):
+            yield ("," + part) if i else part
+        yield closing + ',"metadata":' + dumps_compact(metadata) + '}\n'
+
+    yield from join_chunks(envelope_parts())
+
+def generate_ndjson_chunks(data):
+    """
+    Generate the NDJSON of the response data incrementally, one flattened update per line, 
+    tagged with its "Country Code" attribute, as per the output when sorting by date, and 
+    yielding chunks of roughly _STREAM_CHUNK_SIZE bytes. The updates of a dict of updates 
+    per country are output in the same country order as the JSON response. The records of 
+    StreamedRecords are converted into updates one at a time as they're serialized.
+
+    Parameters
+    ==========
+    :data: dict | list | StreamedRecords
+        The response data, updates per country or a flattened list of updates, or their records.
+
+    Returns
+    =======
+    :chunk: str
+        chunk of NDJSON lines.
+    """
+    if isinstance(data, StreamedRecords) and data.by_country:
+        updates = ({**update, "Country Code": country_code} for country_code in (sorted(data.records) if app.json.sort_keys else data.records) 
+                   for update in data.updates(data.records[country_code]))
+    elif isinstance(data, StreamedRecords):
+        updates = data.updates(data.records, tagged=True)
+    elif isinstance(data, dict):
+        updates = ({**update, "Country Code": country_code} for country_code in (sorted(data) if app.json.sort_keys else data) 
+                   if isinstance(data[country_code], list) for update in data[country_code])
+    elif isinstance(data, list):
+        updates = data
+    else:
+        updates = ()
+
+    yield from join_chunks(dumps_compact(update) + "\n" for update in updates)
+
+def join_chunks(parts):
+    """ Join serialized parts of a streamed response into chunks of roughly _STREAM_CHUNK_SIZE bytes. """
+    chunk, chunk_size = [], 0
+    for part in parts:
+        chunk.append(part)
+        chunk_size += len(part)
+        if (chunk_size >= _STREAM_CHUNK_SIZE):
+            yield "".join(chunk)
+            chunk, chunk_size = [], 0
+    if (chunk):
+        yield "".join(chunk)
+
+def dumps_compact(data) -> str:
+    """ Serialize data into compact JSON using the app's JSON provider, matching the output of jsonify. """
+    return app.json.dumps(data, separators=(",", ":"))
+
+def create_cached_response(cached_payload, cache_status: str) -> Response:
+    """
+    Build the standardised response envelope from a pre-serialized payload in the response 
+    cache, only serializing the metadata object with its generated timestamp. The X-Cache 
+    response header reports whether the payload was a cache HIT or MISS.
+
+    Parameters
+    ==========
+    :cached_payload: CachedPayload
+        pre-serialized payload from the response cache.
+    :cache_status: str
+        HIT if the payload was already cached, MISS if it was just serialized.
+
+    If the client accepts the gzip or deflate Content-Encoding, the encoded response 
+    is built from the payload's data pre-compressed at the highest level.
+
+    Returns
+    =======
+    :flask.Response:
+        JSON envelope response.
+    """
+    generated = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    #gzip or deflate encoded response built from the payload's pre-compressed data, if accepted by the client
+    encoding = get_response_encoding()
+    if (encoding):
+        response = Response(get_response_cache().render_encoded(cached_payload, encoding, generated=generated), mimetype="application/json")
+        response.headers["Content-Encoding"] = encoding
+    else:
+        response = Response(get_response_cache().render_chunks(cached_payload, generated=generated), mimetype="application/json")
+    response.headers["X-Cache"] = cache_status
+    if (cached_payload.last_modified):
+        response.last_modified = cached_payload.last_modified
+    return response
+
+def put_cached_response(cache_key, data, **metadata_extra):
+    """ Serialize the response data and cache it in the response cache under the key, for the current dataset version, with any additional metadata. """
+    return get_response_cache().put(cache_key, get_updates_store().version, data, get_response_count(data), get_response_last_modified(data), metadata_extra)
+
+def is_streamed_request() -> bool:
+    """ Whether the request's response is streamed, an NDJSON response or a JSON response with the stream query string parameter set. """
+    return get_response_format() == "ndjson" or (request.args.get('stream') or "false").lower().rstrip('/') in ['true', '1', 'yes']
+
+def is_cacheable_request() -> bool:
+    """ Whether the request's response can be served from the response cache, a JSON response that isn't streamed. """
+    return not is_streamed_request()
+
+def get_cached_query_response(query_key) -> Response|None:
+    """ 
+    Set the ETag of the request from its canonical query, returning a bodyless 304 Not Modified response if the request's 
+    conditional headers match, as per check_conditional_request, else get the response of the canonical query from the 
+    response cache, None if it isn't cached or the request isn't cacheable. 
+    """
+    g.etag = create_etag(query_key)
+    not_modified_response = evaluate_conditional_request()
+    if (not_modified_response):
+        return not_modified_response
+    if not (is_cacheable_request()):
+        return None
+    cached_payload = get_response_cache().get(query_key, get_updates_store().version)
+    return create_cached_response(cached_payload, "HIT") if cached_payload else None
+
+def create_query_response(query_key, data, **metadata_extra) -> Response:
+    """ 
+    Serialize and cache the response data under the canonical query key, returning the response built from 
+    the cached payload, else build the response as per create_response if the request isn't cacheable. 
+    """
+    if not (is_cacheable_request()):
+        return create_response(data, **metadata_extra)
+    return create_cached_response(put_cached_response(query_key, data, **metadata_extra), "MISS")
+
+def get_last_modified(data) -> datetime|None:
+    """ Get the newest publication date of the updates, or update records, in the response data, as a UTC datetime for the Last-Modified response header. """
+    if isinstance(data, StreamedRecords):
+        updates = chain.from_iterable(data.records.values()) if data.by_country else data.records
+    elif isinstance(data, list):
+        updates = data
+    elif isinstance(data, dict):
+        updates = chain.from_iterable(v for v in data.values() if isinstance(v, list))
+    else:
+        return None
+    newest_date = get_updates_store().newest_date(updates)
+    if (newest_date is None):
+        return None
+    return datetime(newest_date.year, newest_date.month, newest_date.day, tzinfo=timezone.utc)
+
+def get_response_last_modified(data) -> datetime|None:
+    """ 
+    Get the Last-Modified date of the response, the newest publication date of its updates before any fields projection, 
+    as recorded by apply_fields_filter, so it doesn't depend on the Date Issued attribute being output, else of the response data. 
+    """
+    if (has_request_context() and "last_modified" in g):
+        return g.last_modified
+    return get_last_modified(data)
+
+def get_response_count(data) -> int:
+    """ Get the count of updates in the response data, for the response metadata. """
+    if isinstance(data, StreamedRecords):
+        return sum(len(records) for records in data.records.values()) if data.by_country else len(data.records)
+    elif isinstance(data, list):
+        return len(data)
+    elif isinstance(data, dict):
+        return sum(len(v) for v in data.values() if isinstance(v, list))
+    return 0
+
+def parse_fields(fields_str: str) -> list[str]:
+    """ Parse the comma-separated ``fields_str`` parameter into the list of valid field names it lists. """
+    valid_fields = {"Change", "Description of Change", "Date Issued", "Source", "Country Code", "Match Score"}
+    return [f.strip() for f in fields_str.split(",") if f.strip() in valid_fields]
 
 def apply_fields_filter(data, fields_str: str):
     """
     Filter the fields of each update record in the response to only include
     those listed in the comma-separated ``fields_str`` parameter.
 
+    The fields of StreamedRecords are projected as their updates are streamed.
+
     Parameters
     ==========
-    :data: dict | list
-        ISO 3166 updates payload (keyed by alpha-2 or a flat list).
+    :data: dict | list | StreamedRecords
+        ISO 3166 updates payload (keyed by alpha-2 or a flat list), or their records.
     :fields_str: str
         Comma-separated field names to keep, e.g. "Change,Date Issued".
 
     Returns
     =======
-    :data: dict | list
+    :data: dict | list | StreamedRecords
         Filtered payload, or the original if fields_str is empty/invalid.
     """
     if not fields_str:
         return data
 
-    field_list = [f.strip() for f in fields_str.split(",") if f.strip()]
-    valid_fields = {"Change", "Description of Change", "Date Issued", "Source", "Country Code", "Match Score"}
-    field_list = [f for f in field_list if f in valid_fields]
+    field_list = parse_fields(fields_str)
     if not field_list:
         return data
 
-    if isinstance(data, list):
+    #record the Last-Modified date of the response from the updates before they're projected, as Date Issued may not be kept
+    if (has_request_context()):
+        g.last_modified = get_last_modified(data)
+
+    if isinstance(data, StreamedRecords):
+        return data._replace(fields=tuple(field_list))
+    elif isinstance(data, list):
         return [{k: v for k, v in item.items() if k in field_list} for item in data]
     elif isinstance(data, dict):
         return {
@@ -1405,6 +2391,143 @@ def apply_fields_filter(data, fields_str: str):
         }
     return data
 
+def create_etag(query_key=None) -> str:
+    """
+    Create the strong ETag of the current request's response, a hash of the updates dataset 
+    version plus the canonical query, as well as the negotiated Content-Encoding and response 
+    format, as each encoding and format of a response is a different representation. For the
+    query endpoints the canonical query is the query's canonical key, as created by 
+    canonical_query_key, so every URL of the same query, e.g /api/alpha/FR,DE, /api/alpha/DEU,FRA
+    and /alpha/de,fr, has the same ETag, and a client can revalidate one with the ETag of another.
+    Otherwise it's the endpoint, its path parameters and its query string parameters in sorted 
+    order. The ETag can therefore be computed, and matched against the If-None-Match request 
+    header, before any of the endpoint's filtering or serialization work has run.
+
+    Parameters
+    ==========
+    :query_key: QueryKey (default=None)
+        canonical key of the request's query, by default the query is taken from the request.
+
+    Returns
+    =======
+    :etag: str
+        ETag of the current request's response.
+    """
+    if (query_key is not None):
+        canonical_query = json.dumps([get_updates_store().version, query_key, get_response_encoding(), get_response_format()])
+    else:
+        canonical_query = json.dumps([get_updates_store().version, request.endpoint, sorted((request.view_args or {}).items()), 
+                                      sorted(request.args.items(multi=True)), get_response_encoding(), get_response_format()])
+    return hashlib.sha1(canonical_query.encode("utf-8")).hexdigest()
+
+@app.before_request
+def check_conditional_request():
+    """
+    Return a bodyless 304 Not Modified response for a conditional request to a data endpoint 
+    before any filtering or serialization work runs, if the If-None-Match header matches the 
+    request's ETag or, without If-None-Match, the If-Modified-Since date is no earlier than 
+    the newest publication date of all updates. The conditional requests of the query endpoints
+    are checked once their query is parsed, as their ETag is that of their canonical query.
+    """
+    if (request.method not in ("GET", "HEAD") or request.endpoint not in data_endpoints or request.endpoint in query_endpoints):
+        return None
+
+    #ETag of the request's response, also set on the full response by add_conditional_headers
+    g.etag = create_etag()
+
+    return evaluate_conditional_request()
+
+def evaluate_conditional_request() -> Response|None:
+    """ 
+    Get a bodyless 304 Not Modified response if the request's If-None-Match header matches its ETag or, without If-None-Match,
+    its If-Modified-Since date is no earlier than the newest publication date of all updates, else None. 
+    """
+    if (request.if_none_match):
+        if (request.if_none_match.contains_weak(g.etag)):
+            return create_not_modified_response(g.etag)
+    elif (request.if_modified_since and get_updates_store().latest_date):
+        latest_date = get_updates_store().latest_date
+        if (request.if_modified_since >= datetime(latest_date.year, latest_date.month, latest_date.day, tzinfo=timezone.utc)):
+            return create_not_modified_response(g.etag)
+
+    return None
+
+@app.after_request
+def add_conditional_headers(response):
+    """
+    Append the ETag to successful data endpoint responses, whose Last-Modified date is set by 
+    create_response, and convert the response to a 304 Not Modified response if its 
+    Last-Modified date is no later than the request's If-Modified-Since date.
+    """
+    if ("etag" in g and response.status_code == 200):
+        response.set_etag(g.etag)
+        response = response.make_conditional(request)
+    return response
+
+@app.after_request
+def compress_response(response):
+    """
+    Compress successful data endpoint responses with the gzip or deflate Content-Encoding 
+    accepted by the client, if the body is at least _COMPRESSION_MIN_SIZE bytes, or streamed.
+    Responses from the response cache are already encoded from their pre-compressed data, 
+    so skipped.
+    """
+    if (request.endpoint not in data_endpoints):
+        return response
+
+    #responses vary on the client's Accept-Encoding and Accept headers
+    response.vary.add("Accept-Encoding")
+    response.vary.add("Accept")
+
+    if (response.status_code != 200 or response.direct_passthrough or "Content-Encoding" in response.headers):
+        return response
+
+    encoding = get_response_encoding()
+    if (encoding is None):
+        return response
+
+    #streamed responses are compressed incrementally, as they are sent
+    if (response.is_streamed):
+        response.response = compress_stream(response.iter_encoded(), encoding)
+        response.headers["Content-Encoding"] = encoding
+        return response
+
+    if (response.content_length is None or response.content_length < _COMPRESSION_MIN_SIZE):
+        return response
+
+    response.set_data(compress(response.get_data(), encoding))
+    response.headers["Content-Encoding"] = encoding
+    return response
+
+@app.before_request
+def validate_response_format():
+    """ Return an error if the format query string parameter of a data endpoint request is neither json nor ndjson. """
+    if (request.endpoint in data_endpoints and request.args.get('format', default="json").lower().rstrip('/') not in ("json", "ndjson")):
+        return jsonify(create_error_message(f"Invalid format query string parameter, expected json or ndjson: {request.args.get('format')}.", request.url)), 400
+    return None
+
+def get_response_format() -> str:
+    """ 
+    Get the format of the response from the format query string parameter, else negotiated from 
+    the request's Accept header, ndjson if NDJSON is preferred over JSON, otherwise json. 
+    """
+    response_format = request.args.get('format', default="").lower().rstrip('/')
+    if (response_format):
+        return response_format
+    if (request.accept_mimetypes.best_match(["application/json", "application/x-ndjson"]) == "application/x-ndjson"):
+        return "ndjson"
+    return "json"
+
+def get_response_encoding() -> str|None:
+    """ Negotiate the Content-Encoding of the response from the request's Accept-Encoding header, gzip or deflate, None if neither is accepted. """
+    return request.accept_encodings.best_match(encodings)
+
+def create_not_modified_response(etag: str) -> Response:
+    """ Create a bodyless 304 Not Modified response with the input ETag. """
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
 @app.after_request
 def add_rate_limit_headers(response):
     """
@@ -1423,15 +2546,38 @@ def clear_cache():
     """ Clear cache of Updates class instance and all cached subdivision data. Only available in debug mode. """
     if not app.debug:
         return jsonify(create_error_message("This endpoint is only available in debug mode.", request.url, 403)), 403
-    get_updates_instance.cache_clear()
-    get_all_updates.cache_clear()
+    get_updates_store.cache_clear()
+    get_query_engine.cache_clear()
+    get_search_index.cache_clear()
+    get_country_name_index.cache_clear()
+    get_country_code_index.cache_clear()
+    get_response_cache.cache_clear()
+    get_search_cache().clear()
+    get_search_cache.cache_clear()
+    get_suggest_index.cache_clear()
     return 'Cache cleared'
 
+@app.route('/cache-stats')
+@app.route('/api/cache-stats')
+def cache_stats():
+    """ Get the hit, miss and eviction counters of the response and search caches. Only available in debug mode. """
+    if not app.debug:
+        return jsonify(create_error_message("This endpoint is only available in debug mode.", request.url, 403)), 403
+    return jsonify({"response_cache": get_response_cache().stats(), "search_cache": get_search_cache().stats()})
+
+@app.route('/startup-report')
+@app.route('/api/startup-report')
+def startup_report_endpoint():
+    """ Get the time taken by each stage of this worker's start up, importing, loading and building indexes. Only available in debug mode. """
+    if not app.debug:
+        return jsonify(create_error_message("This endpoint is only available in debug mode.", request.url, 403)), 403
+    return jsonify(startup_report())
+
 @app.route('/version')
 @app.route('/api/version')
 def get_version():
     """ Get the current version of the iso3166-updates being used by the API. Mainly used for dev. """
-    return get_updates_instance().__version__
+    return get_updates_store().version
 
 @app.get("/openapi.yaml")
 @app.get("/spec")
@@ -1441,6 +2587,11 @@ def openapi_yaml():
     """ Serve the OpenAPI specification YAML file. """
     return send_from_directory(os.path.dirname(os.path.abspath(__file__)), "openapi.yaml", mimetype="text/yaml")
 
+@app.errorhandler(InvalidCursorError)
+def invalid_cursor(e: InvalidCursorError) -> tuple[dict, int]:
+    """ Return error message when the cursor query string parameter of a paginated request is invalid. """
+    return jsonify(create_error_message(str(e), request.url)), 400
+
 @app.errorhandler(404)
 def not_found(e: int) -> tuple[dict, int]:
     """
@@ -1460,6 +2611,13 @@ def not_found(e: int) -> tuple[dict, int]:
     """
     return render_template("404.html", path=request.url), 404
 
+#time taken to import the API, its modules and packages, and register its routes
+startup_timings["stages"]["import"] = time.perf_counter() - _import_start
+
 if __name__ == '__main__':
-    #run flask app
-    app.run(debug=True)
\ No newline at end of file
+    if ("--startup-report" in sys.argv[1:]):
+        #cold start the worker, loading the updates store and building every index, and output the time taken by each stage
+        print(json.dumps(warm_up(), indent=4))
+    else:
+        #run flask app
+        app.run(debug=True)
\ No newline at end of file
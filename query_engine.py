@@ -0,0 +1,518 @@
+import re
+import time
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from typing import Callable, NamedTuple
+from updates_store import UpdatesStore, UpdateRecord
+from search_cache import SearchCache
+
+'''
+Each data endpoint of the API filters the updates by some combination of countries, years, a date
+range and search terms. Rather than each endpoint having its own scan over the updates, the query
+engine below takes a normalized QuerySpec of the filters and answers it in one pass: the size of
+each indexed filter's result is estimated from the updates store's indexes, the most selective
+filter's records are taken from its index, and only those candidate records are checked against
+the remaining filters. Search terms are matched via the search index's posting lists, with the
+matching records then restricted to the other filters' candidates. The matches of each search are kept
+in a search cache, if input, keyed by the normalized query, so a repeated search only builds its output.
+The search index, and the fuzzy matching libraries it uses, are only built and imported by the first
+search, so queries without search terms never pay for them.
+'''
+
+#number of candidate records checked against search terms that are dates between checks of a search's deadline
+_DEADLINE_CHUNK_SIZE = 32
+
+class QuerySpec(NamedTuple):
+    """
+    Normalized filters of a query, a filter that is None (or empty search terms) isn't applied.
+    The year filter is the parsed year parameter, as output by the API's validate_year function,
+    and the date range is inclusive, as proleptic Gregorian ordinals.
+    """
+    country_codes: tuple[str, ...]|None = None
+    year: tuple[list, bool, bool, bool, bool]|None = None
+    date_range: tuple[int, int]|None = None
+    search_terms: str = ""
+    likeness: int = 100
+
+class QueryEngine():
+    """
+    Query engine that answers a QuerySpec of filters over the update records of an updates
+    store, using the store's indexes. The cost of a query is roughly the size of its most
+    selective filter's result, rather than the size of the dataset.
+
+    Parameters
+    ==========
+    :updates_store: UpdatesStore
+        store of the update records to query.
+    :convert_date: callable (default=None)
+        function that parses a search term into a datetime, or None if it isn't a date,
+        a search term that is a date is also matched against the updates' "Date Issued".
+        By default search terms are never treated as dates.
+    :search_cache: SearchCache (default=None)
+        cache of the matches of recent searches, keyed by the normalized query and the
+        store's dataset version. By default searches aren't cached.
+    :search_index: callable (default=None)
+        function returning the search index of the updates store, called on the first
+        search. By default a SearchIndex of the store is built.
+
+    Methods
+    =======
+    plan(spec):
+        get the indexed filters of the query, with their estimated result sizes, most selective first.
+    select(spec):
+        get the update records matching the country, year and date range filters of the query.
+    select_page(spec, limit, offset, start_after):
+        get the page of countries of the update records matching the country, year and date range filters of the query.
+    search(spec, include_match_score):
+        get the updates matching the search terms and other filters of the query.
+    search_within(spec, timeout, include_match_score):
+        get the updates matching the search terms and other filters of the query found within a time budget.
+    search_page(spec, timeout, include_match_score, sort_by_date, descending, limit, offset, start_after):
+        get the page of the updates matching the search terms and other filters of the query found within a time budget.
+
+    Usage
+    =====
+    from query_engine import QueryEngine, QuerySpec
+
+    engine = QueryEngine(updates_store)
+
+    #get the update records of France and Germany published from 2015 to 2018
+    engine.select(QuerySpec(country_codes=("FR", "DE"), year=(["2015", "2018"], True, False, False, False)))
+
+    #get the updates mentioning "addition" published in 2016
+    engine.search(QuerySpec(year=(["2016"], False, False, False, False), search_terms="addition"))
+    """
+    def __init__(self, updates_store: UpdatesStore, convert_date: Callable|None=None, search_cache: SearchCache|None=None,
+                 search_index: Callable|None=None) -> None:
+
+        self.updates_store = updates_store
+        self._convert_date = convert_date
+        self.search_cache = search_cache
+
+        #inverted index of the words of the updates' Change and Description of Change attributes, for search terms, built on first use
+        self._search_index_factory = search_index
+        self._search_index = None
+
+        #number of updates published per year, for estimating the size of year filters
+        self._year_sizes = {year: sum(len(positions) for positions in countries.values()) for year, countries in updates_store.year_index.items()}
+
+    @property
+    def search_index(self):
+        """ Inverted index of the words of the updates, a SearchIndex, built or got from the search_index function on first use. """
+        if (self._search_index is None):
+            if (self._search_index_factory is not None):
+                self._search_index = self._search_index_factory()
+            else:
+                from search_index import SearchIndex
+                self._search_index = SearchIndex(self.updates_store)
+        return self._search_index
+
+    def plan(self, spec: QuerySpec) -> list[tuple[str, int]]:
+        """
+        Get the indexed filters of the query, country, year and date_range, each with the
+        estimated number of records matching it, ordered most selective first. The country
+        estimate is the number of updates of the countries, the year estimate the size of
+        the matching year buckets and the date range estimate the length of the timeline
+        slice, found with two binary searches.
+
+        Parameters
+        ==========
+        :spec: QuerySpec
+            filters of the query.
+
+        Returns
+        =======
+        :plan: list
+            (filter, estimated result size) pairs, smallest first.
+        """
+        plan = []
+        if (spec.country_codes is not None):
+            plan.append(("country", sum(len(self.updates_store.records_by_country.get(country_code, ())) for country_code in set(spec.country_codes))))
+        if (spec.year is not None):
+            plan.append(("year", sum(self._year_sizes[year] for year in self.updates_store.select_years(*spec.year))))
+        if (spec.date_range is not None):
+            timeline_ordinals = self.updates_store.timeline_ordinals
+            plan.append(("date_range", bisect_right(timeline_ordinals, spec.date_range[1]) - bisect_left(timeline_ordinals, spec.date_range[0])))
+        return sorted(plan, key=lambda item: item[1])
+
+    def select(self, spec: QuerySpec) -> dict[str, list[UpdateRecord]]:
+        """
+        Get the update records matching the country, year and date range filters of the query,
+        grouped per country. The records of the most selective filter are taken from its index,
+        i.e the countries' records, the year buckets or the date timeline slice, then checked
+        against the other filters. The countries are output in the order of the country filter,
+        or dataset order if there isn't one, each with its records in per country order. As per
+        the year index, an update matching a year input more than once is output more than once.
+
+        Parameters
+        ==========
+        :spec: QuerySpec
+            filters of the query, the search terms are ignored.
+
+        Returns
+        =======
+        :records_by_country: dict
+            update records per country, countries without any matching records are excluded,
+            apart from when the country filter is the only filter, where each of its countries
+            in the store is output, with an empty list if it has no updates, e.g "GF". If the 
+            query has no filters, the store's own records_by_country mapping is output.
+        """
+        plan = self.plan(spec)
+        if not (plan):
+            return self.updates_store.records_by_country
+
+        #check each country's candidate records against the other filters, excluding countries without records, 
+        # apart from when only filtering by country, as per the alpha and country name endpoints
+        candidates, multiplicity = self._candidates(spec, plan)
+        keep_empty = (len(plan) == 1 and plan[0][0] == "country")
+        records_by_country = {}
+        for country_code, positions in candidates.items():
+            records = self._matching_records(country_code, positions, multiplicity)
+            if (records or keep_empty):
+                records_by_country[country_code] = records
+        return records_by_country
+
+    def select_page(self, spec: QuerySpec, limit: int=0, offset: int=0, start_after: str|None=None) -> tuple[dict[str, list[UpdateRecord]], int, bool]:
+        """
+        Get the page of countries of the update records matching the country, year and date range
+        filters of the query, as output by select, starting after the country of start_after, if 
+        input, else after skipping offset countries. Only the records of the page's countries are 
+        built, and checked against the other filters, the other countries' candidate records are 
+        just counted, for the total count of the query's records, from the positions output by the
+        most selective filter's index, only being built if they're checked against other filters.
+
+        Parameters
+        ==========
+        :spec: QuerySpec
+            filters of the query, the search terms are ignored.
+        :limit: int (default=0)
+            maximum number of countries to output, 0 meaning no limit.
+        :offset: int (default=0)
+            number of countries to skip, if start_after isn't input.
+        :start_after: str (default=None)
+            alpha-2 code of the country the page starts after, the last country of the previous page.
+
+        Returns
+        =======
+        :records_by_country: dict
+            update records per country of the page, as per select.
+        :total: int
+            number of update records matching the query, of all its countries.
+        :more: bool
+            whether there are countries after the page.
+
+        Raises
+        ======
+        KeyError:
+            start_after isn't a country output by the query.
+        """
+        plan = self.plan(spec)
+        if not (plan):
+            candidates, multiplicity = dict.fromkeys(self.updates_store.country_codes), None
+        else:
+            candidates, multiplicity = self._candidates(spec, plan)
+        keep_empty = (not plan or (len(plan) == 1 and plan[0][0] == "country"))
+
+        #count each country's matching records, only building the page's countries' records, the store's own records if there are no filters
+        records_by_country, total, more = {}, 0, False
+        start = offset if start_after is None else None
+        index = 0
+        for country_code, positions in candidates.items():
+            if (multiplicity is None):
+                count = len(self.updates_store[country_code]) if positions is None else len(positions)
+            else:
+                count = sum(map(multiplicity, self._candidate_records(country_code, positions)))
+            if not (count or keep_empty):
+                continue
+            total += count
+            if (start is None):
+                if (country_code == start_after):
+                    start = index + 1
+            elif (index >= start):
+                if (limit > 0 and index >= start + limit):
+                    more = True
+                else:
+                    records_by_country[country_code] = self.updates_store[country_code] if not plan else self._matching_records(country_code, positions, multiplicity)
+            index += 1
+
+        if (start is None):
+            raise KeyError(f"Country {start_after} isn't output by the query.")
+        return records_by_country, total, more
+
+    def _candidates(self, spec: QuerySpec, plan: list[tuple[str, int]]) -> tuple[dict[str, list[int]|None], Callable|None]:
+        """
+        Get the countries of the query in output order, each with the positions of its candidate records, from the index of 
+        the most selective filter, i.e the countries' records, the year buckets or the date timeline slice, None for all of 
+        the country's records, and the multiplicity function of a candidate record for the other filters, the number of times
+        it's output, None if there aren't other filters. The countries are in the order of the country filter, or dataset 
+        order if there isn't one, and as per the year index, a record matching a year input more than once is a candidate,
+        and has a multiplicity, once per match.
+        """
+        seed = plan[0][0]
+        if (seed == "country"):
+            positions_by_country = dict.fromkeys(country_code for country_code in spec.country_codes if country_code in self.updates_store)
+        elif (seed == "year"):
+            positions_by_country = self.updates_store.year_positions(*spec.year)
+        else:
+            positions_by_country = self.updates_store.date_range_positions(*spec.date_range)
+        candidates = {country_code: positions_by_country[country_code] for country_code in dict.fromkeys(spec.country_codes if spec.country_codes is not None else positions_by_country) 
+                      if country_code in positions_by_country}
+
+        #number of times a candidate record matches the other year and date range filters
+        year_counts = Counter(self.updates_store.select_years(*spec.year)) if (spec.year is not None and seed != "year") else None
+        date_range = spec.date_range if (spec.date_range is not None and seed != "date_range") else None
+        if (year_counts is None and date_range is None):
+            return candidates, None
+
+        def multiplicity(record: UpdateRecord) -> int:
+            if (date_range is not None and not (date_range[0] <= record.ordinal <= date_range[1]
+                                                or (record.corrected_ordinal is not None and date_range[0] <= record.corrected_ordinal <= date_range[1]))):
+                return 0
+            return 1 if year_counts is None else year_counts[record.year]
+        return candidates, multiplicity
+
+    def _candidate_records(self, country_code: str, positions: list[int]|None) -> list[UpdateRecord]:
+        """ Get a country's candidate records at their positions, or all of its records if the positions are None. """
+        country_records = self.updates_store[country_code]
+        if (positions is None):
+            return list(country_records)
+        return [country_records[position] for position in positions]
+
+    def _matching_records(self, country_code: str, positions: list[int]|None, multiplicity: Callable|None) -> list[UpdateRecord]:
+        """ Get a country's candidate records matching the other filters, each as many times as its multiplicity. """
+        records = self._candidate_records(country_code, positions)
+        if (multiplicity is None):
+            return records
+        return [record for record in records for _ in range(multiplicity(record))]
+
+    def search(self, spec: QuerySpec, include_match_score: bool=True) -> dict|list:
+        """
+        Get the updates whose Change or Description of Change attributes match the search terms
+        of the query, only checking the records matching its other filters. A comma separated
+        term is an exact match (a score of 100) if it's found as a word in the attributes, else
+        its score is its best fuzzy match ratio with any word, matching if the score is at least
+        the likeness score. A term that is a date is also searched for in the "Date Issued". An
+        update is output once per matching term, as per the iso3166-updates search function.
+        The matches and scores of each term are taken from the search index, with only terms
+        that are dates, whose matching depends on each update's "Date Issued", checked against
+        the text of each candidate record. The matches are taken from the search cache, if the
+        query, with its terms normalized, was searched recently, with only the output built.
+
+        Parameters
+        ==========
+        :spec: QuerySpec
+            filters of the query, including the search terms and likeness score.
+        :include_match_score: bool (default=True)
+            output a list of the matching updates, with their Country Code and Match Score
+            attributes, sorted by score descending, else the matching updates per country,
+            sorted by country code.
+
+        Returns
+        =======
+        :search_results: dict|list
+            matching updates, empty if none match.
+
+        Raises
+        ======
+        ValueError:
+            likeness score not between 1 and 100.
+        """
+        return self.search_within(spec, None, include_match_score)[0]
+
+    def search_within(self, spec: QuerySpec, timeout: float|None, include_match_score: bool=True) -> tuple[dict|list, float]:
+        """
+        Get the updates matching the search terms and other filters of the query, as per search, 
+        but stopping the matching once the time budget is spent, outputting the best matches found 
+        so far and the fraction of the search's work that was done: the vocabulary words scored for 
+        fuzzy terms, or the candidate records checked for terms that are dates. Only the matches of 
+        a search that finished are cached.
+
+        Parameters
+        ==========
+        :spec: QuerySpec
+            filters of the query, including the search terms and likeness score.
+        :timeout: float
+            time budget of the search in seconds, None for no budget.
+        :include_match_score: bool (default=True)
+            output a list of the matching updates, with their Country Code and Match Score
+            attributes, sorted by score descending, else the matching updates per country,
+            sorted by country code.
+
+        Returns
+        =======
+        :search_results: dict|list
+            matching updates found within the time budget, empty if none match.
+        :scanned: float
+            fraction of the search's work done, 1 if it finished within the time budget.
+
+        Raises
+        ======
+        ValueError:
+            likeness score not between 1 and 100.
+        """
+        search_results, _, _, scanned = self.search_page(spec, timeout, include_match_score)
+        return search_results, scanned
+
+    def search_page(self, spec: QuerySpec, timeout: float|None=None, include_match_score: bool=True, sort_by_date: bool=False, descending: bool=True,
+                    limit: int=0, offset: int=0, start_after: int|str|None=None) -> tuple[dict|list, int, bool, float]:
+        """
+        Get the page of the updates matching the search terms and other filters of the query, found 
+        within the time budget, as per search_within. The matches are ordered, sorted by score or 
+        grouped per country, and sorted via their publication date, if input, as (record, score) 
+        pairs, with only the updates of the page built from them. The page is of updates for a list 
+        of updates, starting after the index of start_after, and of countries for updates per 
+        country, starting after the country of start_after, else after skipping offset of them.
+
+        Parameters
+        ==========
+        :spec: QuerySpec
+            filters of the query, including the search terms and likeness score.
+        :timeout: float (default=None)
+            time budget of the search in seconds, None for no budget.
+        :include_match_score: bool (default=True)
+            output a list of the matching updates, with their Country Code and Match Score
+            attributes, sorted by score descending, else the matching updates per country,
+            sorted by country code.
+        :sort_by_date: bool (default=False)
+            sort the matching updates via their original publication date, stably, as a list of updates
+            with their Country Code attribute appended. As per the sortBy parameter, the updates of a 
+            single country aren't sorted.
+        :descending: bool (default=True)
+            sort the latest publication date first, else the earliest.
+        :limit: int (default=0)
+            maximum number of updates, or countries, to output, 0 meaning no limit.
+        :offset: int (default=0)
+            number of updates, or countries, to skip, if start_after isn't input.
+        :start_after: int|str (default=None)
+            index of the update, or alpha-2 code of the country, the page starts after.
+
+        Returns
+        =======
+        :search_results: dict|list
+            page of matching updates found within the time budget, empty if none match.
+        :total: int
+            number of matching updates found, of all pages.
+        :more: bool
+            whether there are updates, or countries, after the page.
+        :scanned: float
+            fraction of the search's work done, 1 if it finished within the time budget.
+
+        Raises
+        ======
+        ValueError:
+            likeness score not between 1 and 100.
+        IndexError:
+            start_after isn't the index of an update of the search results, for a list of updates.
+        KeyError:
+            start_after isn't a country of the search results, for updates per country.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if not (1 <= spec.likeness <= 100):
+            raise ValueError(f"Likeness score must be between 1 and 100, got {spec.likeness}.")
+
+        #prepare each search term's pattern, a date term is converted to YYYY-MM-DD
+        terms = []
+        for term in (term.strip().lower() for term in spec.search_terms.split(",")):
+            term_date = self._convert_date(term) if self._convert_date else None
+            if (term_date is not None):
+                term = str(term_date).split(" ")[0]
+            word_pattern = re.compile(re.escape(term) if re.search(r'\W', term) else r'\b{}\b'.format(re.escape(term)))
+            terms.append((term, word_pattern, term_date is not None))
+
+        #get the matches of the normalized query from the search cache, else match the terms and cache them
+        cache_key, scanned = None, 1.0
+        if (self.search_cache is not None):
+            year = None if spec.year is None else (tuple(spec.year[0]), *spec.year[1:])
+            cache_key = (self.updates_store.version, tuple(term for term, _, _ in terms), spec.likeness, spec.country_codes, year, spec.date_range)
+            matches = self.search_cache.get(cache_key)
+        if (cache_key is None or matches is None):
+            matches, scanned = self._match_terms(spec, terms, deadline)
+            if (cache_key is not None and scanned == 1):
+                matches = self.search_cache.put(cache_key, matches)
+
+        #order the matches as a list sorted by score, or per country sorted by country code, then sorted via their publication date, if input
+        matches_by_country, ordered_matches = None, None
+        if (include_match_score):
+            ordered_matches = sorted(matches, key=lambda match: match[1], reverse=True)
+        else:
+            matches_by_country = {}
+            for match in matches:
+                matches_by_country.setdefault(match[0].country_code, []).append(match)
+            matches_by_country = dict(sorted(matches_by_country.items()))
+            if (sort_by_date and len(matches_by_country) > 1):
+                ordered_matches = [match for country_matches in matches_by_country.values() for match in country_matches]
+        if (sort_by_date and ordered_matches is not None):
+            ordered_matches.sort(key=lambda match: match[0].date_issued, reverse=descending)
+
+        #build the updates of the page of the list of matching updates
+        if (ordered_matches is not None):
+            if (start_after is not None and not isinstance(start_after, int)):
+                raise IndexError(f"Update index {start_after} isn't of the search results.")
+            start = offset if start_after is None else start_after + 1
+            stop = start + limit if limit > 0 else len(ordered_matches)
+            if (include_match_score):
+                search_results = [{"Country Code": record.country_code, **record.update, "Match Score": score} for record, score in ordered_matches[start:stop]]
+            else:
+                search_results = [self.updates_store.tagged_update(record) for record, _ in ordered_matches[start:stop]]
+            return search_results, len(matches), stop < len(ordered_matches), scanned
+
+        #build the updates of the page of countries of the matching updates per country
+        country_codes = list(matches_by_country)
+        start = offset
+        if (start_after is not None):
+            if (start_after not in matches_by_country):
+                raise KeyError(f"Country {start_after} isn't of the search results.")
+            start = country_codes.index(start_after) + 1
+        stop = start + limit if limit > 0 else len(country_codes)
+        search_results = {country_code: [record.update for record, _ in matches_by_country[country_code]] for country_code in country_codes[start:stop]}
+        return search_results, len(matches), stop < len(country_codes), scanned
+
+    def _match_terms(self, spec: QuerySpec, terms: list[tuple[str, re.Pattern, bool]], deadline: float|None=None) -> tuple[list[tuple[UpdateRecord, int]], float]:
+        """ 
+        Get the (record, match score) pairs of the records matching each prepared (term, word pattern, is date) search term and the other 
+        filters, in output order, found before the time.monotonic deadline, if input, and the fraction of the search's work done. 
+        """
+        matches = []
+        if not any(is_date for _, _, is_date in terms):
+            #get each term's matching records and scores from the search index, matching the records of the other filters,
+            # or all matching records in dataset order if there aren't any, in order of the terms for each record
+            term_scores, term_scanned = [], []
+            for term, _, _ in terms:
+                scores, scanned = self.search_index.partial_term_scores(term, spec.likeness, deadline)
+                term_scores.append(scores)
+                term_scanned.append(scanned)
+            if (spec.country_codes is None and spec.year is None and spec.date_range is None):
+                records = (self.updates_store.records[record_id] for record_id in sorted(set().union(*term_scores)))
+            else:
+                records = (record for records in self.select(spec._replace(search_terms="")).values() for record in records)
+            for record in records:
+                record_id = self.search_index.record_id(record)
+                for scores in term_scores:
+                    if (record_id in scores):
+                        matches.append((record, scores[record_id]))
+            return matches, sum(term_scanned) / len(term_scanned)
+        else:
+            #match the terms against the text of each candidate record, rebuilt from its compact update, a date term appending the "Date Issued" 
+            # to the text searched by it and any later terms, checking the deadline every _DEADLINE_CHUNK_SIZE records
+            from rapidfuzz import fuzz as rfuzz
+            from search_index import search_text
+            records = [record for records in self.select(spec._replace(search_terms="")).values() for record in records]
+            for record_index, record in enumerate(records):
+                if (deadline is not None and record_index % _DEADLINE_CHUNK_SIZE == 0 and time.monotonic() >= deadline):
+                    return matches, record_index / len(records)
+                combined_text = search_text(record)
+                for term, word_pattern, is_date in terms:
+                    if (is_date):
+                        combined_text = f"{combined_text}{record.compact_update.date_issued.strip()}".lower()
+                    if (word_pattern.search(combined_text)):
+                        matches.append((record, 100))
+                    else:
+                        words = re.findall(r'\w+', combined_text)
+                        if (words):
+                            score = max(int(round(rfuzz.ratio(term, word))) for word in words)
+                            if (score >= spec.likeness):
+                                matches.append((record, score))
+            return matches, 1.0
+
+    def __repr__(self) -> str:
+        return f"QueryEngine({self.updates_store!r})"
@@ -0,0 +1,425 @@
+import json
+import gzip
+import zlib
+import struct
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Callable, Hashable, NamedTuple
+
+'''
+The most commonly requested responses of the API, all updates data, a single country's updates
+and a single year's updates, only change when the iso3166-updates dataset is updated, a few times
+a year. Rather than re-serializing the same payloads on every request, the ResponseCache below
+holds the JSON bytes of each payload's data, keyed by the dataset version, so that only the small
+metadata object with its generated timestamp needs serializing per request.
+
+The payload data is also compressed once, at the highest compression level, into raw deflate blocks 
+ending on a byte boundary. A gzip or deflate encoded response is then built by concatenating the 
+compressed envelope prefix, payload data and metadata suffix, wrapped in the gzip or zlib header and
+trailer, with only the small metadata suffix compressed per request.
+
+The same data is requested through many different URLs, e.g /api/alpha/FR,DE, /api/alpha/DEU,FRA,
+/api/alpha/250,276/ and /alpha/de,fr, so payloads are keyed by the canonical form of the query
+rather than its URL. A QueryKey holds the query's resolved alpha-2 codes, sorted, its parsed year
+expression, its date window as ordinals and its normalized sortBy, fields and pagination parameters,
+so every spelling of a query shares one cached payload. As any query can now be cached, the cache
+is bounded by the total bytes of its payloads, evicting the least recently used ones once full, and
+all payloads are dropped once a payload of a new dataset version is put.
+'''
+
+#Content-Encodings that responses can be compressed with, in order of preference
+encodings = ["gzip", "deflate"]
+
+#gzip header (RFC 1952) with no file name or modification time and maximum compression flag
+_GZIP_HEADER = b"\x1f\x8b\x08\x00\x00\x00\x00\x00\x02\xff"
+
+#zlib header (RFC 1950) for maximum compression level, used for the deflate Content-Encoding
+_ZLIB_HEADER = b"\x78\xda"
+
+def deflate_segment(data: bytes, final: bool=False) -> bytes:
+    """
+    Compress data at the highest compression level into raw deflate blocks. Segments 
+    that aren't final end with a full flush, so they end on a byte boundary and don't 
+    reference earlier data, allowing independently compressed segments to be joined 
+    into one deflate stream, with the final segment last.
+
+    Parameters
+    ==========
+    :data: bytes
+        data to compress.
+    :final: bool (default=False)
+        whether the segment is the last of the deflate stream.
+
+    Returns
+    =======
+    :segment: bytes
+        raw deflate blocks of the compressed data.
+    """
+    compressor = zlib.compressobj(9, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_FULL_FLUSH)
+
+def join_deflate_segments(segments: list[tuple[bytes, bytes]], encoding: str) -> bytes:
+    """
+    Join (data, deflate segment) pairs into a single gzip or deflate encoded body, 
+    wrapping the segments in the encoding's header and its trailer, whose checksum is 
+    computed over the uncompressed data of all segments.
+
+    Parameters
+    ==========
+    :segments: list
+        (uncompressed data, raw deflate segment) pairs in order, the last being final.
+    :encoding: str
+        gzip or deflate.
+
+    Returns
+    =======
+    :body: bytes
+        encoded body.
+    """
+    compressed = b"".join(segment for _, segment in segments)
+    if (encoding == "gzip"):
+        crc, size = 0, 0
+        for data, _ in segments:
+            crc = zlib.crc32(data, crc)
+            size += len(data)
+        return _GZIP_HEADER + compressed + struct.pack("<II", crc, size & 0xffffffff)
+    adler = 1
+    for data, _ in segments:
+        adler = zlib.adler32(data, adler)
+    return _ZLIB_HEADER + compressed + struct.pack(">I", adler)
+
+def compress(body: bytes, encoding: str, level: int=6) -> bytes:
+    """ Compress a response body with the gzip or deflate Content-Encoding. """
+    if (encoding == "gzip"):
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    return zlib.compress(body, level)
+
+def compress_stream(chunks, encoding: str, level: int=6):
+    """ Incrementally compress the chunks of a streamed response body with the gzip or deflate Content-Encoding, yielding compressed chunks. """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, (16 + zlib.MAX_WBITS) if encoding == "gzip" else zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if (compressed):
+            yield compressed
+    yield compressor.flush()
+
+#opening of the response envelope, compressed once
+_ENVELOPE_PREFIX = b'{"data":'
+_DEFLATED_ENVELOPE_PREFIX = deflate_segment(_ENVELOPE_PREFIX)
+
+#sortBy values that sort the updates via their publication date, any other value sorts by country code
+_DATE_SORTS = ("dateasc", "datedesc")
+
+class QueryKey(NamedTuple):
+    """
+    Canonical form of a data endpoint query, as created by canonical_query_key, under which
+    its response payload is cached.
+    """
+    endpoint: str
+    alpha2_codes: tuple = ()
+    year: tuple|None = None
+    date_range: tuple|None = None
+    sort_by: str = ""
+    fields: tuple = ()
+    limit: int = 0
+    offset: int = 0
+    cursor: str = ""
+
+def canonical_query_key(endpoint: str, alpha2_codes=(), year: tuple|None=None, date_range: tuple|None=None, sort_by: str="", 
+                        fields=(), limit: int=0, offset: int=0, cursor: str="") -> QueryKey:
+    """
+    Get the canonical key of a data endpoint query, the same for every query outputting the same
+    data. The alpha-2 codes and fields are deduplicated and sorted, a list of years is sorted, 
+    keeping any repeated years as each update is output once per repeat, an exclusion of years is 
+    deduplicated and sorted and a range of a single year is that year, and the sortBy parameter is
+    only kept if it sorts via the publication date, and there's more than one country to sort.
+
+    Parameters
+    ==========
+    :endpoint: str
+        name of the endpoint, e.g "api_alpha".
+    :alpha2_codes: iterable (default=())
+        alpha-2 codes the query is filtered to, resolved from the input alpha-2, alpha-3 or numeric codes.
+    :year: tuple (default=None)
+        (year, year_range, year_greater_than, year_less_than, year_not_equal) as parsed by validate_year,
+        None if not filtered by year.
+    :date_range: tuple (default=None)
+        start and end date ordinals as parsed by parse_date_range, None if not filtered by date.
+    :sort_by: str (default="")
+        lowercased sortBy query string parameter.
+    :fields: iterable (default=())
+        valid field names of the fields projection.
+    :limit: int (default=0)
+        maximum number of countries or updates to output, 0 meaning no limit.
+    :offset: int (default=0)
+        number of countries or updates to skip.
+    :cursor: str (default="")
+        cursor token of the country or update the page starts after.
+
+    Returns
+    =======
+    :query_key: QueryKey
+        canonical key of the query.
+    """
+    alpha2_codes = tuple(sorted(set(alpha2_codes)))
+
+    #years as (operator, years), the list and exclusion of years being unordered, a list of years output once per repeat of a year
+    if (year is not None):
+        years, year_range, year_greater_than, year_less_than, year_not_equal = year
+        if (year_range):
+            year = ("=", (years[0],)) if years[0] == years[1] else ("-", tuple(years))
+        elif (year_greater_than or year_less_than):
+            year = (">" if year_greater_than else "<", tuple(years))
+        elif (year_not_equal):
+            year = ("<>", tuple(sorted(set(years))))
+        else:
+            year = ("=", tuple(sorted(years)))
+
+    #a single country's updates aren't sorted via their publication date
+    sort_by = sort_by if (sort_by in _DATE_SORTS and len(alpha2_codes) != 1) else ""
+
+    return QueryKey(endpoint, alpha2_codes, year, tuple(date_range) if date_range else None, sort_by, tuple(sorted(set(fields))), limit, offset, cursor)
+
+class CachedPayload(NamedTuple):
+    """
+    Pre-serialized JSON data of a response payload, with the dataset version it was
+    built from, the count of updates it holds, for the response metadata, and the
+    newest publication date of its updates, for the Last-Modified response header.
+    The data is also held as a raw deflate segment, for compressed responses, and
+    any further metadata of the payload, e.g its pagination fields.
+    """
+    version: str
+    data: bytes
+    count: int
+    last_modified: datetime|None = None
+    deflated_data: bytes = b""
+    metadata: dict|None = None
+
+    @property
+    def size(self) -> int:
+        """ Size of the payload in bytes, its data plus its deflated data. """
+        return len(self.data) + len(self.deflated_data)
+
+class ResponseCache():
+    """
+    Bounded LRU cache of pre-serialized JSON response payloads. Each payload is stored under 
+    a key describing the request, e.g a QueryKey, alongside the version of the dataset it was 
+    serialized from. A payload from a different dataset version is never returned, it is 
+    treated as a miss, and putting a payload of a new dataset version removes all payloads 
+    of the previous one. Once the total size of the payloads is over the maximum bytes, the
+    least recently used payloads are evicted.
+
+    Parameters
+    ==========
+    :dumps: callable (default=json.dumps)
+        function to serialize a payload's data into a JSON string. The API passes its
+        Flask app's JSON provider so cached responses match jsonify's output.
+    :max_bytes: int (default=32MiB)
+        maximum total size in bytes of the cached payloads, their data plus deflated data.
+
+    Methods
+    =======
+    get(key, version):
+        get the cached payload for the key and dataset version, None if not cached.
+    put(key, version, data, count, last_modified, metadata):
+        serialize and cache the payload data for the key and dataset version, evicting the least recently used payloads if full.
+    render(payload, **metadata):
+        build the JSON response envelope bytes from a cached payload and its metadata.
+    render_chunks(payload, **metadata):
+        build the JSON response envelope from a cached payload and its metadata, as chunks sharing the cached data.
+    render_encoded(payload, encoding, **metadata):
+        build the gzip or deflate encoded JSON response envelope bytes from a cached payload and its metadata.
+    stats():
+        get the cache's size and hit, miss and eviction counters.
+    clear():
+        remove all cached payloads, e.g when the dataset is reloaded.
+
+    Usage
+    =====
+    from response_cache import ResponseCache, canonical_query_key
+
+    response_cache = ResponseCache(max_bytes=1024 * 1024)
+    query_key = canonical_query_key("api_alpha", ["FR", "DE"])
+    response_cache.put(query_key, "1.9.0", updates, 40)
+
+    #get the cached payload of the query, for the same dataset version
+    response_cache.get(query_key, "1.9.0")
+    """
+    def __init__(self, dumps: Callable=json.dumps, max_bytes: int=32 * 1024 * 1024):
+
+        self._dumps = dumps
+        self.max_bytes = max_bytes
+
+        #key -> payload, least recently used first, their total size in bytes and the dataset version of the latest payload put
+        self._payloads = OrderedDict()
+        self.size = 0
+        self.version = None
+        self._lock = threading.Lock()
+
+        #number of cache hits, misses and evictions, since the cache was created
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, version: str) -> CachedPayload|None:
+        """
+        Get the cached payload for the key, if it was serialized from the input dataset version,
+        marking it as the most recently used.
+
+        Parameters
+        ==========
+        :key: hashable
+            key describing the request, e.g a QueryKey.
+        :version: str
+            version of the currently loaded dataset.
+
+        Returns
+        =======
+        :payload: CachedPayload | None
+            cached payload, None if not cached or cached from a different dataset version.
+        """
+        with self._lock:
+            payload = self._payloads.get(key)
+            if (payload is None or payload.version != version):
+                self.misses += 1
+                return None
+            self._payloads.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def put(self, key: Hashable, version: str, data: dict|list, count: int, last_modified: datetime|None=None, metadata: dict|None=None) -> CachedPayload:
+        """
+        Serialize the payload data into JSON bytes, compress them, and cache them under the key, as the
+        most recently used, evicting the least recently used payloads until the total size is within the 
+        maximum bytes. Payloads larger than the maximum bytes aren't cached.
+
+        Parameters
+        ==========
+        :key: hashable
+            key describing the request, e.g a QueryKey.
+        :version: str
+            version of the dataset the data is from.
+        :data: dict | list
+            response payload data.
+        :count: int
+            count of updates in the payload data.
+        :last_modified: datetime (default=None)
+            newest publication date of the updates in the payload data.
+        :metadata: dict (default=None)
+            further key/value pairs of the payload's metadata object, e.g its pagination fields.
+
+        Returns
+        =======
+        :payload: CachedPayload
+            cached payload.
+        """
+        data = self._dumps(data).encode("utf-8")
+        payload = CachedPayload(version, data, count, last_modified, deflate_segment(data), metadata or None)
+        if (payload.size > self.max_bytes):
+            return payload
+        with self._lock:
+            #payloads of the previous dataset version are never returned again
+            if (version != self.version):
+                self._payloads.clear()
+                self.size = 0
+                self.version = version
+            if (key in self._payloads):
+                self._remove(key)
+            self._payloads[key] = payload
+            self.size += payload.size
+            while (self.size > self.max_bytes):
+                self._remove(next(iter(self._payloads)))
+                self.evictions += 1
+        return payload
+
+    def _remove(self, key: Hashable) -> None:
+        """ Remove the cached payload, reducing the total size by its size. """
+        self.size -= self._payloads.pop(key).size
+
+    def render(self, payload: CachedPayload, **metadata) -> bytes:
+        """
+        Build the JSON bytes of the {"data": ..., "metadata": {...}} response envelope,
+        splicing the cached payload's data with the serialized metadata, whose keys are
+        the payload's count and metadata plus any input metadata, e.g the generated timestamp.
+
+        Parameters
+        ==========
+        :payload: CachedPayload
+            cached payload.
+        :**metadata:
+            additional key/value pairs of the metadata object.
+
+        Returns
+        =======
+        :envelope: bytes
+            JSON bytes of the response envelope.
+        """
+        return b"".join(self.render_chunks(payload, **metadata))
+
+    def render_chunks(self, payload: CachedPayload, **metadata) -> list[bytes]:
+        """
+        Build the response envelope as a list of the envelope prefix, the cached payload data, 
+        itself rather than a copy, and the metadata suffix, so a response can be sent from the 
+        chunks without each request copying the payload data into a new body.
+
+        Parameters
+        ==========
+        :payload: CachedPayload
+            cached payload.
+        :**metadata:
+            additional key/value pairs of the metadata object.
+
+        Returns
+        =======
+        :chunks: list
+            JSON bytes chunks of the response envelope.
+        """
+        return [_ENVELOPE_PREFIX, payload.data, self._envelope_suffix(payload, metadata)]
+
+    def render_encoded(self, payload: CachedPayload, encoding: str, **metadata) -> bytes:
+        """
+        Build the gzip or deflate encoded JSON bytes of the response envelope, joining the 
+        pre-compressed envelope prefix and payload data with the metadata suffix, which is 
+        the only part compressed per request.
+
+        Parameters
+        ==========
+        :payload: CachedPayload
+            cached payload.
+        :encoding: str
+            Content-Encoding of the response, gzip or deflate.
+        :**metadata:
+            additional key/value pairs of the metadata object.
+
+        Returns
+        =======
+        :envelope: bytes
+            encoded JSON bytes of the response envelope.
+        """
+        suffix = self._envelope_suffix(payload, metadata)
+        return join_deflate_segments([(_ENVELOPE_PREFIX, _DEFLATED_ENVELOPE_PREFIX), (payload.data, payload.deflated_data),
+                                      (suffix, deflate_segment(suffix, final=True))], encoding)
+
+    def _envelope_suffix(self, payload: CachedPayload, metadata: dict) -> bytes:
+        """ Serialize the closing of the response envelope, with the metadata object of the payload's count and metadata plus the input metadata. """
+        return b',"metadata":' + self._dumps({"count": payload.count, **(payload.metadata or {}), **metadata}).encode("utf-8") + b'}\n'
+
+    def stats(self) -> dict:
+        """ Get the number of cached payloads, their total size in bytes and the hit, miss and eviction counters. """
+        return {"payloads": len(self), "size": self.size, "max_bytes": self.max_bytes, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self) -> None:
+        """ Remove all cached payloads. """
+        with self._lock:
+            self._payloads.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._payloads
+
+    def __repr__(self) -> str:
+        return f"ResponseCache(payloads={len(self)}, size={self.size}, hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
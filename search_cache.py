@@ -0,0 +1,149 @@
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+'''
+The same searches, e.g "addition", "deleted" or "paris", are requested again and again, each
+one matching its terms against the search index and scoring the vocabulary from scratch. The
+SearchCache below holds the matches of recent searches, keyed by their normalized query, i.e the
+lowercased terms, likeness score and other filters, so that a repeated search only rebuilds its
+output from the cached matches. The cache is bounded by the total number of matches it holds,
+evicting the least recently used searches once full, and each search expires after a time to
+live, with the dataset version in the key so a reloaded dataset never gets stale matches.
+'''
+
+class SearchCache():
+    """
+    Bounded LRU cache of search matches, with a time to live. Each entry's size is its number
+    of matches, at least 1, and once the total size of the entries is over the maximum size,
+    the least recently used entries are evicted. An entry is never returned once it is older
+    than the time to live.
+
+    Parameters
+    ==========
+    :max_size: int (default=50000)
+        maximum total number of matches of all cached searches.
+    :ttl: float (default=3600)
+        time to live of each cached search, in seconds, 0 for no expiry.
+    :clock: callable (default=time.monotonic)
+        function returning the current time in seconds.
+
+    Methods
+    =======
+    get(key):
+        get the cached matches of the normalized search query, None if not cached or expired.
+    put(key, matches):
+        cache the matches of the normalized search query, evicting the least recently used searches if full.
+    stats():
+        get the cache's size and hit, miss and eviction counters.
+    clear():
+        remove all cached searches, e.g when the dataset is reloaded.
+
+    Usage
+    =====
+    from search_cache import SearchCache
+
+    search_cache = SearchCache(max_size=10000, ttl=600)
+    search_cache.put(("test", ("addition",), 100), matches)
+
+    #get the cached matches of the search
+    search_cache.get(("test", ("addition",), 100))
+    """
+    def __init__(self, max_size: int=50000, ttl: float=3600, clock: Callable=time.monotonic) -> None:
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+
+        #normalized query -> (time cached, matches), least recently used first, and total number of matches
+        self._entries = OrderedDict()
+        self.size = 0
+        self._lock = threading.Lock()
+
+        #number of cache hits, misses and evictions, since the cache was created
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> tuple|None:
+        """
+        Get the cached matches of the normalized search query, marking it as the most recently used.
+
+        Parameters
+        ==========
+        :key: hashable
+            normalized search query.
+
+        Returns
+        =======
+        :matches: tuple | None
+            cached matches, None if not cached or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if (entry is not None and self.ttl and self._clock() - entry[0] > self.ttl):
+                self._remove(key)
+                entry = None
+            if (entry is None):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, matches) -> tuple:
+        """
+        Cache the matches of the normalized search query, as the most recently used, evicting the least
+        recently used searches until the total size is within the maximum size. Searches with more matches
+        than the maximum size aren't cached.
+
+        Parameters
+        ==========
+        :key: hashable
+            normalized search query.
+        :matches: iterable
+            matches of the search.
+
+        Returns
+        =======
+        :matches: tuple
+            matches of the search.
+        """
+        matches = tuple(matches)
+        size = max(len(matches), 1)
+        if (size > self.max_size):
+            return matches
+        with self._lock:
+            if (key in self._entries):
+                self._remove(key)
+            self._entries[key] = (self._clock(), matches)
+            self.size += size
+            while (self.size > self.max_size):
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+        return matches
+
+    def _remove(self, key: Hashable) -> None:
+        """ Remove the cached search, reducing the total size by its number of matches. """
+        _, matches = self._entries.pop(key)
+        self.size -= max(len(matches), 1)
+
+    def stats(self) -> dict:
+        """ Get the number of cached searches, their total size and the hit, miss and eviction counters. """
+        return {"searches": len(self), "size": self.size, "max_size": self.max_size, "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def clear(self) -> None:
+        """ Remove all cached searches. """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def __repr__(self) -> str:
+        return f"SearchCache(searches={len(self)}, size={self.size}, hits={self.hits}, misses={self.misses}, evictions={self.evictions})"
@@ -0,0 +1,339 @@
+import re
+import math
+import time
+from rapidfuzz import fuzz as rfuzz, process as rprocess
+from rapidfuzz.distance import Indel
+from updates_store import UpdatesStore, UpdateRecord
+
+'''
+The search endpoint matches each search term against the words of every update's "Change" and
+"Description of Change" attributes: a term found as a word, or as a substring if it contains a
+non-word character, is an exact match with a score of 100, else the update's score is the best
+fuzz.ratio of the term with any of its words. Rather than running a regex and scoring every word
+of every update per request, the SearchIndex below tokenizes the updates once, when the dataset
+is loaded, into an inverted index of each word to the updates, and positions within them, that
+it's found in. An exact term is then a single posting list, a term with non-word characters is
+the updates with its words at consecutive positions, checked against its substring, and a fuzzy
+term only scores the vocabulary of distinct words once, taking the updates of the words that
+reach the likeness score from their posting lists. The text of an update is only rebuilt from its
+compact update when it's checked, e.g for a substring, rather than being kept for every update.
+
+A typo in a search term, e.g "subdivison", is matched by lowering the likeness score. The fuzz.ratio
+of two words is 100 * (1 - d / (len_a + len_b)), where d is their insertion/deletion (Indel) distance,
+so a likeness score bounds the distance of the words that can reach it. For the small distances of
+higher likeness scores, the vocabulary words within the distance are found with a BK-tree, a metric
+tree of the words by Indel distance, visiting only a small fraction of the vocabulary, rather than
+scoring every word. Lower likeness scores allow most of the vocabulary, so every word is scored.
+'''
+
+#maximum Indel distance of the vocabulary words searched for with the BK-tree, larger distances visit most of the tree
+_BK_TREE_MAX_DISTANCE = 2
+
+#number of vocabulary words scored between checks of a search's deadline
+_DEADLINE_CHUNK_SIZE = 256
+
+def search_text(record: UpdateRecord) -> str:
+    """ Get the lowercased text searched of an update record, its "Change" and "Description of Change" attributes. """
+    return f"{record.compact_update.change} {record.compact_update.description or ''}".lower()
+
+def max_distance(term_length: int, likeness: int) -> int:
+    """
+    Get the maximum Indel distance of a word whose fuzz.ratio score with a term of the input length
+    can round to at least the likeness score. As the distance is at least the difference of the word
+    lengths, a word's length is at most the term length plus the distance, bounding the distance.
+
+    Parameters
+    ==========
+    :term_length: int
+        length of the search term.
+    :likeness: int
+        likeness score, between 1 and 100.
+
+    Returns
+    =======
+    :max_distance: int
+        maximum Indel distance.
+    """
+    fraction = (100.5 - likeness) / 100
+    return math.floor(2 * term_length * fraction / (1 - fraction) + 1e-9)
+
+class BKTree():
+    """
+    BK-tree of words, a metric tree where each child of a word is at a distinct Indel distance
+    from it. As Indel distance is a metric, the words within a distance of a term are found by
+    only visiting the children whose distance from their parent is within that distance of the
+    parent's distance from the term, by the triangle inequality.
+
+    Parameters
+    ==========
+    :words: iterable
+        distinct words of the tree.
+
+    Methods
+    =======
+    search(term, distance):
+        get the words within the Indel distance of a term.
+    """
+    def __init__(self, words) -> None:
+
+        #each node is a [word, {distance: child node}] pair
+        self._root = None
+        self._size = 0
+        for word in words:
+            self._size += 1
+            if (self._root is None):
+                self._root = [word, {}]
+                continue
+            node = self._root
+            while True:
+                distance = Indel.distance(word, node[0])
+                child = node[1].get(distance)
+                if (child is None):
+                    node[1][distance] = [word, {}]
+                    break
+                node = child
+
+    def search(self, term: str, distance: int) -> list[str]:
+        """
+        Get the words within the Indel distance of the term.
+
+        Parameters
+        ==========
+        :term: str
+            term to search for.
+        :distance: int
+            maximum Indel distance of a word.
+
+        Returns
+        =======
+        :words: list
+            words within the distance, in no particular order.
+        """
+        words = []
+        nodes = [self._root] if self._root else []
+        while nodes:
+            word, children = nodes.pop()
+            word_distance = Indel.distance(term, word)
+            if (word_distance <= distance):
+                words.append(word)
+            for child_distance, child in children.items():
+                if (word_distance - distance <= child_distance <= word_distance + distance):
+                    nodes.append(child)
+        return words
+
+    def __len__(self) -> int:
+        return self._size
+
+class SearchIndex():
+    """
+    Inverted index of the words in the "Change" and "Description of Change" attributes of all
+    updates in an updates store, to the records they're found in and their word positions.
+    Records are identified by their index in the store's dataset order.
+
+    Parameters
+    ==========
+    :updates_store: UpdatesStore
+        store of the update records to index.
+
+    Methods
+    =======
+    record_id(record):
+        get the id of an update record, its index in the store's dataset order.
+    text(record_id):
+        get the lowercased text searched of a record, rebuilt from its compact update.
+    term_scores(term, likeness):
+        get the ids and match scores of the records matching a search term.
+    partial_term_scores(term, likeness, deadline):
+        get the ids and match scores of the records matching a search term, found before the deadline.
+    similar_words(term, likeness):
+        get the vocabulary words with a fuzz.ratio score of at least the likeness with a search term.
+
+    Usage
+    =====
+    from search_index import SearchIndex
+
+    search_index = SearchIndex(updates_store)
+
+    #get the ids and scores of the records mentioning "addition", or a word with at least an 80% likeness
+    search_index.term_scores("addition", likeness=80)
+    """
+    def __init__(self, updates_store: UpdatesStore) -> None:
+
+        self.updates_store = updates_store
+
+        #id of the first record of each country, a record's id is its country's offset plus its position
+        self._country_offsets = {}
+        for record_id, record in enumerate(updates_store.records):
+            self._country_offsets.setdefault(record.country_code, record_id)
+
+        #word -> record id -> word positions postings of the words of each record's lowercased text searched, and ids of the records with at least one word
+        self.postings = {}
+        self._records_with_words = {}
+        for record_id, record in enumerate(updates_store.records):
+            for word_position, word in enumerate(re.findall(r'\w+', search_text(record))):
+                self.postings.setdefault(word, {}).setdefault(record_id, []).append(word_position)
+                self._records_with_words[record_id] = 100
+
+        #distinct words and their BK-tree
+        self.vocabulary = tuple(sorted(self.postings))
+        self.vocabulary_tree = BKTree(self.vocabulary)
+        self._max_word_length = max((len(word) for word in self.vocabulary), default=0)
+
+    def record_id(self, record: UpdateRecord) -> int:
+        """ Get the id of the update record, its index in the updates store's dataset order. """
+        return self._country_offsets[record.country_code] + record.position
+
+    def text(self, record_id: int) -> str:
+        """ Get the lowercased text searched of a record, its "Change" and "Description of Change" attributes, rebuilt from its compact update. """
+        return search_text(self.updates_store.records[record_id])
+
+    def term_scores(self, term: str, likeness: int=100) -> dict[int, int]:
+        """
+        Get the records matching the lowercased search term, with their match scores, as per the
+        iso3166-updates search function. A term without non-word characters is an exact match, with
+        a score of 100, if it's one of the record's words, i.e its posting list, a term with them is
+        an exact match if it's a substring of the record's text, checked only for the records with
+        its words at consecutive positions. Otherwise, a record's score is the best fuzz.ratio of
+        the term with any of its words, matching if at least the likeness score, found by scoring
+        each distinct word in the vocabulary once, rather than the words of every record.
+
+        Parameters
+        ==========
+        :term: str
+            lowercased search term, without surrounding whitespace.
+        :likeness: int (default=100)
+            minimum fuzz.ratio score of a fuzzy match, between 1 and 100.
+
+        Returns
+        =======
+        :term_scores: dict
+            match score of each matching record id.
+        """
+        return self.partial_term_scores(term, likeness)[0]
+
+    def partial_term_scores(self, term: str, likeness: int=100, deadline: float|None=None) -> tuple[dict[int, int], float]:
+        """
+        Get the records matching the lowercased search term, with their match scores, as per term_scores, 
+        but stopping the scoring of the vocabulary once the deadline is reached, with the matches found 
+        so far output alongside the fraction of the vocabulary that was scored. Exact matches, taken from
+        the posting lists, are always found.
+
+        Parameters
+        ==========
+        :term: str
+            lowercased search term, without surrounding whitespace.
+        :likeness: int (default=100)
+            minimum fuzz.ratio score of a fuzzy match, between 1 and 100.
+        :deadline: float (default=None)
+            time.monotonic time to stop scoring at, by default there is no deadline.
+
+        Returns
+        =======
+        :term_scores: dict
+            match score of each matching record id.
+        :scanned: float
+            fraction of the vocabulary scored, 1 if the term's matching finished before the deadline.
+        """
+        #exact matches
+        if (re.search(r'\W', term)):
+            scores = dict.fromkeys(self._substring_matches(term), 100)
+        elif (term == ""):
+            #an empty term matches at any word boundary, i.e every record with a word
+            return dict(self._records_with_words), 1.0
+        else:
+            scores = dict.fromkeys(self.postings.get(term, ()), 100)
+
+        #a fuzzy score can only round to 100 for differing words if their combined length is at least 200
+        if (likeness == 100 and len(term) + self._max_word_length < 200):
+            return scores, 1.0
+
+        #a record's score is the best score of its words similar to the term, if it's not an exact match
+        similar_words, scanned = self._similar_words(term, likeness, deadline)
+        for word, score in similar_words:
+            for record_id in self.postings[word]:
+                if (scores.get(record_id, 0) < score):
+                    scores[record_id] = score
+        return scores, scanned
+
+    def similar_words(self, term: str, likeness: int) -> list[tuple[str, int]]:
+        """
+        Get the vocabulary words whose fuzz.ratio score with the search term is at least the likeness
+        score. If the maximum Indel distance of such a word is small, the words within it are found
+        via the BK-tree, else every vocabulary word is scored.
+
+        Parameters
+        ==========
+        :term: str
+            lowercased search term.
+        :likeness: int
+            likeness score, between 1 and 100.
+
+        Returns
+        =======
+        :similar_words: list
+            (word, score) of each similar word.
+        """
+        return self._similar_words(term, likeness)[0]
+
+    def _similar_words(self, term: str, likeness: int, deadline: float|None=None) -> tuple[list[tuple[str, int]], float]:
+        """ 
+        Get the similar words of the search term, as per similar_words, scoring the vocabulary in chunks until the deadline, if input, 
+        also outputting the fraction of the vocabulary scored. The BK-tree search only visits a small fraction of the vocabulary, so 
+        always finishes.
+        """
+        distance = max_distance(len(term), likeness)
+        scanned = 1.0
+        if (distance <= _BK_TREE_MAX_DISTANCE):
+            words = [(word, int(round(rfuzz.ratio(term, word)))) for word in self.vocabulary_tree.search(term, distance)]
+        else:
+            chunk_size = len(self.vocabulary) if deadline is None else _DEADLINE_CHUNK_SIZE
+            words = []
+            for start in range(0, len(self.vocabulary), chunk_size):
+                if (deadline is not None and time.monotonic() >= deadline):
+                    scanned = start / len(self.vocabulary)
+                    break
+                words.extend((word, int(round(score))) for word, score, _ in rprocess.extract(term, self.vocabulary[start:start + chunk_size], scorer=rfuzz.ratio, 
+                                                                                               processor=None, score_cutoff=likeness - 0.5, limit=None))
+        return [(word, score) for word, score in words if score >= likeness], scanned
+
+    def _substring_matches(self, term: str) -> list[int]:
+        """
+        Get the ids of the records whose text contains the term, that has non-word characters, as a substring.
+        Each of the term's words must be a word of the record, at consecutive positions, except that its first
+        word can be the end of a longer word and its last word the start of one, if the term starts or ends with
+        word characters. Only the records with such a phrase have their text rebuilt, and checked for the substring.
+        """
+        term_words = [(match.group(), match.start() == 0, match.end() == len(term)) for match in re.finditer(r'\w+', term)]
+        if not (term_words):
+            return [record_id for record_id, record in enumerate(self.updates_store.records) if term in search_text(record)]
+
+        #record id -> positions of each term word, each matching any vocabulary word that it can be part of
+        word_positions = []
+        for term_word, open_start, open_end in term_words:
+            if (open_start and open_end):
+                words = [word for word in self.vocabulary if term_word in word]
+            elif (open_start):
+                words = [word for word in self.vocabulary if word.endswith(term_word)]
+            elif (open_end):
+                words = [word for word in self.vocabulary if word.startswith(term_word)]
+            else:
+                words = [term_word] if term_word in self.postings else []
+            positions = {}
+            for word in words:
+                for record_id, word_positions_ in self.postings[word].items():
+                    positions.setdefault(record_id, set()).update(word_positions_)
+            word_positions.append(positions)
+
+        #records with the term's words at consecutive positions, whose text contains the term
+        record_ids = []
+        for record_id in sorted(set.intersection(*(set(positions) for positions in word_positions))):
+            if any(all(start + offset in positions[record_id] for offset, positions in enumerate(word_positions[1:], 1)) for start in word_positions[0][record_id]):
+                if (term in self.text(record_id)):
+                    record_ids.append(record_id)
+        return record_ids
+
+    def __len__(self) -> int:
+        return len(self.vocabulary)
+
+    def __repr__(self) -> str:
+        return f"SearchIndex(records={len(self.updates_store.records)}, vocabulary={len(self.vocabulary)})"
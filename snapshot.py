@@ -0,0 +1,286 @@
+import os
+import sys
+import mmap
+import struct
+from array import array
+
+'''
+Each API worker process builds its own UpdatesStore from the iso3166-updates JSON dataset, parsing
+the JSON and every "Date Issued" string and sorting the date timeline and orders, and holds a private
+copy of the result, multiplying the memory used by the number of workers. Instead, the snapshot built
+below holds the store's update records, their strings, and its derived date timeline, per country
+timelines, date orders, date ranks and year index in a single binary file, written once per dataset
+version by a build step, e.g "python snapshot.py".
+
+A worker opens the snapshot with mmap, read only, so every process on a host shares the one copy of
+the file in the page cache. The derived indexes are arrays of unsigned 32 bit integers read in place,
+as memoryviews of the mapped file, without being copied or parsed. The records are read in place too:
+each record is only built from its fields in the records section, and its strings decoded from the
+strings section, when it's accessed, e.g to output it, so the dataset itself isn't held per worker,
+and the memory it takes doesn't grow with the number of workers.
+
+Layout: a header of the magic bytes, byte order, format version and number of sections, followed by
+a table of each section's name, offset and length, then the sections, each aligned to 8 bytes. Every
+section is an array of unsigned 32 bit integers, apart from the UTF-8 bytes of the strings, with the
+integers in the byte order of the host that built the snapshot.
+'''
+
+#magic bytes at the start of a snapshot file, and version of its binary layout
+_MAGIC = b"ISO3166U"
+_FORMAT_VERSION = 1
+
+#header of magic bytes, byte order (0 little, 1 big endian), format version and number of sections, then a (name, offset, length) entry per section
+_HEADER = struct.Struct("<8sB3xII")
+_SECTION = struct.Struct("<32sQQ")
+
+#id of a missing string, e.g an update without a Description of Change attribute
+NO_STRING = 0xFFFFFFFF
+
+#fields of each update record in the records section, as unsigned 32 bit integers, a corrected ordinal of 0 meaning no corrected date
+RECORD_FIELDS = ("country", "position", "change", "description", "date_issued", "source", "ordinal", "corrected_ordinal", "extra_start", "extra_count")
+
+#default path of the snapshot file, alongside the API
+default_snapshot_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "iso3166-updates.snapshot")
+
+class SnapshotError(ValueError):
+    """ Raised when a file isn't a valid snapshot of the updates dataset, or was built on a host of a different byte order. """
+    pass
+
+def write_snapshot(updates_store, path: str) -> int:
+    """
+    Write the update records, strings and derived indexes of an updates store into a binary
+    snapshot file. The file is written alongside the path then renamed into place, so workers
+    never open a partially written snapshot.
+
+    Parameters
+    ==========
+    :updates_store: UpdatesStore
+        store of the update records and indexes to write.
+    :path: str
+        path of the snapshot file.
+
+    Returns
+    =======
+    :size: int
+        size of the snapshot file in bytes.
+
+    Raises
+    ======
+    SnapshotError:
+        An update has an attribute whose value isn't a string.
+    """
+    #table of distinct strings, each with an id, in order of first use, starting with the dataset version
+    strings, string_ids = [], {}
+    def string_id(value) -> int:
+        if (value is None):
+            return NO_STRING
+        if not isinstance(value, str):
+            raise SnapshotError(f"Expected update attributes to be strings, got {type(value)}.")
+        if (value not in string_ids):
+            string_ids[value] = len(strings)
+            strings.append(value)
+        return string_ids[value]
+
+    sections = {"meta": array("I", [string_id(updates_store.version), len(updates_store.country_codes), len(updates_store.records)])}
+
+    #each country's alpha-2 code and slice of the records, and each record's fields, with its record id being its index in dataset order
+    sections["countries"], sections["records"], sections["extras"] = array("I"), array("I"), array("I")
+    record_ids = {}
+    for country_index, country_code in enumerate(updates_store.country_codes):
+        country_records = updates_store[country_code]
+        sections["countries"].extend([string_id(country_code), len(record_ids), len(country_records)])
+        for record in country_records:
+            record_ids[(country_code, record.position)] = len(record_ids)
+            compact_update = record.compact_update
+            sections["records"].extend([country_index, record.position, string_id(compact_update.change), string_id(compact_update.description),
+                                        string_id(compact_update.date_issued), string_id(compact_update.source), record.ordinal,
+                                        record.corrected_ordinal or 0, len(sections["extras"]) // 2, len(compact_update.extra)])
+            for key, value in compact_update.extra:
+                sections["extras"].extend([string_id(key), string_id(value)])
+
+    #date timeline, as parallel arrays
+    sections["timeline_ordinals"] = array("I", updates_store.timeline_ordinals)
+    sections["timeline_countries"] = array("I", updates_store.timeline_countries)
+    sections["timeline_positions"] = array("I", updates_store.timeline_positions)
+
+    #per country timelines, each country's (start, length) in the concatenated ordinals and positions
+    sections["country_timelines"], sections["country_timeline_ordinals"], sections["country_timeline_positions"] = array("I"), array("I"), array("I")
+    for country_code in updates_store.country_codes:
+        country_ordinals, country_positions = updates_store.timelines_by_country[country_code]
+        sections["country_timelines"].extend([len(sections["country_timeline_ordinals"]), len(country_ordinals)])
+        sections["country_timeline_ordinals"].extend(country_ordinals)
+        sections["country_timeline_positions"].extend(country_positions)
+
+    #record ids in ascending and descending date order, and each record's rank within its country's updates sorted by date
+    sections["date_order_asc"] = array("I", (record_ids[(record.country_code, record.position)] for record in updates_store.date_order_asc))
+    sections["date_order_desc"] = array("I", (record_ids[(record.country_code, record.position)] for record in updates_store.date_order_desc))
+    sections["date_ranks_asc"], sections["date_ranks_desc"] = array("I"), array("I")
+    for country_code in updates_store.country_codes:
+        ranks_asc, ranks_desc = updates_store.date_ranks[country_code]
+        sections["date_ranks_asc"].extend(ranks_asc)
+        sections["date_ranks_desc"].extend(ranks_desc)
+
+    #year index, a (year, country, start, length) row per year and country, into the concatenated positions
+    sections["years"], sections["year_positions"] = array("I"), array("I")
+    for year, countries in updates_store.year_index.items():
+        for country_code, positions in countries.items():
+            sections["years"].extend([year, updates_store.country_index(country_code), len(sections["year_positions"]), len(positions)])
+            sections["year_positions"].extend(positions)
+
+    #strings, as the offsets of each string's UTF-8 bytes in the concatenated bytes
+    encoded_strings = [string.encode("utf-8") for string in strings]
+    string_offsets = array("I", [0])
+    for encoded_string in encoded_strings:
+        string_offsets.append(string_offsets[-1] + len(encoded_string))
+    sections["string_offsets"] = string_offsets
+    sections["strings"] = b"".join(encoded_strings)
+
+    #header, section table, then each section aligned to 8 bytes
+    section_data = [(name, data.tobytes() if isinstance(data, array) else data) for name, data in sections.items()]
+    offset = _HEADER.size + _SECTION.size * len(section_data)
+    table, body = [], []
+    for name, data in section_data:
+        padding = -offset % 8
+        body.extend([b"\0" * padding, data])
+        offset += padding
+        table.append(_SECTION.pack(name.encode("ascii"), offset, len(data)))
+        offset += len(data)
+    contents = b"".join([_HEADER.pack(_MAGIC, 0 if sys.byteorder == "little" else 1, _FORMAT_VERSION, len(section_data)), *table, *body])
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as snapshot_file:
+        snapshot_file.write(contents)
+    os.replace(temp_path, path)
+    return len(contents)
+
+class Snapshot():
+    """
+    Binary snapshot of the updates dataset and its indexes, memory mapped read only, so its
+    pages are shared by every process that opens it. The derived indexes are memoryviews of
+    unsigned 32 bit integers over the mapped file, read in place.
+
+    Parameters
+    ==========
+    :path: str
+        path of the snapshot file, as written by write_snapshot.
+
+    Methods
+    =======
+    array(name):
+        get a section of the snapshot as a memoryview of unsigned 32 bit integers.
+    string(string_id):
+        get a string of the snapshot, decoded from the mapped file, via its id.
+    record(record_id):
+        get a record's fields, as per RECORD_FIELDS, via its id.
+    records():
+        get each record's fields, as per RECORD_FIELDS, in dataset order.
+
+    Raises
+    ======
+    SnapshotError:
+        The file isn't a valid snapshot, or was built on a host of a different byte order.
+
+    Usage
+    =====
+    from snapshot import Snapshot
+    from updates_store import UpdatesStore
+
+    snapshot = Snapshot("iso3166-updates.snapshot")
+
+    #build the updates store from the snapshot
+    UpdatesStore.from_snapshot(snapshot)
+    """
+    def __init__(self, path: str) -> None:
+
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            try:
+                self._mmap = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                raise SnapshotError(f"Snapshot file is empty: {path}.")
+        buffer = memoryview(self._mmap)
+
+        #validate the header, the snapshot's integers are read in the host's byte order
+        if (len(buffer) < _HEADER.size):
+            raise SnapshotError(f"Snapshot file is truncated: {path}.")
+        magic, byte_order, format_version, section_count = _HEADER.unpack_from(buffer)
+        if (magic != _MAGIC):
+            raise SnapshotError(f"Not a snapshot of the updates dataset: {path}.")
+        if (format_version != _FORMAT_VERSION):
+            raise SnapshotError(f"Unsupported snapshot format version {format_version}, expected {_FORMAT_VERSION}: {path}.")
+        if (byte_order != (0 if sys.byteorder == "little" else 1)):
+            raise SnapshotError(f"Snapshot was built on a host of a different byte order: {path}.")
+
+        #memoryview of each section
+        self._sections = {}
+        for index in range(section_count):
+            name, offset, length = _SECTION.unpack_from(buffer, _HEADER.size + index * _SECTION.size)
+            if (offset + length > len(buffer)):
+                raise SnapshotError(f"Snapshot file is truncated: {path}.")
+            self._sections[name.rstrip(b"\0").decode("ascii")] = buffer[offset:offset + length]
+
+        #string offsets, strings and records, read in place as each string and record is accessed
+        if ("strings" not in self._sections):
+            raise SnapshotError(f"Snapshot has no strings section: {path}.")
+        self._string_offsets, self._strings, self._records = self.array("string_offsets"), self._sections["strings"], self.array("records")
+
+        version_id, self.country_count, self.record_count = self.array("meta")
+        self.version = self.string(version_id)
+
+    def array(self, name: str) -> memoryview:
+        """ Get a section of the snapshot as a memoryview of unsigned 32 bit integers, over the mapped file. """
+        if (name not in self._sections):
+            raise SnapshotError(f"Snapshot has no {name} section: {self.path}.")
+        return self._sections[name].cast("I")
+
+    def string(self, string_id: int) -> str|None:
+        """ Get a string of the snapshot via its id, decoded from its UTF-8 bytes in the mapped file on each call, None for the id of a missing string. """
+        if (string_id == NO_STRING):
+            return None
+        return str(self._strings[self._string_offsets[string_id]:self._string_offsets[string_id + 1]], "utf-8")
+
+    def record(self, record_id: int) -> memoryview:
+        """ Get a record's fields, as per RECORD_FIELDS, via its id, its index in dataset order, as a memoryview over the mapped file. """
+        width = len(RECORD_FIELDS)
+        return self._records[record_id * width:(record_id + 1) * width]
+
+    def records(self):
+        """ Get each record's fields, as per RECORD_FIELDS, in dataset order, i.e by record id. """
+        return (self.record(record_id) for record_id in range(self.record_count))
+
+    def __repr__(self) -> str:
+        return f"Snapshot(path={self.path!r}, version={self.version!r}, countries={self.country_count}, records={self.record_count})"
+
+def open_snapshot(path: str, version: str|None=None) -> Snapshot|None:
+    """
+    Open the snapshot file, if it exists and is a valid snapshot of the input dataset version.
+
+    Parameters
+    ==========
+    :path: str
+        path of the snapshot file.
+    :version: str (default=None)
+        version of the updates dataset the snapshot must have been built from, any version by default.
+
+    Returns
+    =======
+    :snapshot: Snapshot | None
+        opened snapshot, None if the file doesn't exist, isn't a valid snapshot or is of another dataset version.
+    """
+    try:
+        snapshot = Snapshot(path)
+    except (OSError, SnapshotError):
+        return None
+    if (version is not None and snapshot.version != version):
+        return None
+    return snapshot
+
+if __name__ == "__main__":
+    from iso3166_updates import Updates
+    from updates_store import UpdatesStore
+
+    #build step: write the snapshot of the installed iso3166-updates dataset, to the input path or the default path
+    path = sys.argv[1] if len(sys.argv) > 1 else default_snapshot_path
+    updates = Updates()
+    size = write_snapshot(UpdatesStore(updates.all, version=updates.__version__), path)
+    print(f"wrote snapshot of iso3166-updates {updates.__version__} to {path}: {size:,} bytes")
@@ -0,0 +1,113 @@
+from bisect import bisect_left
+from typing import NamedTuple
+from country_lookup import normalize_name
+
+'''
+Typeahead UIs request completions of a partially typed country name, code or search term on
+every keystroke, so each request needs answering in microseconds rather than fuzzy matching the
+input. The SuggestIndex below holds every completion, a country name or alias, an ISO 3166-1
+alpha-2, alpha-3 or numeric code, or a word of the search vocabulary, under one or more
+normalized keys, in a single sorted array. The completions of a prefix are then the contiguous
+run of keys starting with it, found with two binary searches. Each completion is ranked once,
+when the index is built, by its count of updates, so the top completions of a prefix are its
+lowest ranks, with no scoring per request.
+'''
+
+#types of suggestions, in the order they're ranked when their update counts are equal
+suggestion_types = ["country_name", "alpha2", "alpha3", "numeric", "search"]
+
+def word_keys(name: str) -> list[str]:
+    """ Get the keys of a name, the normalized name from the start of each of its words, e.g "Korea, Republic of" -> ["korea republic of", "republic of", "of"]. """
+    words = normalize_name(name).split(" ")
+    return [" ".join(words[i:]) for i in range(len(words)) if words[i]]
+
+class Suggestion(NamedTuple):
+    """
+    Completion of a typeahead prefix: its text, e.g "France", "FRA" or "addition", its type,
+    one of suggestion_types, its count of updates, i.e the updates of the country or the updates
+    containing the search word, and the alpha-2 code of its country, None for search words.
+    """
+    text: str
+    type: str
+    count: int
+    alpha2: str|None = None
+
+class SuggestIndex():
+    """
+    Sorted array of normalized keys to ranked suggestions, for prefix completion. Each suggestion
+    is stored under each of its keys, e.g a country name under the start of each of its words, so
+    "kingdom" completes to "United Kingdom...". Suggestions are ranked by count of updates, most
+    first, then type and text.
+
+    Parameters
+    ==========
+    :suggestions: iterable
+        (keys, Suggestion) pairs, the keys are normalized as per normalize_name. A suggestion
+        with the same text and type as an earlier one is skipped.
+
+    Methods
+    =======
+    suggest(prefix, limit, types):
+        get the top ranked suggestions with a key starting with the prefix.
+
+    Usage
+    =====
+    from suggest_index import SuggestIndex, Suggestion
+
+    suggest_index = SuggestIndex([(["france"], Suggestion("France", "country_name", 30, "FR")), (["fr"], Suggestion("FR", "alpha2", 30, "FR"))])
+
+    #get the top 10 suggestions starting with "fr"
+    suggest_index.suggest("fr", limit=10)
+    """
+    def __init__(self, suggestions) -> None:
+
+        #distinct suggestions, in rank order, and their keys
+        distinct_suggestions = {}
+        for keys, suggestion in suggestions:
+            distinct_suggestions.setdefault((suggestion.text, suggestion.type), (keys, suggestion))
+        ranked = sorted(distinct_suggestions.values(), key=lambda item: (-item[1].count, suggestion_types.index(item[1].type), item[1].text))
+        self.suggestions = tuple(suggestion for _, suggestion in ranked)
+
+        #normalized keys, sorted, with the rank of the suggestion of each key
+        key_ranks = sorted({(normalize_name(key), rank) for rank, (keys, _) in enumerate(ranked) for key in keys if normalize_name(key)})
+        self._keys = tuple(key for key, _ in key_ranks)
+        self._ranks = tuple(rank for _, rank in key_ranks)
+
+    def suggest(self, prefix: str, limit: int=10, types: set|None=None) -> list[Suggestion]:
+        """
+        Get the top ranked suggestions with a normalized key starting with the normalized prefix,
+        the run of keys between the prefix and the prefix followed by the highest character.
+
+        Parameters
+        ==========
+        :prefix: str
+            prefix of the suggestions, e.g as typed so far.
+        :limit: int (default=10)
+            maximum number of suggestions.
+        :types: set (default=None)
+            types of suggestions to output, by default all types.
+
+        Returns
+        =======
+        :suggestions: list
+            top ranked suggestions, empty if the prefix is empty once normalized.
+        """
+        prefix = normalize_name(prefix)
+        if not (prefix):
+            return []
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\U0010ffff", start)
+        suggestions = []
+        for rank in sorted(set(self._ranks[start:end])):
+            suggestion = self.suggestions[rank]
+            if (types is None or suggestion.type in types):
+                suggestions.append(suggestion)
+                if (len(suggestions) == limit):
+                    break
+        return suggestions
+
+    def __len__(self) -> int:
+        return len(self.suggestions)
+
+    def __repr__(self) -> str:
+        return f"SuggestIndex(suggestions={len(self.suggestions)}, keys={len(self._keys)})"
@@ -0,0 +1,121 @@
+import unittest
+import os
+import sys
+import iso3166
+from thefuzz import fuzz, process
+unittest.TestLoader.sortTestMethodsUsing = None
+
+#add the repo root to sys.path so the country lookup module can be imported directly
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from country_lookup import CountryNameIndex, CountryCodeIndex, normalize_name, trigrams
+
+class Country_Lookup_Tests(unittest.TestCase):
+    """
+    Test suite for testing the precomputed country name lookup tables used by the API.
+
+    Test Cases
+    ==========
+    test_normalize_name:
+        testing country names are percent-decoded, case-folded, accent stripped and punctuation normalized.
+    test_country_name_index:
+        testing country names and aliases resolve to their alpha-2 codes via a single table lookup.
+    test_trigrams:
+        testing names are split into their padded character trigrams.
+    test_extract:
+        testing fuzzy matching the trigram index's candidates returns the same matches as matching all country names.
+    test_country_code_index:
+        testing alpha-2, alpha-3 and numeric codes resolve to their alpha-2 codes, in bulk with all invalid codes output.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """ Build the country name index once for all tests. """
+        cls.names = {name: country.alpha2 for name, country in iso3166.countries_by_name.items()}
+        cls.aliases = {"Russia": "Russian Federation", "UAE": "United Arab Emirates", "Ivory Coast": "Côte d'Ivoire", "Atlantis": "Atlantis"}
+        cls.country_name_index = CountryNameIndex(cls.names, aliases=cls.aliases)
+
+#     @unittest.skip("")
+    def test_normalize_name(self):
+        """ Testing country names are percent-decoded, case-folded, accent stripped and punctuation normalized. """
+#1.)
+        self.assertEqual(normalize_name("FRANCE"), "france", "Expected case-folded name.")
+        self.assertEqual(normalize_name("Côte d'Ivoire"), "cote d ivoire", "Expected accents stripped and punctuation replaced.")
+        self.assertEqual(normalize_name("Cura%C3%A7ao"), "curacao", "Expected percent-decoded name.")
+        self.assertEqual(normalize_name("  Virgin Islands, (British) "), "virgin islands british", "Expected whitespace collapsed and stripped.")
+        self.assertEqual(normalize_name("Bosnia%20and%20Herzegovina"), "bosnia and herzegovina", "Expected percent-decoded spaces.")
+        self.assertEqual(normalize_name(""), "", "Expected empty name.")
+
+#     @unittest.skip("")
+    def test_country_name_index(self):
+        """ Testing country names and aliases resolve to their alpha-2 codes via a single table lookup. """
+#1.) official names, in any case, accents or punctuation
+        for name, alpha2 in self.names.items():
+            self.assertEqual(self.country_name_index.resolve(name.title()), alpha2, f"Expected {name} to resolve to {alpha2}.")
+        self.assertEqual(self.country_name_index.resolve("cote d'ivoire"), "CI", "Expected name without accents to resolve.")
+        self.assertEqual(self.country_name_index.resolve("Korea, Republic Of"), "KR", "Expected name with comma to resolve.")
+#2.) aliases
+        self.assertEqual(self.country_name_index.resolve("russia"), "RU", "Expected alias to resolve to its official name's alpha-2 code.")
+        self.assertEqual(self.country_name_index.resolve("Uae"), "AE", "Expected alias to resolve in any case.")
+        self.assertEqual(self.country_name_index.convert("IVORY COAST"), "Côte d'Ivoire", "Expected alias converted into its official name.")
+        self.assertEqual(self.country_name_index.convert("France"), "France", "Expected official name to be unchanged.")
+#3.) alias whose official name isn't a country is converted but not resolved
+        self.assertEqual(self.country_name_index.convert("atlantis"), "Atlantis", "Expected unresolvable alias to still be converted.")
+        self.assertIsNone(self.country_name_index.resolve("Atlantis"), "Expected unresolvable alias to not resolve.")
+#4.) names not in the table
+        for name in ["Frnace", "Germ", "", "Republic"]:
+            self.assertIsNone(self.country_name_index.resolve(name), f"Expected {name} not to resolve.")
+            self.assertNotIn(name, self.country_name_index, f"Expected {name} not in table.")
+#5.) fuzzy matching choices and their alpha-2 codes
+        self.assertEqual(len(self.country_name_index.names), len(self.names), "Expected a fuzzy matching choice per country name.")
+        self.assertEqual(self.country_name_index.alpha2("FRANCE"), "FR", "Expected alpha-2 code of official name.")
+        self.assertEqual(len(self.country_name_index), len(self.names) + 3, "Expected a table entry per name and resolvable alias.")
+
+#     @unittest.skip("")
+    def test_trigrams(self):
+        """ Testing names are split into their padded character trigrams. """
+#1.)
+        self.assertEqual(trigrams("chad"), {"$$c": 1, "$ch": 1, "cha": 1, "had": 1, "ad$": 1, "d$$": 1}, "Expected padded trigrams of name.")
+        self.assertEqual(trigrams("aaaa")["aaa"], 2, "Expected count of repeated trigram.")
+        self.assertEqual(sum(trigrams("").values()), 2, "Expected padding trigrams of empty name.")
+
+#     @unittest.skip("")
+    def test_extract(self):
+        """ Testing fuzzy matching the trigram index's candidates returns the same matches as matching all country names. """
+        test_names = ["FRNACE", "GERMNY", "UNITED KINGDOM OF GREAT BRITAN", "SUDAN", "NIGER", "BOLIVIA, PLURINATIONAL STATE", "XYZ", "REPUBLIC", "ISLANDS", "A", "", "!!!"]
+#1.) same matches at or above the cutoff, in the same order, as thefuzz over all names
+        for score_cutoff in [100, 90, 75, 60, 30, 0]:
+            name_matches = self.country_name_index.extract(test_names, score_cutoff=score_cutoff)
+            for name in test_names:
+                expected = [match for match in process.extract(name, self.country_name_index.names, scorer=fuzz.ratio) if match[1] >= score_cutoff]
+                self.assertEqual([match for match in name_matches[name] if match[1] >= score_cutoff], expected, 
+                    f"Expected same matches as process.extract for {name}, score_cutoff={score_cutoff}.")
+#2.) candidates are pruned at higher cutoffs, but never at a cutoff of 0
+        candidates = self.country_name_index.candidates(test_names, score_cutoff=75)
+        self.assertLess(len(candidates["FRNACE"]), len(self.names), "Expected candidates to be pruned.")
+        self.assertEqual(candidates["XYZ"], [], "Expected no candidates for name unlike any country.")
+        self.assertEqual(self.country_name_index.candidates(["XYZ"])["XYZ"], list(range(len(self.names))), "Expected every name a candidate at cutoff of 0.")
+#3.) best match
+        self.assertEqual(self.country_name_index.extract(["FRNACE"], score_cutoff=75)["FRNACE"][0], ("FRANCE", 83), "Expected France as best match.")
+
+#     @unittest.skip("")
+    def test_country_code_index(self):
+        """ Testing alpha-2, alpha-3 and numeric codes resolve to their alpha-2 codes, in bulk with all invalid codes output. """
+        country_code_index = CountryCodeIndex(iso3166.countries)
+#1.) every code of every country, in any case
+        for country in iso3166.countries:
+            for code in (country.alpha2, country.alpha3, country.numeric, country.alpha3.lower()):
+                self.assertEqual(country_code_index.resolve(code), country.alpha2, f"Expected {code} to resolve to {country.alpha2}.")
+        self.assertEqual(country_code_index.resolve(" fr "), "FR", "Expected code with whitespace to resolve.")
+        self.assertEqual(len(country_code_index), len(list(iso3166.countries)) * 3, "Expected a table entry per code.")
+#2.) invalid codes
+        for code in ["XX", "XYZ", "999", "4", "", "FRANCE"]:
+            self.assertIsNone(country_code_index.resolve(code), f"Expected {code} not to resolve.")
+            self.assertNotIn(code, country_code_index, f"Expected {code} not in table.")
+#3.) bulk resolution, without duplicates, with all invalid codes
+        self.assertEqual(country_code_index.resolve_all("fr, DEU,380,FRA,,"), (["FR", "DE", "IT"], []), "Expected alpha-2 codes without duplicates, in input order.")
+        self.assertEqual(country_code_index.resolve_all("FR,xx,DE,999"), (["FR", "DE"], ["xx", "999"]), "Expected all invalid codes.")
+        self.assertEqual(country_code_index.resolve_all(["ad", "AND"]), (["AD"], []), "Expected list of codes resolved.")
+        self.assertEqual(country_code_index.resolve_all(""), ([], []), "Expected no codes.")
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
@@ -1,11 +1,15 @@
 import unittest
 import requests
+import json
 import re
 import os
 import sys
 import time
 import threading
 import socket
+import subprocess
+from itertools import chain
+from unittest import mock
 import iso3166
 from jsonschema import validate, ValidationError
 from datetime import datetime,date
@@ -13,10 +17,12 @@ from fake_useragent import UserAgent
 from iso3166_updates import * 
 from bs4 import BeautifulSoup
 from importlib.metadata import metadata
+from email.utils import parsedate_to_datetime
 unittest.TestLoader.sortTestMethodsUsing = None
 
 #add the repo root to sys.path so the Flask app can be imported directly
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import index
 from index import app as flask_app
 
 def _find_free_port() -> int:
@@ -87,6 +93,34 @@ class Updates_Api_Tests(unittest.TestCase):
         testing that the 'generated' timestamp in the metadata envelope is a valid ISO 8601 UTC string.
     test_country_name_aliases:
         testing that common country name aliases from the names_converted mapping resolve correctly.
+    test_date_range_corrected_date:
+        testing /date_range returns updates whose corrected publication date, but not original date, is within the range.
+    test_sorted_limit_offset:
+        testing limit and offset with sortBy return the same page of updates as slicing the fully sorted updates.
+    test_response_cache:
+        testing /all, single /alpha and single /year responses are served from the pre-serialized response cache.
+    test_conditional_requests:
+        testing ETag and Last-Modified validators are returned, and matching conditional requests get a bodyless 304 response.
+    test_compression:
+        testing gzip and deflate encoded responses are negotiated from the Accept-Encoding header.
+    test_streaming:
+        testing streamed responses are sent in chunks, with the same JSON as the non-streamed responses.
+    test_ndjson_format:
+        testing the NDJSON format, via the format query string parameter or Accept header, returns one tagged update per line.
+    test_cursor_pagination:
+        testing paging through results with the next_cursor token returns every country or update exactly once, in order.
+    test_combined_filters:
+        testing the search + year/date range and country name + date range endpoints apply both filters.
+    test_search_timeout:
+        testing the timeout_ms time budget parameter of the /search endpoint.
+    test_search_sort_by:
+        testing the /search endpoint's results, with or without their match scores, are sorted by publication date via sortBy.
+    test_suggest_endpoint:
+        testing the /suggest endpoint returns the top completions of a prefix, ranked by number of updates.
+    test_batch:
+        testing a batch of queries returns the same results as each query's GET endpoint, keyed by query id.
+    test_startup_report:
+        testing a cold started worker defers its heavy imports and reports its import, load and index build times.
     """     
     @classmethod
     def setUpClass(cls):
@@ -129,6 +163,8 @@ class Updates_Api_Tests(unittest.TestCase):
         cls.country_name_base_url = cls.base_url + '/country_name/'
         cls.date_range_url = cls.base_url + '/date_range/'
         cls.search_url = cls.base_url + '/search/'
+        cls.batch_url = cls.base_url + '/batch'
+        cls.suggest_url = cls.base_url + '/suggest/'
         cls.version_base_url = cls.base_url + '/version'
 
         #correct column/key names for dict returned from api
@@ -437,16 +473,22 @@ class Updates_Api_Tests(unittest.TestCase):
         self.assertEqual(test_request_bn_cu_dm['DJ'][0], test_alpha_dj_expected, f"Expected and observed outputs do not match:\n{test_request_bn_cu_dm['DJ'][0]}")
 #5.)
         test_request_error1 = requests.get(self.alpha_base_url + error_test_alpha_1, headers=self.user_agent_header).json() #blahblahblah
-        test_request_error1_expected = {"message": f"Invalid ISO 3166-1 alpha-2 code input: {error_test_alpha_1}.", "path": self.alpha_base_url + error_test_alpha_1, "status": 400}
+        test_request_error1_expected = {"message": f"Invalid ISO 3166-1 country code input, cannot convert into corresponding alpha-2 code: {error_test_alpha_1}.", "path": self.alpha_base_url + error_test_alpha_1, "status": 400}
         self.assertEqual(test_request_error1, test_request_error1_expected, f"Expected and observed output error object do not match:\n{test_request_error1}")
 #6.)
         test_request_error2 = requests.get(self.alpha_base_url + error_test_alpha_2, headers=self.user_agent_header).json() #42
-        test_request_error2_expected = {"message": f"Invalid ISO 3166-1 alpha numeric country code input: {error_test_alpha_2}.", "path": self.alpha_base_url + error_test_alpha_2, "status": 400}
+        test_request_error2_expected = {"message": f"Invalid ISO 3166-1 country code input, cannot convert into corresponding alpha-2 code: {error_test_alpha_2}.", "path": self.alpha_base_url + error_test_alpha_2, "status": 400}
         self.assertEqual(test_request_error2, test_request_error2_expected, f"Expected and observed output error object do not match:\n{test_request_error2}")
 #7.)
         test_request_error3 = requests.get(self.alpha_base_url + error_test_alpha_3, headers=self.user_agent_header).json() #xyz
-        test_request_error3_expected = {"message": f"Invalid ISO 3166-1 alpha-3 country code: {error_test_alpha_3.upper()}.", "path": self.alpha_base_url + error_test_alpha_3, "status": 400}
+        test_request_error3_expected = {"message": f"Invalid ISO 3166-1 country code input, cannot convert into corresponding alpha-2 code: {error_test_alpha_3}.", "path": self.alpha_base_url + error_test_alpha_3, "status": 400}
         self.assertEqual(test_request_error3, test_request_error3_expected, f"Expected and observed output error object do not match:\n{test_request_error3}")
+#8.) all invalid codes are reported together, valid codes in any case
+        test_request_error4 = requests.get(self.alpha_base_url + "FR,xyz,DEU,42,abc", headers=self.user_agent_header).json()
+        self.assertEqual(test_request_error4["message"], "Invalid ISO 3166-1 country code input, cannot convert into corresponding alpha-2 code: xyz, 42, abc.", 
+            f"Expected all invalid codes in error message, got {test_request_error4['message']}.")
+        self.assertEqual(list(requests.get(self.alpha_base_url + "fra,de,380", headers=self.user_agent_header).json()["data"]), ["DE", "FR", "IT"], 
+            "Expected lowercase, alpha-3 and numeric codes converted.")
 
 #     @unittest.skip("")
     def test_year_endpoint(self): 
@@ -981,6 +1023,12 @@ class Updates_Api_Tests(unittest.TestCase):
         test_request_error_2 = requests.get(self.country_name_base_url + test_name_error2, headers=self.user_agent_header).json() #12345
         test_request_error_expected = {"message": f"No matching country name found for input: {test_name_error2.title()}.", "path": self.country_name_base_url + test_name_error2, "status": 400}
         self.assertEqual(test_request_error_2, test_request_error_expected, f"Expected and observed output error object do not match:\n{test_request_error_2}")
+#8.) country without any updates returned with an empty list, as per the alpha endpoint, including as a fuzzy match
+        test_request_gf = requests.get(self.country_name_base_url + "French Guiana", headers=self.user_agent_header).json()["data"]
+        self.assertEqual(test_request_gf, {"GF": []}, f"Expected French Guiana with no updates:\n{test_request_gf}")
+        self.assertEqual(test_request_gf, requests.get(self.alpha_base_url + "GF", headers=self.user_agent_header).json()["data"], "Expected same output as alpha endpoint.")
+        test_request_gf = requests.get(self.country_name_base_url + "Frence", headers=self.user_agent_header, params={"likeness": 50}).json()["data"]
+        self.assertEqual(test_request_gf.get("GF"), [], "Expected fuzzy match of French Guiana with no updates.")
 
 #     @unittest.skip("")
     def test_country_name_year_endpoint(self):
@@ -1212,7 +1260,7 @@ class Updates_Api_Tests(unittest.TestCase):
         self.assertEqual(test_request_error2, test_request_error2_expected, f"Expected and observed output error objects does not match:\n{test_request_error2}")
 #6.)
         test_request_error3 = requests.get(f'{self.date_range_url}{test_date_range_alpha_error3[0]}/alpha/{test_date_range_alpha_error3[1]}', headers=self.user_agent_header).json() #2021-01-024 - abcdef
-        test_request_error3_expected = {"message": f"Invalid ISO 3166-1 alpha-2 code input: {test_date_range_alpha_error3[1]}.", "path": f'{self.date_range_url}{test_date_range_alpha_error3[0]}/alpha/{test_date_range_alpha_error3[1]}', "status": 400}
+        test_request_error3_expected = {"message": f"Invalid ISO 3166-1 country code input, cannot convert into corresponding alpha-2 code: {test_date_range_alpha_error3[1]}.", "path": f'{self.date_range_url}{test_date_range_alpha_error3[0]}/alpha/{test_date_range_alpha_error3[1]}', "status": 400}
         self.assertEqual(test_request_error3, test_request_error3_expected, f"Expected and observed output error objects does not match:\n{test_request_error3}")
 
 #     @unittest.skip("")
@@ -1508,6 +1556,436 @@ class Updates_Api_Tests(unittest.TestCase):
         self.assertIn("KR", resp_south_korea,
             f"Expected 'KR' in response for alias 'South Korea', got {list(resp_south_korea.keys())}.")
 
+#     @unittest.skip("")
+    def test_date_range_corrected_date(self):
+        """ Testing /date_range returns updates whose corrected publication date is within the range. """
+#1.) updates originally issued 2011-12-13, corrected 2011-12-15
+        resp = requests.get(self.date_range_url + "2011-12-14,2011-12-20", headers=self.user_agent_header).json()["data"]
+        self.assertGreater(len(resp), 0, "Expected updates with a corrected date within the range.")
+        for alpha2, updates in resp.items():
+            for row in updates:
+                self.assertEqual(row["Date Issued"], "2011-12-13 (corrected 2011-12-15)", f"Expected corrected update for {alpha2}, got {row['Date Issued']}.")
+#2.) range containing both the original and corrected dates should not duplicate updates
+        resp_both = requests.get(self.date_range_url + "2011-12-13,2011-12-15", headers=self.user_agent_header).json()["data"]
+        for alpha2, updates in resp.items():
+            corrected_updates = [row for row in resp_both[alpha2] if "corrected" in row["Date Issued"]]
+            self.assertEqual(corrected_updates, updates, f"Expected each corrected update for {alpha2} to be returned once.")
+#3.) alpha route uses the same timeline
+        resp_alpha = requests.get(f"{self.date_range_url}2011-12-14,2011-12-20/alpha/{','.join(resp)}", headers=self.user_agent_header).json()["data"]
+        self.assertEqual(resp_alpha, resp, "Expected /date_range/alpha to match /date_range for the same countries.")
+
+#     @unittest.skip("")
+    def test_sorted_limit_offset(self):
+        """ Testing limit and offset with sortBy return the same page of updates as slicing the fully sorted updates. """
+        test_urls = [self.all_base_url, self.year_base_url + "2010-2016", self.date_range_url + "2012-01-01,2020-12-31", self.country_name_base_url + "France,Germany,Italy"]
+#1.) latest and earliest pages match slices of the fully sorted updates, for each endpoint
+        for test_url in test_urls:
+            for sort_by in ["dateDesc", "dateAsc"]:
+                full_sorted = requests.get(test_url, headers=self.user_agent_header, params={"sortBy": sort_by}).json()["data"]
+                for limit, offset in [(20, 0), (7, 13)]:
+                    resp = requests.get(test_url, headers=self.user_agent_header, params={"sortBy": sort_by, "limit": limit, "offset": offset}).json()
+                    self.assertEqual(resp["data"], full_sorted[offset:offset + limit], f"Expected page of sorted updates for {test_url}, limit={limit}, offset={offset}.")
+                    self.assertEqual((resp["metadata"]["total"], resp["metadata"]["limit"], resp["metadata"]["offset"]), (len(full_sorted), limit, offset), 
+                        f"Expected pagination metadata for {test_url}.")
+#2.) search results paginated by record
+        full_search = requests.get(self.search_url + "Addition", headers=self.user_agent_header).json()["data"]
+        resp_search = requests.get(self.search_url + "Addition", headers=self.user_agent_header, params={"limit": 5, "offset": 2}).json()
+        self.assertEqual(resp_search["data"], full_search[2:7], "Expected page of search results.")
+        self.assertEqual(resp_search["metadata"]["total"], len(full_search), "Expected total search results in metadata.")
+#3.) invalid limit and offset
+        for params in [{"limit": -1}, {"offset": "abc"}]:
+            resp_error = requests.get(self.year_base_url + "2016", headers=self.user_agent_header, params=params)
+            self.assertEqual(resp_error.status_code, 400, f"Expected 400 for invalid pagination parameters, got {resp_error.status_code}.")
+
+#     @unittest.skip("")
+    def test_response_cache(self):
+        """ Testing responses are served from the pre-serialized response cache, shared by the requests with the same canonical query. """
+        test_urls = [self.all_base_url, self.alpha_base_url + "AD", self.year_base_url + "2016"]
+#1.) second request is a cache hit, with the same data and a generated timestamp
+        for test_url in test_urls:
+            first_resp = requests.get(test_url, headers=self.user_agent_header)
+            second_resp = requests.get(test_url, headers=self.user_agent_header)
+            self.assertIn(first_resp.headers.get("X-Cache"), ["HIT", "MISS"], f"Expected X-Cache header for {test_url}.")
+            self.assertEqual(second_resp.headers.get("X-Cache"), "HIT", f"Expected cache hit for {test_url}.")
+            self.assertEqual(second_resp.json()["data"], first_resp.json()["data"], f"Expected same data from cache for {test_url}.")
+            self.assertEqual(second_resp.json()["metadata"]["count"], first_resp.json()["metadata"]["count"], f"Expected same count from cache for {test_url}.")
+            self.assertIn("generated", second_resp.json()["metadata"], f"Expected generated timestamp in cached response for {test_url}.")
+#2.) year range of a single year shares the single year's cached response
+        cached_resp = requests.get(self.year_base_url + "2016", headers=self.user_agent_header).json()
+        range_resp = requests.get(self.year_base_url + "2016-2016", headers=self.user_agent_header)
+        self.assertEqual(range_resp.headers.get("X-Cache"), "HIT", "Expected cache hit for year range of the cached year.")
+        self.assertEqual(cached_resp["data"], range_resp.json()["data"], "Expected cached and year range data to match.")
+#3.) a list of a repeated year outputs each update once per repeat, so doesn't share the single year's cached response, requested in either order
+        for first_year, second_year in [("2015,2015", "2015"), ("2014", "2014,2014")]:
+            first_resp = requests.get(self.year_base_url + first_year, headers=self.user_agent_header).json()
+            second_resp = requests.get(self.year_base_url + second_year, headers=self.user_agent_header).json()
+            single_resp, repeated_resp = (second_resp, first_resp) if "," in first_year else (first_resp, second_resp)
+            self.assertEqual(repeated_resp["metadata"]["count"], single_resp["metadata"]["count"] * 2, f"Expected each update output twice for {first_year} then {second_year}.")
+            self.assertEqual({country_code: len(updates) for country_code, updates in repeated_resp["data"].items()}, 
+                {country_code: len(updates) * 2 for country_code, updates in single_resp["data"].items()}, f"Expected each country's updates output twice for {first_year} then {second_year}.")
+#4.) alpha-2, alpha-3 and numeric codes of the same countries, in any order and case, share a cached response
+        alpha_resp = requests.get(self.alpha_base_url + "FR,DE", headers=self.user_agent_header, params={"fields": "Change,Date Issued"})
+        self.assertIn(alpha_resp.headers.get("X-Cache"), ["HIT", "MISS"], "Expected X-Cache header for multiple country response.")
+        for test_alpha, test_fields in [("DEU,FRA", "Change,Date Issued"), ("250,276/", "Date Issued,Change"), ("de,fr", "Date Issued,Change,Date Issued")]:
+            equivalent_resp = requests.get(self.alpha_base_url + test_alpha, headers=self.user_agent_header, params={"fields": test_fields})
+            self.assertEqual(equivalent_resp.headers.get("X-Cache"), "HIT", f"Expected cache hit for equivalent query {test_alpha}.")
+            self.assertEqual(equivalent_resp.json()["data"], alpha_resp.json()["data"], f"Expected same data for equivalent query {test_alpha}.")
+#5.) country names matching the same countries, in any order and case, share a cached response and ETag, with or without a year
+        for test_names, test_year in [(["Germany,France", "France,Germany", "france,germany/"], ""), (["Germany,France", "germany,France"], "/year/2016,2017")]:
+            name_resp = requests.get(self.country_name_base_url + test_names[0] + test_year, headers=self.user_agent_header, params={"fields": "Change,Date Issued"})
+            self.assertIn(name_resp.headers.get("X-Cache"), ["HIT", "MISS"], f"Expected X-Cache header for {test_names[0]}{test_year}.")
+            for test_name in test_names[1:]:
+                equivalent_resp = requests.get(self.country_name_base_url + test_name + test_year, headers=self.user_agent_header, params={"fields": "Change,Date Issued"})
+                self.assertEqual(equivalent_resp.headers.get("X-Cache"), "HIT", f"Expected cache hit for equivalent query {test_name}{test_year}.")
+                self.assertEqual(equivalent_resp.headers.get("ETag"), name_resp.headers.get("ETag"), f"Expected same ETag for equivalent query {test_name}{test_year}.")
+                self.assertEqual(equivalent_resp.json()["data"], name_resp.json()["data"], f"Expected same data for equivalent query {test_name}{test_year}.")
+        self.assertEqual(list(requests.get(self.country_name_base_url + "Germany,France", headers=self.user_agent_header, params={"limit": 1}).json()["data"]), ["DE"],
+            "Expected page of the matched countries sorted by alpha-2 code.")
+#6.) paginated response cached with its pagination metadata
+        first_resp = requests.get(self.year_base_url + "2016", headers=self.user_agent_header, params={"limit": 2}).json()
+        second_resp = requests.get(self.year_base_url + "2016", headers=self.user_agent_header, params={"limit": 2})
+        self.assertEqual(second_resp.headers.get("X-Cache"), "HIT", "Expected cache hit for paginated response.")
+        self.assertEqual({key: value for key, value in second_resp.json()["metadata"].items() if key != "generated"}, 
+                         {key: value for key, value in first_resp["metadata"].items() if key != "generated"}, "Expected same pagination metadata from cache.")
+#7.) streamed and NDJSON responses not cached
+        self.assertNotIn("X-Cache", requests.get(self.alpha_base_url + "AD", headers=self.user_agent_header, params={"stream": "1"}).headers,
+            "Expected no X-Cache header for streamed response.")
+        self.assertNotIn("X-Cache", requests.get(self.alpha_base_url + "AD", headers=self.user_agent_header, params={"format": "ndjson"}).headers,
+            "Expected no X-Cache header for NDJSON response.")
+
+#     @unittest.skip("")
+    def test_conditional_requests(self):
+        """ Testing ETag and Last-Modified validators are returned, and matching conditional requests get a bodyless 304 response. """
+        test_urls = [self.all_base_url, self.alpha_base_url + "AD,FR", self.year_base_url + "2016", self.date_range_url + "2019-01-01,2020-12-31",
+                     self.country_name_base_url + "Germany", self.search_url + "Addition"]
+#1.) validators returned and matching If-None-Match gets a 304 with no body
+        for test_url in test_urls:
+            resp = requests.get(test_url, headers=self.user_agent_header)
+            self.assertEqual(resp.status_code, 200, f"Expected 200, got {resp.status_code}.")
+            self.assertIn("ETag", resp.headers, f"Expected ETag header for {test_url}.")
+            self.assertIn("Last-Modified", resp.headers, f"Expected Last-Modified header for {test_url}.")
+            resp_not_modified = requests.get(test_url, headers={**self.user_agent_header, "If-None-Match": resp.headers["ETag"]})
+            self.assertEqual(resp_not_modified.status_code, 304, f"Expected 304 for matching If-None-Match, got {resp_not_modified.status_code}.")
+            self.assertEqual(resp_not_modified.content, b"", "Expected no body in 304 response.")
+            self.assertEqual(resp_not_modified.headers.get("ETag"), resp.headers["ETag"], "Expected ETag header in 304 response.")
+#2.) ETag differs per query, equal for path aliases and query string parameter order
+        etag_all = requests.get(self.all_base_url, headers=self.user_agent_header).headers["ETag"]
+        etag_all_sorted = requests.get(self.all_base_url, headers=self.user_agent_header, params={"sortBy": "dateDesc"}).headers["ETag"]
+        self.assertNotEqual(etag_all, etag_all_sorted, "Expected different ETag for a different query.")
+        self.assertEqual(requests.get(self.all_base_url + "?limit=5&offset=10", headers=self.user_agent_header).headers["ETag"],
+            requests.get(self.all_base_url + "?offset=10&limit=5", headers=self.user_agent_header).headers["ETag"], "Expected same ETag regardless of parameter order.")
+        resp_changed = requests.get(self.all_base_url, headers={**self.user_agent_header, "If-None-Match": etag_all_sorted})
+        self.assertEqual(resp_changed.status_code, 200, f"Expected 200 for non-matching If-None-Match, got {resp_changed.status_code}.")
+#3.) ETag of the canonical query, equal for every URL of the same query, each revalidated with the ETag of another
+        etag_alpha = requests.get(self.alpha_base_url + "FR,DE", headers=self.user_agent_header).headers["ETag"]
+        for test_url in [self.alpha_base_url + "DE,FR", self.alpha_base_url + "DEU,FRA", self.alpha_base_url + "250,276/", self.base_url[:-len("/api")] + "/alpha/de,fr"]:
+            self.assertEqual(requests.get(test_url, headers=self.user_agent_header).headers["ETag"], etag_alpha, f"Expected same ETag for {test_url}.")
+            resp_not_modified = requests.get(test_url, headers={**self.user_agent_header, "If-None-Match": etag_alpha})
+            self.assertEqual(resp_not_modified.status_code, 304, f"Expected 304 for {test_url} with ETag of equivalent query, got {resp_not_modified.status_code}.")
+            self.assertEqual(resp_not_modified.headers.get("ETag"), etag_alpha, f"Expected ETag header in 304 response for {test_url}.")
+        self.assertEqual(requests.get(self.year_base_url + "2016-2016", headers=self.user_agent_header).headers["ETag"], 
+                         requests.get(self.year_base_url + "2016", headers=self.user_agent_header).headers["ETag"], "Expected same ETag for range of a single year.")
+        for params in [{"fields": "Change"}, {"sortBy": "dateAsc"}]:
+            self.assertNotEqual(requests.get(self.alpha_base_url + "DE,FR", headers=self.user_agent_header, params=params).headers["ETag"], etag_alpha,
+                f"Expected different ETag for different query {params}.")
+#4.) Last-Modified is the newest Date Issued of the results, If-Modified-Since
+        resp_ad = requests.get(self.alpha_base_url + "AD", headers=self.user_agent_header)
+        newest_date = max(extract_date(row["Date Issued"]) for row in resp_ad.json()["data"]["AD"])
+        self.assertEqual(parsedate_to_datetime(resp_ad.headers["Last-Modified"]).date(), newest_date, "Expected Last-Modified to be the newest Date Issued.")
+        resp_ad_not_modified = requests.get(self.alpha_base_url + "AD", headers={**self.user_agent_header, "If-Modified-Since": resp_ad.headers["Last-Modified"]})
+        self.assertEqual(resp_ad_not_modified.status_code, 304, f"Expected 304 for If-Modified-Since, got {resp_ad_not_modified.status_code}.")
+        resp_ad_modified = requests.get(self.alpha_base_url + "AD", headers={**self.user_agent_header, "If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+        self.assertEqual(resp_ad_modified.status_code, 200, f"Expected 200 for earlier If-Modified-Since, got {resp_ad_modified.status_code}.")
+#5.) Last-Modified of the selected updates, before the fields projection drops their Date Issued
+        for test_url in [self.alpha_base_url + "AD", self.year_base_url + "2016?limit=5", self.search_url + "addition"]:
+            expected_last_modified = requests.get(test_url, headers=self.user_agent_header).headers["Last-Modified"]
+            for fields in ["Change", "Source,Description of Change"]:
+                resp_fields = requests.get(test_url, headers=self.user_agent_header, params={"fields": fields})
+                self.assertTrue(all("Date Issued" not in update for update in (resp_fields.json()["data"] if isinstance(resp_fields.json()["data"], list) 
+                    else chain.from_iterable(resp_fields.json()["data"].values()))), "Expected Date Issued projected out.")
+                self.assertEqual(resp_fields.headers.get("Last-Modified"), expected_last_modified, f"Expected same Last-Modified for {test_url} with fields={fields}.")
+        resp_fields_not_modified = requests.get(self.alpha_base_url + "AD", params={"fields": "Change"}, 
+                                                headers={**self.user_agent_header, "If-Modified-Since": resp_ad.headers["Last-Modified"]})
+        self.assertEqual(resp_fields_not_modified.status_code, 304, f"Expected 304 for If-Modified-Since with fields, got {resp_fields_not_modified.status_code}.")
+#6.) error responses have no validators
+        self.assertNotIn("ETag", requests.get(self.year_base_url + "abc", headers=self.user_agent_header).headers, "Expected no ETag for error response.")
+
+#     @unittest.skip("")
+    def test_compression(self):
+        """ Testing gzip and deflate encoded responses are negotiated from the Accept-Encoding header. """
+        test_urls = [self.all_base_url, self.alpha_base_url + "AD", self.year_base_url + "2016", self.year_base_url + "2010-2015", self.search_url + "Addition"]
+        for test_url in test_urls:
+            identity_resp = requests.get(test_url, headers={**self.user_agent_header, "Accept-Encoding": "identity"})
+            self.assertNotIn("Content-Encoding", identity_resp.headers, f"Expected uncompressed response for {test_url}.")
+            self.assertIn("Accept-Encoding", identity_resp.headers.get("Vary", ""), f"Expected Vary: Accept-Encoding header for {test_url}.")
+#1.) gzip and deflate encoded responses decompress to the same data
+            for encoding in ["gzip", "deflate"]:
+                encoded_resp = requests.get(test_url, headers={**self.user_agent_header, "Accept-Encoding": encoding})
+                self.assertEqual(encoded_resp.headers.get("Content-Encoding"), encoding, f"Expected {encoding} encoded response for {test_url}.")
+                self.assertEqual(encoded_resp.json()["data"], identity_resp.json()["data"], f"Expected same data in {encoding} encoded response for {test_url}.")
+                self.assertNotEqual(encoded_resp.headers["ETag"], identity_resp.headers["ETag"], f"Expected different ETag for {encoding} encoded response.")
+#2.) encoding not accepted
+        resp_rejected = requests.get(self.all_base_url, headers={**self.user_agent_header, "Accept-Encoding": "gzip;q=0, br"})
+        self.assertNotIn("Content-Encoding", resp_rejected.headers, "Expected uncompressed response when gzip and deflate not accepted.")
+
+#     @unittest.skip("")
+    def test_streaming(self):
+        """ Testing streamed responses are sent in chunks, with the same JSON as the non-streamed responses. """
+        test_requests = [(self.all_base_url, {"sortBy": "dateDesc"}), (self.year_base_url + "2004-2009", {}), (self.country_name_base_url + "Germany,France", {}),
+                         (self.search_url + "Addition", {"limit": 10}), (self.alpha_base_url + "AD,FR", {"fields": "Change,Date Issued"}),
+                         (self.all_base_url, {"sortBy": "dateAsc", "fields": "Country Code,Date Issued", "limit": 30}), (self.year_base_url + "2016", {"fields": "Change"})]
+        for test_url, test_params in test_requests:
+            resp = requests.get(test_url, headers=self.user_agent_header, params=test_params)
+            last_modified, resp = resp.headers.get("Last-Modified"), resp.json()
+#1.) streamed response has no Content-Length, as it is sent before the whole body is serialized
+            resp_streamed = requests.get(test_url, headers={**self.user_agent_header, "Accept-Encoding": "identity"}, params={**test_params, "stream": "1"}, stream=True)
+            self.assertEqual(resp_streamed.status_code, 200, f"Expected 200, got {resp_streamed.status_code}.")
+            self.assertNotIn("Content-Length", resp_streamed.headers, f"Expected no Content-Length header for streamed response of {test_url}.")
+#2.) streamed JSON identical to the non-streamed JSON
+            self.assertEqual(resp_streamed.headers.get("Last-Modified"), last_modified, f"Expected streamed Last-Modified to match for {test_url}.")
+            resp_streamed = resp_streamed.json()
+            self.assertEqual(resp_streamed["data"], resp["data"], f"Expected streamed data to match for {test_url}.")
+            self.assertEqual(resp_streamed["metadata"]["count"], resp["metadata"]["count"], f"Expected streamed count to match for {test_url}.")
+#3.) streamed update records only converted into updates as they're serialized, a country or sorted record at a time
+        if not (os.environ.get("BASE_URL")):
+            with flask_app.test_request_context("/api/all?stream=1"):
+                self.assertTrue(index.is_streamed_request(), "Expected streamed request.")
+                for sort_by in ["", "dateDesc"]:
+                    streamed_records, _ = index.paginate_query_results(index.QuerySpec(), sort_by.lower(), limit=25, streamed=True)
+                    self.assertIsInstance(streamed_records, index.StreamedRecords, f"Expected update records of streamed response, sortBy={sort_by}.")
+                    streamed_records = index.apply_fields_filter(streamed_records, "Change,Country Code")
+                    self.assertEqual(streamed_records.fields, ("Change", "Country Code"), "Expected fields projected as streamed.")
+                    updates, _ = index.paginate_query_results(index.QuerySpec(), sort_by.lower(), limit=25)
+                    self.assertEqual(json.loads("".join(index.generate_response_chunks(streamed_records, {}))),
+                                     {"data": index.apply_fields_filter(updates, "Change,Country Code"), "metadata": {}}, f"Expected streamed updates, sortBy={sort_by}.")
+#4.) compressed streamed response
+        resp_gzip = requests.get(self.all_base_url, headers={**self.user_agent_header, "Accept-Encoding": "gzip"}, params={"sortBy": "dateAsc", "stream": "1"})
+        self.assertEqual(resp_gzip.headers.get("Content-Encoding"), "gzip", "Expected gzip encoded streamed response.")
+        self.assertEqual(resp_gzip.json()["data"], requests.get(self.all_base_url, headers=self.user_agent_header, params={"sortBy": "dateAsc"}).json()["data"],
+            "Expected gzip encoded streamed data to match.")
+
+#     @unittest.skip("")
+    def test_ndjson_format(self):
+        """ Testing the NDJSON format, via the format query string parameter or Accept header, returns one tagged update per line. """
+        test_urls = [self.all_base_url, self.alpha_base_url + "AD,FR", self.year_base_url + "2016", self.date_range_url + "2019-01-01,2020-12-31",
+                     self.country_name_base_url + "Germany", self.search_url + "Addition"]
+        for test_url in test_urls:
+            resp_json = requests.get(test_url, headers=self.user_agent_header).json()["data"]
+            if isinstance(resp_json, dict):
+                expected_updates = [{**update, "Country Code": alpha2} for alpha2 in sorted(resp_json) for update in resp_json[alpha2]]
+            else:
+                expected_updates = resp_json
+#1.) format query string parameter
+            resp_ndjson = requests.get(test_url, headers=self.user_agent_header, params={"format": "ndjson"})
+            self.assertEqual(resp_ndjson.status_code, 200, f"Expected 200, got {resp_ndjson.status_code}.")
+            self.assertEqual(resp_ndjson.headers["Content-Type"], "application/x-ndjson", f"Expected NDJSON Content-Type for {test_url}.")
+            self.assertEqual([json.loads(line) for line in resp_ndjson.text.splitlines()], expected_updates, f"Expected one tagged update per line for {test_url}.")
+#2.) Accept header
+            resp_accept = requests.get(test_url, headers={**self.user_agent_header, "Accept": "application/x-ndjson"})
+            self.assertEqual(resp_accept.headers["Content-Type"], "application/x-ndjson", f"Expected NDJSON Content-Type for Accept header for {test_url}.")
+            self.assertEqual(resp_accept.text, resp_ndjson.text, f"Expected same NDJSON for Accept header for {test_url}.")
+#3.) sorted NDJSON
+        resp_sorted = requests.get(self.all_base_url, headers=self.user_agent_header, params={"format": "ndjson", "sortBy": "dateDesc", "limit": 20})
+        self.assertEqual([json.loads(line) for line in resp_sorted.text.splitlines()],
+            requests.get(self.all_base_url, headers=self.user_agent_header, params={"sortBy": "dateDesc", "limit": 20}).json()["data"], "Expected sorted NDJSON updates.")
+#4.) invalid format
+        resp_error = requests.get(self.all_base_url, headers=self.user_agent_header, params={"format": "xml"})
+        self.assertEqual(resp_error.status_code, 400, f"Expected 400 for invalid format, got {resp_error.status_code}.")
+
+#     @unittest.skip("")
+    def test_cursor_pagination(self):
+        """ Testing paging through results with the next_cursor token returns every country or update exactly once, in order. """
+        def get_all_pages(test_url, params):
+            pages, cursor = [], None
+            while True:
+                resp = requests.get(test_url, headers=self.user_agent_header, params={**params, **({"cursor": cursor} if cursor else {})})
+                self.assertEqual(resp.status_code, 200, f"Expected 200 for page of {test_url}, got {resp.status_code}.")
+                pages.append(resp.json())
+                cursor = resp.json()["metadata"]["next_cursor"]
+                if not cursor:
+                    return pages
+        test_cases = [(self.all_base_url, {"sortBy": "dateDesc", "limit": 50}), (self.all_base_url, {"sortBy": "dateAsc", "limit": 50}), (self.all_base_url, {"limit": 40}),
+                      (self.year_base_url + "2010-2016", {"sortBy": "dateAsc", "limit": 11}), (self.year_base_url + "2010-2016", {"limit": 11}),
+                      (self.date_range_url + "2012-01-01,2020-12-31", {"sortBy": "dateDesc", "limit": 25}), (self.search_url + "Addition", {"limit": 30})]
+#1.) concatenated pages match the unpaginated results, with the same total in each page's metadata
+        for test_url, params in test_cases:
+            full_data = requests.get(test_url, headers=self.user_agent_header, params={key: value for key, value in params.items() if key != "limit"}).json()["data"]
+            pages = get_all_pages(test_url, params)
+            if isinstance(full_data, list):
+                self.assertEqual([update for page in pages for update in page["data"]], full_data, f"Expected pages to match the sorted updates of {test_url}, {params}.")
+                total = len(full_data)
+            else:
+                self.assertEqual({country_code: updates for page in pages for country_code, updates in page["data"].items()}, full_data, 
+                    f"Expected pages to match the updates of {test_url}, {params}.")
+                self.assertEqual(sum(len(page["data"]) for page in pages), len(full_data), f"Expected each country once across pages of {test_url}.")
+                total = sum(len(updates) for updates in full_data.values())
+            for page in pages:
+                self.assertEqual((page["metadata"]["total"], page["metadata"]["limit"], page["metadata"]["offset"]), (total, params["limit"], 0), 
+                    f"Expected pagination metadata for {test_url}, {params}.")
+#2.) last page has no next cursor
+        resp_last = requests.get(self.all_base_url, headers=self.user_agent_header, params={"limit": 500}).json()
+        self.assertIsNone(resp_last["metadata"]["next_cursor"], "Expected no next cursor for last page.")
+#3.) invalid cursor, cursor of different results and cursor with offset
+        next_cursor = requests.get(self.all_base_url, headers=self.user_agent_header, params={"limit": 10}).json()["metadata"]["next_cursor"]
+        for params in [{"limit": 10, "cursor": "abc"}, {"limit": 10, "sortBy": "dateAsc", "cursor": next_cursor}, {"limit": 10, "offset": 5, "cursor": next_cursor}]:
+            resp_error = requests.get(self.all_base_url, headers=self.user_agent_header, params=params)
+            self.assertEqual(resp_error.status_code, 400, f"Expected 400 for invalid cursor parameters {params}, got {resp_error.status_code}.")
+
+#     @unittest.skip("")
+    def test_combined_filters(self):
+        """ Testing the search + year/date range and country name + date range endpoints apply both filters. """
+        search_results = requests.get(self.search_url + "Addition", headers=self.user_agent_header).json()["data"]
+#1.) search + year returns the search results of that year
+        resp_search_year = requests.get(self.search_url + "Addition/year/2016", headers=self.user_agent_header).json()
+        self.assertEqual(resp_search_year["data"], [update for update in search_results if update["Date Issued"].startswith("2016")], 
+            "Expected search results published in 2016.")
+#2.) search + date range returns the search results within the date range
+        resp_search_date_range = requests.get(self.search_url + "Addition/date_range/2016-01-01,2017-12-31", headers=self.user_agent_header).json()
+        self.assertTrue(resp_search_date_range["data"], "Expected search results within date range.")
+        for update in resp_search_date_range["data"]:
+            self.assertTrue("2016-01-01" <= update["Date Issued"][:10] <= "2017-12-31", f"Expected update within date range, got {update['Date Issued']}.")
+#3.) country name + date range returns the country's updates within the date range
+        country_updates = requests.get(self.country_name_base_url + "France", headers=self.user_agent_header).json()["data"]["FR"]
+        resp_country_name_date_range = requests.get(self.country_name_base_url + "France/date_range/2016-01-01,2019-12-31", headers=self.user_agent_header).json()
+        self.assertEqual(resp_country_name_date_range["data"], {"FR": [update for update in country_updates if "2016-01-01" <= update["Date Issued"][:10] <= "2019-12-31"]},
+            "Expected France's updates within date range.")
+#4.) empty and invalid year or date range
+        for test_url in [self.search_url + "Addition/year", self.search_url + "Addition/year/abc", self.search_url + "Addition/date_range/abc", 
+                         self.country_name_base_url + "France/date_range", self.country_name_base_url + "France/year"]:
+            resp_error = requests.get(test_url, headers=self.user_agent_header)
+            self.assertEqual(resp_error.status_code, 400, f"Expected 400 for empty or invalid filter {test_url}, got {resp_error.status_code}.")
+
+#     @unittest.skip("")
+    def test_search_timeout(self):
+        """ Testing the timeout_ms time budget parameter of the /search endpoint. """
+#1.) search finishing within its time budget is complete, without partial in its metadata
+        test_request_search = requests.get(self.search_url + "paris?likeness=40&timeout_ms=60000", headers=self.user_agent_header)
+        self.assertEqual(test_request_search.status_code, 200, f"Expected 200 status code, got {test_request_search.status_code}.")
+        self.assertNotIn("partial", test_request_search.json()["metadata"], "Expected complete search results.")
+        self.assertEqual(test_request_search.json()["data"], requests.get(self.search_url + "paris?likeness=40", headers=self.user_agent_header).json()["data"],
+            "Expected same search results as default time budget.")
+        self.assertIn("ETag", test_request_search.headers, "Expected ETag of complete search results.")
+#2.) invalid time budgets
+        for test_timeout in ["0", "-5", "abc", "1.5"]:
+            resp_error = requests.get(self.search_url + "paris?timeout_ms=" + test_timeout, headers=self.user_agent_header)
+            self.assertEqual(resp_error.status_code, 400, f"Expected 400 for invalid timeout_ms {test_timeout}, got {resp_error.status_code}.")
+
+#     @unittest.skip("")
+    def test_search_sort_by(self):
+        """ Testing the /search endpoint's results, with or without their match scores, are sorted by publication date via sortBy. """
+        unsorted_results = requests.get(self.search_url + "addition", headers=self.user_agent_header).json()["data"]
+#1.) results with match scores sorted descending and ascending, the same updates as unsorted
+        for sort_by, reverse in [("dateDesc", True), ("dateAsc", False)]:
+            test_request_search = requests.get(self.search_url + f"addition?sortBy={sort_by}", headers=self.user_agent_header)
+            self.assertEqual(test_request_search.status_code, 200, f"Expected 200 status code for sortBy={sort_by}, got {test_request_search.status_code}.")
+            search_results = test_request_search.json()["data"]
+            dates = [extract_date(update["Date Issued"]) for update in search_results]
+            self.assertEqual(dates, sorted(dates, reverse=reverse), f"Expected search results sorted by sortBy={sort_by}.")
+            self.assertEqual(sorted(map(json.dumps, search_results)), sorted(map(json.dumps, unsorted_results)), f"Expected same search results for sortBy={sort_by}.")
+#2.) results without match scores, per country, sorted into a list tagged with their country code
+        search_results = requests.get(self.search_url + "addition?sortBy=dateDesc&excludeMatchScore=1", headers=self.user_agent_header).json()["data"]
+        dates = [extract_date(update["Date Issued"]) for update in search_results]
+        self.assertEqual(dates, sorted(dates, reverse=True), "Expected search results without match scores sorted by date.")
+        self.assertTrue(all("Country Code" in update and "Match Score" not in update for update in search_results), "Expected Country Code without Match Score.")
+#3.) sorted pages via a cursor
+        test_request_search = requests.get(self.search_url + "addition?sortBy=dateDesc&limit=5", headers=self.user_agent_header).json()
+        next_page = requests.get(self.search_url + f"addition?sortBy=dateDesc&limit=5&cursor={test_request_search['metadata']['next_cursor']}", headers=self.user_agent_header).json()
+        sorted_results = requests.get(self.search_url + "addition?sortBy=dateDesc", headers=self.user_agent_header).json()["data"]
+        self.assertEqual(test_request_search["data"] + next_page["data"], sorted_results[:10], "Expected consecutive pages of sorted search results.")
+
+#     @unittest.skip("")
+    def test_suggest_endpoint(self):
+        """ Testing the /suggest endpoint returns the top completions of a prefix, ranked by number of updates. """
+#1.) country names, aliases and codes
+        test_request_suggest = requests.get(self.suggest_url + "russ?types=country_name", headers=self.user_agent_header)
+        self.assertEqual(test_request_suggest.status_code, 200, f"Expected 200 status code, got {test_request_suggest.status_code}.")
+        self.assertEqual([(suggestion["Suggestion"], suggestion["Country Code"]) for suggestion in test_request_suggest.json()["data"]], 
+            [("Russia", "RU"), ("Russian Federation", "RU")], "Expected alias and country name completions.")
+        test_request_suggest = requests.get(self.suggest_url + "fra?types=alpha3", headers=self.user_agent_header).json()["data"]
+        self.assertEqual(test_request_suggest[0]["Suggestion"], "FRA", "Expected alpha-3 code completion.")
+        self.assertEqual(test_request_suggest[0]["Updates"], len(requests.get(self.alpha_base_url + "FR", headers=self.user_agent_header).json()["data"]["FR"]),
+            "Expected number of updates of the country.")
+#2.) ranked by number of updates, limited
+        test_request_suggest = requests.get(self.suggest_url + "ad?limit=3", headers=self.user_agent_header).json()
+        self.assertEqual(test_request_suggest["metadata"]["count"], 3, "Expected 3 completions.")
+        self.assertEqual(test_request_suggest["data"][0]["Suggestion"], "addition", "Expected most frequent completion first.")
+        updates = [suggestion["Updates"] for suggestion in test_request_suggest["data"]]
+        self.assertEqual(updates, sorted(updates, reverse=True), "Expected completions ranked by number of updates.")
+#3.) no completions
+        self.assertEqual(requests.get(self.suggest_url + "zzzzz", headers=self.user_agent_header).json()["data"], [], "Expected no completions.")
+#4.) invalid prefix, limit and types
+        for test_url in [self.suggest_url, self.suggest_url + "fr?limit=0", self.suggest_url + "fr?limit=101", self.suggest_url + "fr?limit=abc", self.suggest_url + "fr?types=abc"]:
+            resp_error = requests.get(test_url, headers=self.user_agent_header)
+            self.assertEqual(resp_error.status_code, 400, f"Expected 400 for {test_url}, got {resp_error.status_code}.")
+
+#     @unittest.skip("")
+    def test_batch(self):
+        """ Testing a batch of queries returns the same results as each query's GET endpoint, keyed by query id. """
+        test_queries = [({"id": "fr", "alpha": "FR"}, self.alpha_base_url + "FR"),
+                        ({"id": "years", "year": "2016-2018", "sortBy": "dateDesc", "limit": 10}, self.year_base_url + "2016-2018?sortBy=dateDesc&limit=10"),
+                        ({"id": "de_2010", "alpha": "DEU", "year": "2010"}, self.alpha_base_url + "DEU/year/2010"),
+                        ({"id": "france", "country_name": "France", "date_range": "2016-01-01,2019-12-31"}, self.country_name_base_url + "France/date_range/2016-01-01,2019-12-31"),
+                        ({"id": "search", "search": "addition", "year": "2016", "excludeMatchScore": 1}, self.search_url + "addition/year/2016?excludeMatchScore=1"),
+                        ({"id": "search_sorted", "search": "addition", "sortBy": "dateDesc", "limit": 20}, self.search_url + "addition?sortBy=dateDesc&limit=20")]
+        test_request_batch = requests.post(self.batch_url, json=[query for query, _ in test_queries] + [{"alpha": "XX"}], headers=self.user_agent_header)
+#1.) each query's data and metadata match its GET endpoint
+        self.assertEqual(test_request_batch.status_code, 200, f"Expected 200 status code from batch request, got {test_request_batch.status_code}.")
+        batch_results = test_request_batch.json()
+        for query, test_url in test_queries:
+            expected = requests.get(test_url, headers=self.user_agent_header).json()
+            expected["metadata"].pop("generated")
+            self.assertEqual(batch_results["data"][query["id"]], expected, f"Expected batch results of query {query['id']} to match {test_url}.")
+#2.) invalid query returns its error keyed by its index, without failing the batch
+        self.assertEqual(batch_results["data"]["6"], {"message": "Invalid ISO 3166-1 country code input, cannot convert into corresponding alpha-2 code: XX.", "status": 400},
+            "Expected error of invalid query keyed by its index.")
+        self.assertEqual(batch_results["metadata"]["queries"], 7, "Expected 7 queries in batch metadata.")
+        self.assertEqual(batch_results["metadata"]["errors"], 1, "Expected 1 error in batch metadata.")
+        self.assertEqual(batch_results["metadata"]["count"], sum(result["metadata"]["count"] for result in batch_results["data"].values() if "metadata" in result),
+            "Expected batch count to be the sum of each query's count.")
+#3.) invalid query keys and filters
+        test_request_batch = requests.post(self.batch_url, json=[{"alpha": "FR", "country_name": "France"}, {"sortBy": "dateDesc"}, {"year": "abc"}, {"alpha": "FR", "colour": "red"}], 
+                                           headers=self.user_agent_header).json()
+        self.assertEqual(test_request_batch["metadata"]["errors"], 4, "Expected each invalid query to return an error.")
+#4.) invalid request bodies
+        for test_body in [None, [], {"alpha": "FR"}, [{"id": "a", "alpha": "FR"}, {"id": "a", "alpha": "DE"}], [{"alpha": "FR"}] * 501]:
+            resp_error = requests.post(self.batch_url, json=test_body, headers=self.user_agent_header)
+            self.assertEqual(resp_error.status_code, 400, f"Expected 400 for invalid batch request body {test_body!r:.40}, got {resp_error.status_code}.")
+#5.) unexpected error running a query returns its error, without failing the other queries, only testable against the local app
+        if not (os.environ.get("BASE_URL")):
+            run_batch_query = index.run_batch_query
+            with mock.patch.object(index, "run_batch_query", side_effect=lambda query: run_batch_query(query) if query.get("id") != "error" else 1 / 0):
+                test_request_batch = requests.post(self.batch_url, json=[{"id": "fr", "alpha": "FR"}, {"id": "error", "alpha": "DE"}], headers=self.user_agent_header)
+            self.assertEqual(test_request_batch.status_code, 200, f"Expected 200 status code from batch request, got {test_request_batch.status_code}.")
+            self.assertEqual(test_request_batch.json()["data"]["error"]["status"], 500, "Expected 500 status of failed query.")
+            self.assertIn("FR", test_request_batch.json()["data"]["fr"]["data"], "Expected results of other queries.")
+
+#     @unittest.skip("")
+    def test_startup_report(self):
+        """ Testing a cold started worker defers its heavy imports and reports its import, load and index build times. """
+        repo_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+#1.) importing the API doesn't import the deferred packages, or load the updates store
+        cold_import = subprocess.run([sys.executable, "-c", "import sys, json, index; print(json.dumps([index.startup_report(), sorted(sys.modules)]))"], 
+            cwd=repo_dir, capture_output=True, text=True, check=True)
+        startup_report, modules = json.loads(cold_import.stdout.strip().splitlines()[-1])
+        for module in ["iso3166_updates", "requests", "pycountry", "thefuzz", "rapidfuzz", "search_index"]:
+            self.assertNotIn(module, modules, f"Expected {module} not to be imported on start up.")
+        self.assertGreater(startup_report["import_ms"], 0, "Expected import time.")
+        self.assertIsNone(startup_report["load_ms"], "Expected updates store not loaded on import.")
+        self.assertEqual(startup_report["index_build_ms"], {}, "Expected no indexes built on import.")
+#2.) cold start building every index, via the command line
+        cold_start = subprocess.run([sys.executable, "index.py", "--startup-report"], cwd=repo_dir, capture_output=True, text=True, check=True)
+        startup_report = json.loads(cold_start.stdout)
+        self.assertIn(startup_report["load_source"], ["snapshot", "dataset"], "Expected source of updates store.")
+        self.assertGreater(startup_report["load_ms"], 0, "Expected load time.")
+        self.assertEqual(set(startup_report["index_build_ms"]), {"query_engine", "search_index", "country_code_index", "country_name_index", "suggest_index"},
+            "Expected build time of each index.")
+        self.assertAlmostEqual(startup_report["total_ms"], startup_report["import_ms"] + startup_report["load_ms"] + sum(startup_report["index_build_ms"].values()), 
+            delta=0.1, msg="Expected total of each stage.")
+        self.assertTrue(startup_report["deferred_imports"]["rapidfuzz"], "Expected rapidfuzz imported by fuzzy matching.")
+#3.) startup report endpoint only available in debug mode
+        resp_error = requests.get(self.base_url + "/startup-report", headers=self.user_agent_header)
+        self.assertEqual(resp_error.status_code, 403, f"Expected 403 outside of debug mode, got {resp_error.status_code}.")
+
     # @unittest.skip("")
     def test_version(self):
         """ Testing the correct version of the iso3166-updates software is being used by the API. """
@@ -0,0 +1,267 @@
+import unittest
+import os
+import sys
+from datetime import date
+from iso3166_updates import *
+unittest.TestLoader.sortTestMethodsUsing = None
+
+#add the repo root to sys.path so the query engine module can be imported directly
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from updates_store import UpdatesStore
+from query_engine import QueryEngine, QuerySpec
+from search_cache import SearchCache
+
+class Query_Engine_Tests(unittest.TestCase):
+    """
+    Test suite for testing the QueryEngine that answers the combined country, year, date
+    range and search filters of the API's endpoints from the updates store's indexes.
+
+    Test Cases
+    ==========
+    test_plan:
+        testing the indexed filters are ordered most selective first, with their estimated result sizes.
+    test_select:
+        testing combined filters return the same records as a full scan, in the order of the country filter.
+    test_select_page:
+        testing a page of countries has the same records as the page of the selected records, with the total count of all countries.
+    test_search:
+        testing search results match the iso3166-updates search function, and are restricted by the other filters.
+    test_search_page:
+        testing a page of search results has the same updates as the page of all the search results, sorted by date if input.
+    test_search_cache:
+        testing repeated searches, with their terms normalized, are answered from the search cache with the same results.
+    test_search_within:
+        testing searches stop once their time budget is spent, with the matches found so far and the fraction of the search done.
+    test_lazy_search_index:
+        testing the search index is only built, or got from the search index function, by the first search.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """ Build the updates dataset, record store and query engine once for all tests. """
+        cls.updates = Updates()
+        cls.updates_store = UpdatesStore(cls.updates.all, version="test")
+        cls.query_engine = QueryEngine(cls.updates_store, convert_date=Updates.convert_date_format)
+
+    def full_scan(self, country_codes=None, years=None, date_range=None) -> dict:
+        """ Get the records matching the filters by checking every record, per country in the order of the country codes. """
+        records_by_country = {}
+        for country_code in (country_codes if country_codes is not None else self.updates_store.records_by_country):
+            for record in self.updates_store.records_by_country.get(country_code, ()):
+                if (years is not None and record.year not in years):
+                    continue
+                if (date_range is not None and not any(ordinal is not None and date_range[0] <= ordinal <= date_range[1]
+                                                       for ordinal in (record.ordinal, record.corrected_ordinal))):
+                    continue
+                records_by_country.setdefault(country_code, []).append(record)
+        return records_by_country
+
+#     @unittest.skip("")
+    def test_plan(self):
+        """ Testing the indexed filters are ordered most selective first, with their estimated result sizes. """
+        year_2016 = (["2016"], False, False, False, False)
+        date_range = (date(2000, 1, 1).toordinal(), date(2030, 1, 1).toordinal())
+#1.) no filters
+        self.assertEqual(self.query_engine.plan(QuerySpec()), [], "Expected empty plan for no filters.")
+#2.) estimated sizes of each filter
+        plan = dict(self.query_engine.plan(QuerySpec(country_codes=("FR", "DE"), year=year_2016, date_range=date_range)))
+        self.assertEqual(plan["country"], len(self.updates_store["FR"]) + len(self.updates_store["DE"]), "Expected country estimate of the countries' updates.")
+        self.assertEqual(plan["year"], sum(len(records) for records in self.updates_store.year_records(*year_2016).values()), "Expected year estimate of the year's updates.")
+#3.) smallest first
+        plan = self.query_engine.plan(QuerySpec(country_codes=("FR",), year=year_2016, date_range=date_range))
+        self.assertEqual([filter_ for filter_, _ in plan], ["country", "year", "date_range"], "Expected filters ordered most selective first.")
+        self.assertEqual(self.query_engine.plan(QuerySpec(country_codes=tuple(self.updates_store.records_by_country), year=year_2016))[0][0], "year",
+            "Expected year filter first for all countries.")
+
+#     @unittest.skip("")
+    def test_select(self):
+        """ Testing combined filters return the same records as a full scan, in the order of the country filter. """
+        date_range = (date(2012, 1, 1).toordinal(), date(2018, 12, 31).toordinal())
+#1.) no filters returns the store's records
+        self.assertIs(self.query_engine.select(QuerySpec()), self.updates_store.records_by_country, "Expected store's records for no filters.")
+#2.) single filters
+        self.assertEqual(self.query_engine.select(QuerySpec(country_codes=("GB", "AD"))), self.full_scan(country_codes=["GB", "AD"]),
+            "Expected countries' records in input order.")
+        self.assertEqual(self.query_engine.select(QuerySpec(year=(["2016"], False, False, False, False))), self.full_scan(years={2016}),
+            "Expected year's records.")
+        self.assertEqual(self.query_engine.select(QuerySpec(date_range=date_range)), self.full_scan(date_range=date_range), "Expected date range's records.")
+#3.) combined filters, for each choice of most selective filter
+        test_cases = [(("FR", "DE", "ID"), (["2010", "2020"], True, False, False, False), None, ["FR", "DE", "ID"], set(range(2010, 2021)), None),
+                      (tuple(self.updates_store.records_by_country), (["2016"], False, False, False, False), None, None, {2016}, None),
+                      (("CN", "AD"), None, date_range, ["CN", "AD"], None, date_range),
+                      (None, (["2015"], False, True, False, False), date_range, None, set(range(2015, 2100)), date_range),
+                      (("ZW", "FR"), (["2014"], False, True, False, False), date_range, ["ZW", "FR"], set(range(2014, 2100)), date_range)]
+        for country_codes, year, date_range_, scan_country_codes, scan_years, scan_date_range in test_cases:
+            records_by_country = self.query_engine.select(QuerySpec(country_codes=country_codes, year=year, date_range=date_range_))
+            self.assertEqual(records_by_country, self.full_scan(scan_country_codes, scan_years, scan_date_range), f"Expected combined filter records for {country_codes}, {year}.")
+            self.assertEqual(list(records_by_country), list(self.full_scan(scan_country_codes, scan_years, scan_date_range)), "Expected countries in order of country filter.")
+#4.) year input twice returns its records twice, as per the year index
+        self.assertEqual(self.query_engine.select(QuerySpec(country_codes=("DE",), year=(["2010", "2010"], False, False, False, False))),
+            self.updates_store.year_records(["2010", "2010"], country_codes=["DE"]), "Expected records of year input twice.")
+#5.) no matching records
+        self.assertEqual(self.query_engine.select(QuerySpec(country_codes=("AD",), year=(["1996"], False, False, False, False))), {}, "Expected no matching records.")
+#6.) countries without updates kept, with no records, when only filtering by country
+        self.assertEqual(self.updates_store["GF"], (), "Expected GF to have no updates.")
+        self.assertEqual(self.query_engine.select(QuerySpec(country_codes=("GF",))), {"GF": []}, "Expected country without updates kept.")
+        self.assertEqual(list(self.query_engine.select(QuerySpec(country_codes=("FR", "GF", "AD")))), ["FR", "GF", "AD"], "Expected countries in input order, including GF.")
+        self.assertEqual(self.query_engine.select(QuerySpec(country_codes=("GF", "FR"), year=(["2016"], False, False, False, False))), 
+            self.full_scan(country_codes=["GF", "FR"], years={2016}), "Expected country without updates excluded alongside other filters.")
+
+#     @unittest.skip("")
+    def test_select_page(self):
+        """ Testing a page of countries has the same records as the page of the selected records, with the total count of all countries. """
+        specs = [QuerySpec(), QuerySpec(country_codes=("FR", "DE", "GF", "AD")), QuerySpec(year=(["2010", "2020"], True, False, False, False)), 
+                 QuerySpec(year=(["2014", "2014"], False, False, False, False)), QuerySpec(date_range=(date(2015, 1, 1).toordinal(), date(2025, 1, 1).toordinal())),
+                 QuerySpec(country_codes=("FR", "DE", "CN"), year=(["2016"], False, True, False, False), date_range=(date(2000, 1, 1).toordinal(), date(2030, 1, 1).toordinal()))]
+#1.) each page of countries, by offset and after the previous page's last country
+        for spec in specs:
+            records_by_country = self.query_engine.select(spec)
+            country_codes = list(records_by_country)
+            total = sum(len(records) for records in records_by_country.values())
+            for limit, offset in [(0, 0), (1, 0), (2, 1), (3, 2), (0, 2), (5, len(country_codes))]:
+                stop = offset + limit if limit else len(country_codes)
+                expected_page = {country_code: list(records_by_country[country_code]) for country_code in country_codes[offset:stop]}
+                page, page_total, more = self.query_engine.select_page(spec, limit, offset)
+                self.assertEqual({country_code: list(records) for country_code, records in page.items()}, expected_page, f"Expected page of countries for {spec}, limit={limit}, offset={offset}.")
+                self.assertEqual(list(page), country_codes[offset:stop], f"Expected countries of the page in order for {spec}.")
+                self.assertEqual((page_total, more), (total, stop < len(country_codes)), f"Expected total and more for {spec}, limit={limit}, offset={offset}.")
+                if (offset > 0 and offset <= len(country_codes)):
+                    self.assertEqual(self.query_engine.select_page(spec, limit, 0, country_codes[offset - 1]), (page, page_total, more), 
+                        f"Expected same page after the previous country for {spec}, limit={limit}.")
+#2.) page only starts after a country output by the query
+        with self.assertRaises(KeyError):
+            self.query_engine.select_page(QuerySpec(year=(["2016"], False, False, False, False)), 2, 0, "ZZ")
+        with self.assertRaises(KeyError):
+            self.query_engine.select_page(QuerySpec(country_codes=("FR",)), 2, 0, "DE")
+
+#     @unittest.skip("")
+    def test_search(self):
+        """ Testing search results match the iso3166-updates search function, and are restricted by the other filters. """
+#1.) same results as the iso3166-updates search function
+        for search_terms, likeness in [("addition", 100), ("Paris, canton", 80), ("2016-11-15", 100), ("deletion", 60)]:
+            for include_match_score in (True, False):
+                self.assertEqual(self.query_engine.search(QuerySpec(search_terms=search_terms, likeness=likeness), include_match_score=include_match_score),
+                    self.updates.search(search_terms, likeness_score=likeness, include_match_score=include_match_score),
+                    f"Expected search results to match iso3166-updates search for {search_terms}, likeness={likeness}.")
+#2.) search restricted to a year, date range and countries
+        all_results = self.query_engine.search(QuerySpec(search_terms="addition"))
+        year_results = self.query_engine.search(QuerySpec(year=(["2016"], False, False, False, False), search_terms="addition"))
+        self.assertEqual(year_results, [update for update in all_results if update["Date Issued"].startswith("2016")], "Expected search results of 2016.")
+        date_range = (date(2010, 1, 1).toordinal(), date(2012, 12, 31).toordinal())
+        in_date_range = lambda update: any(date_ is not None and date_range[0] <= date_.toordinal() <= date_range[1] for date_ in self.updates_store.dates_of(update["Date Issued"]))
+        self.assertEqual(self.query_engine.search(QuerySpec(date_range=date_range, search_terms="addition")), [update for update in all_results if in_date_range(update)],
+            "Expected search results within date range.")
+        self.assertEqual(list(self.query_engine.search(QuerySpec(country_codes=("FR", "AD"), search_terms="addition"), include_match_score=False)), ["AD", "FR"],
+            "Expected search results of the countries, sorted by country code.")
+#3.) no results and invalid likeness
+        self.assertEqual(self.query_engine.search(QuerySpec(search_terms="abcdefghijk")), [], "Expected no search results.")
+        with self.assertRaises(ValueError):
+            self.query_engine.search(QuerySpec(search_terms="addition", likeness=0))
+
+#     @unittest.skip("")
+    def test_search_page(self):
+        """ Testing a page of search results has the same updates as the page of all the search results, sorted by date if input. """
+        spec = QuerySpec(search_terms="addition, paris", likeness=90)
+        date_of = lambda update: self.updates_store.dates_of(update["Date Issued"])[0]
+        for include_match_score in [True, False]:
+            search_results = self.query_engine.search(spec, include_match_score)
+#1.) each page of the list of updates, or countries of the updates per country, by offset and after the previous page's last update or country
+            keys = list(range(len(search_results))) if include_match_score else list(search_results)
+            for limit, offset in [(0, 0), (1, 0), (3, 2), (0, 4), (5, len(keys))]:
+                stop = offset + limit if limit else len(keys)
+                expected_page = search_results[offset:stop] if include_match_score else {country_code: search_results[country_code] for country_code in keys[offset:stop]}
+                page, total, more, scanned = self.query_engine.search_page(spec, None, include_match_score, limit=limit, offset=offset)
+                self.assertEqual(page, expected_page, f"Expected page of search results, include_match_score={include_match_score}, limit={limit}, offset={offset}.")
+                self.assertEqual((total, more, scanned), (len(self.query_engine.search(spec)), stop < len(keys), 1.0), "Expected total and more of the search results.")
+                if (offset > 0 and offset <= len(keys)):
+                    self.assertEqual(self.query_engine.search_page(spec, None, include_match_score, limit=limit, start_after=keys[offset - 1]), (page, total, more, scanned),
+                        f"Expected same page after the previous update or country, include_match_score={include_match_score}, limit={limit}.")
+#2.) search results sorted via the publication date, stably, as a list of updates with their Country Code
+            for descending in [True, False]:
+                if (include_match_score):
+                    sorted_results = sorted(search_results, key=date_of, reverse=descending)
+                else:
+                    sorted_results = sorted([{**update, "Country Code": country_code} for country_code, updates in search_results.items() for update in updates], key=date_of, reverse=descending)
+                self.assertEqual(self.query_engine.search_page(spec, None, include_match_score, True, descending)[0], sorted_results, f"Expected sorted search results, descending={descending}.")
+                self.assertEqual(self.query_engine.search_page(spec, None, include_match_score, True, descending, limit=4, offset=3)[:3], (sorted_results[3:7], len(sorted_results), True),
+                    f"Expected page of sorted search results, descending={descending}.")
+#3.) a single country's search results aren't sorted
+        single_spec = spec._replace(country_codes=("FR",), search_terms="addition")
+        self.assertEqual(self.query_engine.search_page(single_spec, None, False, True)[0], self.query_engine.search(single_spec, False), "Expected unsorted single country search results.")
+#4.) page only starts after an update index of a list of updates, or a country of the updates per country
+        with self.assertRaises(IndexError):
+            self.query_engine.search_page(spec, None, True, limit=2, start_after="FR")
+        with self.assertRaises(KeyError):
+            self.query_engine.search_page(spec, None, False, limit=2, start_after="ZZ")
+
+#     @unittest.skip("")
+    def test_search_cache(self):
+        """ Testing repeated searches, with their terms normalized, are answered from the search cache with the same results. """
+        search_cache = SearchCache()
+        query_engine = QueryEngine(self.updates_store, convert_date=Updates.convert_date_format, search_cache=search_cache)
+#1.) same results as without the cache, the second search a hit
+        for spec in [QuerySpec(search_terms="addition"), QuerySpec(search_terms="Paris, canton", likeness=80), QuerySpec(search_terms="2016-11-15"),
+                     QuerySpec(country_codes=("FR", "AD"), search_terms="addition"), QuerySpec(year=(["2016"], False, False, False, False), search_terms="addition")]:
+            for include_match_score in (True, False):
+                expected = self.query_engine.search(spec, include_match_score=include_match_score)
+                self.assertEqual(query_engine.search(spec, include_match_score=include_match_score), expected, f"Expected same search results as uncached for {spec}.")
+        self.assertEqual((search_cache.hits, search_cache.misses, len(search_cache)), (5, 5, 5), "Expected a cached search per query, hit when repeated.")
+#2.) terms differing only in case and whitespace are the same query
+        query_engine.search(QuerySpec(search_terms=" ADDITION "))
+        self.assertEqual(search_cache.hits, 6, "Expected normalized terms to hit the cache.")
+#3.) other filters and likeness are different queries
+        query_engine.search(QuerySpec(search_terms="addition", likeness=90))
+        query_engine.search(QuerySpec(year=(["2017"], False, False, False, False), search_terms="addition"))
+        self.assertEqual(search_cache.misses, 7, "Expected different likeness and year to miss the cache.")
+#4.) cached results aren't changed by changes to output results
+        results = query_engine.search(QuerySpec(search_terms="addition"))
+        results[0]["Change"] = "changed"
+        self.assertEqual(query_engine.search(QuerySpec(search_terms="addition")), self.query_engine.search(QuerySpec(search_terms="addition")),
+            "Expected cached results unchanged.")
+
+#     @unittest.skip("")
+    def test_search_within(self):
+        """ Testing searches stop once their time budget is spent, with the matches found so far and the fraction of the search done. """
+        search_cache = SearchCache()
+        query_engine = QueryEngine(self.updates_store, convert_date=Updates.convert_date_format, search_cache=search_cache)
+#1.) search finishing within its time budget is complete
+        for spec in [QuerySpec(search_terms="addition"), QuerySpec(search_terms="paris", likeness=10), QuerySpec(search_terms="2016-11-15")]:
+            self.assertEqual(query_engine.search_within(spec, 60), (self.query_engine.search(spec), 1.0), f"Expected complete search results for {spec}.")
+#2.) complete search is cached, so answered in full without a time budget
+        self.assertEqual(query_engine.search_within(QuerySpec(search_terms="paris", likeness=10), 0)[1], 1.0, "Expected cached complete search.")
+        search_cache.clear()
+#3.) fuzzy search without a time budget only has its exact matches, none of the vocabulary scored
+        search_results, scanned = query_engine.search_within(QuerySpec(search_terms="paris", likeness=10), 0)
+        self.assertEqual(scanned, 0, "Expected none of the search done.")
+        self.assertEqual(search_results, self.query_engine.search(QuerySpec(search_terms="paris")), "Expected only exact matches.")
+        search_results, scanned = query_engine.search_within(QuerySpec(search_terms="addition, paris", likeness=10), 0)
+        self.assertEqual((search_results, scanned), (self.query_engine.search(QuerySpec(search_terms="addition, paris")), 0), "Expected exact matches of each term.")
+#4.) date search without a time budget checks no records
+        self.assertEqual(query_engine.search_within(QuerySpec(search_terms="2016-11-15", likeness=50), 0), ([], 0), "Expected no records checked.")
+#5.) partial searches aren't cached
+        query_engine.search_within(QuerySpec(search_terms="paris", likeness=20), 0)
+        self.assertEqual(len(search_cache), 0, "Expected partial search not cached.")
+
+#     @unittest.skip("")
+    def test_lazy_search_index(self):
+        """ Testing the search index is only built, or got from the search index function, by the first search. """
+        search_index_calls = []
+        def get_search_index():
+            search_index_calls.append(1)
+            return self.query_engine.search_index
+        query_engine = QueryEngine(self.updates_store, convert_date=Updates.convert_date_format, search_index=get_search_index)
+#1.) not built by queries without search terms
+        self.assertEqual(query_engine.select(QuerySpec(country_codes=("FR",))), self.query_engine.select(QuerySpec(country_codes=("FR",))), 
+            "Expected country records.")
+        self.assertEqual(search_index_calls, [], "Expected search index not built without search terms.")
+#2.) got once, by the first search
+        self.assertEqual(query_engine.search(QuerySpec(search_terms="addition")), self.query_engine.search(QuerySpec(search_terms="addition")),
+            "Expected search results.")
+        query_engine.search(QuerySpec(search_terms="paris", likeness=80))
+        self.assertEqual(search_index_calls, [1], "Expected search index got once.")
+        self.assertIs(query_engine.search_index, self.query_engine.search_index, "Expected search index of the function.")
+#3.) built from the updates store by default
+        self.assertIs(QueryEngine(self.updates_store).search_index.updates_store, self.updates_store, "Expected default search index of the store.")
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
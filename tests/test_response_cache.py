@@ -0,0 +1,166 @@
+import unittest
+import os
+import sys
+import json
+import gzip
+import zlib
+unittest.TestLoader.sortTestMethodsUsing = None
+
+#add the repo root to sys.path so the response cache module can be imported directly
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from response_cache import ResponseCache, CachedPayload, QueryKey, canonical_query_key, deflate_segment, join_deflate_segments, compress, compress_stream
+
+class Response_Cache_Tests(unittest.TestCase):
+    """
+    Test suite for testing the ResponseCache of pre-serialized JSON response payloads.
+
+    Test Cases
+    ==========
+    test_get_put:
+        testing payloads are cached per key and dataset version, counting hits and misses.
+    test_render:
+        testing the rendered response envelope, and its chunks, match serializing the whole envelope.
+    test_clear:
+        testing all cached payloads are removed when the cache is cleared.
+    test_render_encoded:
+        testing the gzip and deflate encoded response envelopes decompress to the rendered envelope.
+    test_deflate_segments:
+        testing independently compressed deflate segments join into valid gzip and deflate bodies.
+    test_max_bytes:
+        testing the least recently used payloads are evicted once the cache is over its maximum bytes, and a new dataset version removes all payloads.
+    test_canonical_query_key:
+        testing equivalent queries have the same canonical key, and payload metadata is rendered in the envelope.
+    """
+    def setUp(self):
+        """ Initialise test data and an empty response cache for each test. """
+        self.response_cache = ResponseCache(dumps=lambda data: json.dumps(data, sort_keys=True, separators=(",", ":")))
+        self.test_data = {"AD": [{"Change": "Update List Source.", "Date Issued": "2015-11-27", "Description of Change": "", "Source": "Online Browsing Platform (OBP)."}]}
+
+#     @unittest.skip("")
+    def test_get_put(self):
+        """ Testing payloads are cached per key and dataset version, counting hits and misses. """
+#1.) miss before payload cached
+        self.assertIsNone(self.response_cache.get("alpha/AD", "1.8.8"), "Expected no cached payload.")
+        self.assertEqual((self.response_cache.hits, self.response_cache.misses), (0, 1), "Expected 1 cache miss.")
+#2.) hit after payload cached
+        payload = self.response_cache.put("alpha/AD", "1.8.8", self.test_data, 1)
+        self.assertIsInstance(payload, CachedPayload, f"Expected CachedPayload, got {type(payload)}.")
+        self.assertEqual(json.loads(payload.data), self.test_data, "Expected cached JSON bytes to match the payload data.")
+        self.assertIs(self.response_cache.get("alpha/AD", "1.8.8"), payload, "Expected cached payload.")
+        self.assertEqual((self.response_cache.hits, self.response_cache.misses), (1, 1), "Expected 1 cache hit.")
+#3.) payload from a different dataset version is a miss
+        self.assertIsNone(self.response_cache.get("alpha/AD", "1.8.9"), "Expected no cached payload for a new dataset version.")
+        self.response_cache.put("alpha/AD", "1.8.9", self.test_data, 1)
+        self.assertIsNone(self.response_cache.get("alpha/AD", "1.8.8"), "Expected payload of old dataset version to be replaced.")
+        self.assertEqual(len(self.response_cache), 1, f"Expected 1 cached payload, got {len(self.response_cache)}.")
+
+#     @unittest.skip("")
+    def test_render(self):
+        """ Testing the rendered response envelope, and its chunks, match serializing the whole envelope. """
+        payload = self.response_cache.put("alpha/AD", "1.8.8", self.test_data, 1)
+#1.)
+        expected_envelope = json.dumps({"data": self.test_data, "metadata": {"count": 1, "generated": "2025-01-01T00:00:00Z"}}, sort_keys=True, separators=(",", ":"))
+        self.assertEqual(self.response_cache.render(payload, generated="2025-01-01T00:00:00Z"), expected_envelope.encode("utf-8") + b"\n",
+            "Expected rendered envelope to match the serialized envelope.")
+#2.) chunks share the cached data
+        chunks = self.response_cache.render_chunks(payload, generated="2025-01-01T00:00:00Z")
+        self.assertEqual(b"".join(chunks), expected_envelope.encode("utf-8") + b"\n", "Expected rendered chunks to match the serialized envelope.")
+        self.assertIs(chunks[1], payload.data, "Expected chunks to share the cached payload data.")
+
+#     @unittest.skip("")
+    def test_clear(self):
+        """ Testing all cached payloads are removed when the cache is cleared. """
+        self.response_cache.put("all", "1.8.8", self.test_data, 1)
+        self.response_cache.put("year/2015", "1.8.8", self.test_data, 1)
+#1.)
+        self.assertIn("all", self.response_cache, "Expected all updates payload to be cached.")
+        self.response_cache.clear()
+        self.assertEqual(len(self.response_cache), 0, "Expected no cached payloads after clear.")
+        self.assertIsNone(self.response_cache.get("all", "1.8.8"), "Expected no cached payload after clear.")
+
+#     @unittest.skip("")
+    def test_render_encoded(self):
+        """ Testing the gzip and deflate encoded response envelopes decompress to the rendered envelope. """
+        payload = self.response_cache.put("alpha/AD", "1.8.8", self.test_data, 1)
+        expected_envelope = self.response_cache.render(payload, generated="2025-01-01T00:00:00Z")
+#1.) gzip
+        self.assertEqual(gzip.decompress(self.response_cache.render_encoded(payload, "gzip", generated="2025-01-01T00:00:00Z")), expected_envelope,
+            "Expected gzip encoded envelope to decompress to the rendered envelope.")
+#2.) deflate
+        self.assertEqual(zlib.decompress(self.response_cache.render_encoded(payload, "deflate", generated="2025-01-01T00:00:00Z")), expected_envelope,
+            "Expected deflate encoded envelope to decompress to the rendered envelope.")
+#3.) only the metadata differs between encoded responses
+        self.assertEqual(zlib.decompress(self.response_cache.render_encoded(payload, "deflate", generated="2026-01-01T00:00:00Z")),
+            self.response_cache.render(payload, generated="2026-01-01T00:00:00Z"), "Expected encoded envelope with the new metadata.")
+
+#     @unittest.skip("")
+    def test_deflate_segments(self):
+        """ Testing independently compressed deflate segments join into valid gzip and deflate bodies. """
+        test_parts = [b'{"data":', json.dumps(self.test_data).encode("utf-8") * 50, b"", b',"metadata":{"count":50}}']
+        segments = [(part, deflate_segment(part, final=(i == len(test_parts) - 1))) for i, part in enumerate(test_parts)]
+#1.)
+        self.assertEqual(gzip.decompress(join_deflate_segments(segments, "gzip")), b"".join(test_parts), "Expected joined gzip body to decompress to the data.")
+        self.assertEqual(zlib.decompress(join_deflate_segments(segments, "deflate")), b"".join(test_parts), "Expected joined deflate body to decompress to the data.")
+#2.) on the fly compression
+        self.assertEqual(gzip.decompress(compress(b"".join(test_parts), "gzip")), b"".join(test_parts), "Expected gzip compressed body to decompress to the data.")
+        self.assertEqual(zlib.decompress(compress(b"".join(test_parts), "deflate")), b"".join(test_parts), "Expected deflate compressed body to decompress to the data.")
+#3.) incremental compression of a streamed body
+        self.assertEqual(gzip.decompress(b"".join(compress_stream(iter(test_parts), "gzip"))), b"".join(test_parts), "Expected gzip compressed stream to decompress to the data.")
+        self.assertEqual(zlib.decompress(b"".join(compress_stream(iter(test_parts), "deflate"))), b"".join(test_parts), "Expected deflate compressed stream to decompress to the data.")
+
+#     @unittest.skip("")
+    def test_max_bytes(self):
+        """ Testing the least recently used payloads are evicted once the cache is over its maximum bytes, and a new dataset version removes all payloads. """
+        payload_size = self.response_cache.put("alpha/AD", "1.8.8", self.test_data, 1).size
+        response_cache = ResponseCache(dumps=lambda data: json.dumps(data, sort_keys=True, separators=(",", ":")), max_bytes=payload_size * 2)
+#1.) least recently used payload evicted
+        response_cache.put("alpha/AD", "1.8.8", self.test_data, 1)
+        response_cache.put("alpha/AE", "1.8.8", self.test_data, 1)
+        response_cache.get("alpha/AD", "1.8.8")
+        response_cache.put("alpha/AF", "1.8.8", self.test_data, 1)
+        self.assertEqual((sorted(response_cache._payloads), response_cache.size, response_cache.evictions), (["alpha/AD", "alpha/AF"], payload_size * 2, 1),
+            "Expected least recently used payload to be evicted.")
+#2.) payload larger than the maximum bytes not cached
+        response_cache.put("all", "1.8.8", {"AD": self.test_data["AD"] * 10}, 10)
+        self.assertNotIn("all", response_cache, "Expected payload larger than maximum bytes not to be cached.")
+#3.) a new dataset version removes the payloads of the previous version
+        response_cache.put("alpha/AD", "1.8.9", self.test_data, 1)
+        self.assertEqual((len(response_cache), response_cache.size), (1, payload_size), "Expected only payloads of the new dataset version.")
+        self.assertEqual(response_cache.stats()["payloads"], 1, "Expected number of payloads in stats.")
+
+#     @unittest.skip("")
+    def test_canonical_query_key(self):
+        """ Testing equivalent queries have the same canonical key, and payload metadata is rendered in the envelope. """
+#1.) alpha-2 codes and fields deduplicated and sorted
+        query_key = canonical_query_key("api_alpha", ["FR", "DE"], fields=["Date Issued", "Change"])
+        self.assertIsInstance(query_key, QueryKey, f"Expected QueryKey, got {type(query_key)}.")
+        self.assertEqual(canonical_query_key("api_alpha", ["DE", "FR", "DE"], fields=["Change", "Date Issued", "Change"]), query_key, "Expected same key for reordered codes and fields.")
+        self.assertNotEqual(canonical_query_key("api_alpha", ["DE", "FR"]), query_key, "Expected different key for different fields.")
+#2.) years, list and exclusion of years unordered, repeated years of a list kept, a range of a single year is that year
+        self.assertEqual(canonical_query_key("api_year", year=(["2016", "2004"], False, False, False, False)), 
+                         canonical_query_key("api_year", year=(["2004", "2016"], False, False, False, False)), "Expected same key for reordered years.")
+        self.assertNotEqual(canonical_query_key("api_year", year=(["2016", "2016"], False, False, False, False)), 
+                            canonical_query_key("api_year", year=(["2016"], False, False, False, False)), "Expected different key for repeated year.")
+        self.assertEqual(canonical_query_key("api_year", year=(["2016", "2004"], False, False, False, True)), 
+                         canonical_query_key("api_year", year=(["2004", "2016", "2004"], False, False, False, True)), "Expected same key for repeated excluded years.")
+        self.assertEqual(canonical_query_key("api_year", year=(["2016", "2016"], True, False, False, False)), 
+                         canonical_query_key("api_year", year=(["2016"], False, False, False, False)), "Expected same key for range of a single year.")
+        self.assertNotEqual(canonical_query_key("api_year", year=(["2016"], False, True, False, False)), 
+                            canonical_query_key("api_year", year=(["2016"], False, False, True, False)), "Expected different key for greater and less than year.")
+        self.assertNotEqual(canonical_query_key("api_year", year=(["2016"], False, False, False, True)), 
+                            canonical_query_key("api_year", year=(["2016"], False, False, False, False)), "Expected different key for excluded year.")
+#3.) sortBy only kept if sorting by date, with more than one country
+        self.assertEqual(canonical_query_key("all", sort_by="dateasc").sort_by, "dateasc", "Expected date sort kept.")
+        self.assertEqual(canonical_query_key("all", sort_by="invalid"), canonical_query_key("all"), "Expected invalid sort to be dropped.")
+        self.assertEqual(canonical_query_key("api_alpha", ["AD"], sort_by="datedesc"), canonical_query_key("api_alpha", ["AD"]), "Expected sort of a single country to be dropped.")
+#4.) pagination and date range kept
+        self.assertNotEqual(canonical_query_key("api_date_range", date_range=(735000, 736000), limit=10), canonical_query_key("api_date_range", date_range=(735000, 736000)),
+            "Expected different key for paginated query.")
+#5.) payload metadata rendered in the envelope
+        payload = self.response_cache.put(query_key, "1.8.8", self.test_data, 1, metadata={"total": 5, "limit": 1})
+        self.assertEqual(json.loads(self.response_cache.render(payload, generated="2025-01-01T00:00:00Z"))["metadata"], 
+                         {"count": 1, "total": 5, "limit": 1, "generated": "2025-01-01T00:00:00Z"}, "Expected payload metadata in envelope.")
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
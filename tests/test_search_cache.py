@@ -0,0 +1,100 @@
+import unittest
+import os
+import sys
+unittest.TestLoader.sortTestMethodsUsing = None
+
+#add the repo root to sys.path so the search cache module can be imported directly
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from search_cache import SearchCache
+
+class Search_Cache_Tests(unittest.TestCase):
+    """
+    Test suite for testing the SearchCache, the bounded LRU cache of recent searches' matches.
+
+    Test Cases
+    ==========
+    test_get_put:
+        testing matches are cached per normalized query, counting hits and misses.
+    test_eviction:
+        testing the least recently used searches are evicted once the total number of matches is over the maximum size.
+    test_ttl:
+        testing cached searches expire after the time to live.
+    test_clear:
+        testing all cached searches are removed when the cache is cleared.
+    """
+    def setUp(self):
+        """ Initialise an empty search cache, with a clock set by each test, for each test. """
+        self.now = 0
+        self.search_cache = SearchCache(max_size=10, ttl=60, clock=lambda: self.now)
+
+#     @unittest.skip("")
+    def test_get_put(self):
+        """ Testing matches are cached per normalized query, counting hits and misses. """
+#1.) miss before matches cached
+        self.assertIsNone(self.search_cache.get(("1.0", ("addition",), 100)), "Expected no cached matches.")
+        self.assertEqual((self.search_cache.hits, self.search_cache.misses), (0, 1), "Expected 1 cache miss.")
+#2.) hit after matches cached, as a tuple
+        self.assertEqual(self.search_cache.put(("1.0", ("addition",), 100), [("record", 100)]), (("record", 100),), "Expected matches output as a tuple.")
+        self.assertEqual(self.search_cache.get(("1.0", ("addition",), 100)), (("record", 100),), "Expected cached matches.")
+        self.assertEqual((self.search_cache.hits, self.search_cache.misses), (1, 1), "Expected 1 cache hit.")
+#3.) different likeness or dataset version is a different query
+        self.assertIsNone(self.search_cache.get(("1.0", ("addition",), 90)), "Expected no cached matches of different likeness.")
+        self.assertIsNone(self.search_cache.get(("1.1", ("addition",), 100)), "Expected no cached matches of different dataset version.")
+#4.) no matches cached with a size of 1, replacing matches updates the size
+        self.search_cache.put(("1.0", ("xyz",), 100), [])
+        self.assertEqual(self.search_cache.get(("1.0", ("xyz",), 100)), (), "Expected cached empty matches.")
+        self.assertEqual(self.search_cache.size, 2, "Expected size of 1 per entry without matches.")
+        self.search_cache.put(("1.0", ("addition",), 100), [("record", 100), ("record", 90)])
+        self.assertEqual((len(self.search_cache), self.search_cache.size), (2, 3), "Expected replaced matches to update size.")
+        self.assertEqual(self.search_cache.stats(), {"searches": 2, "size": 3, "max_size": 10, "hits": 2, "misses": 3, "evictions": 0}, "Expected cache stats.")
+
+#     @unittest.skip("")
+    def test_eviction(self):
+        """ Testing the least recently used searches are evicted once the total number of matches is over the maximum size. """
+#1.) least recently used search evicted
+        self.search_cache.put("a", range(4))
+        self.search_cache.put("b", range(4))
+        self.search_cache.get("a")
+        self.search_cache.put("c", range(4))
+        self.assertNotIn("b", self.search_cache, "Expected least recently used search evicted.")
+        self.assertIn("a", self.search_cache, "Expected recently used search kept.")
+        self.assertEqual((self.search_cache.size, self.search_cache.evictions), (8, 1), "Expected size within maximum and 1 eviction.")
+#2.) as many searches evicted as needed
+        self.search_cache.put("d", range(10))
+        self.assertEqual(list(self.search_cache._entries), ["d"], "Expected all other searches evicted.")
+        self.assertEqual(self.search_cache.evictions, 3, "Expected 3 evictions.")
+#3.) search larger than the maximum size isn't cached
+        self.assertEqual(self.search_cache.put("e", range(11)), tuple(range(11)), "Expected matches output.")
+        self.assertNotIn("e", self.search_cache, "Expected search larger than maximum size not cached.")
+        self.assertIn("d", self.search_cache, "Expected no eviction for uncached search.")
+
+#     @unittest.skip("")
+    def test_ttl(self):
+        """ Testing cached searches expire after the time to live. """
+#1.)
+        self.search_cache.put("a", [1, 2])
+        self.now = 60
+        self.assertEqual(self.search_cache.get("a"), (1, 2), "Expected cached search within time to live.")
+        self.now = 61
+        self.assertIsNone(self.search_cache.get("a"), "Expected expired search.")
+        self.assertEqual((len(self.search_cache), self.search_cache.size, self.search_cache.misses), (0, 0, 1), "Expected expired search removed.")
+#2.) no expiry with a time to live of 0
+        search_cache = SearchCache(ttl=0, clock=lambda: self.now)
+        search_cache.put("a", [1])
+        self.now = 10 ** 9
+        self.assertEqual(search_cache.get("a"), (1,), "Expected search never to expire.")
+
+#     @unittest.skip("")
+    def test_clear(self):
+        """ Testing all cached searches are removed when the cache is cleared. """
+#1.)
+        self.search_cache.put("a", [1])
+        self.search_cache.put("b", [1, 2])
+        self.search_cache.clear()
+        self.assertEqual((len(self.search_cache), self.search_cache.size), (0, 0), "Expected empty cache.")
+        self.assertIsNone(self.search_cache.get("a"), "Expected no cached search after clearing.")
+        self.assertIn("SearchCache(searches=0", repr(self.search_cache), "Expected repr of empty cache.")
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
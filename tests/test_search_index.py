@@ -0,0 +1,120 @@
+import unittest
+import os
+import sys
+import re
+import time
+from thefuzz import fuzz
+from iso3166_updates import *
+unittest.TestLoader.sortTestMethodsUsing = None
+
+#add the repo root to sys.path so the search index module can be imported directly
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from updates_store import UpdatesStore
+from search_index import SearchIndex, BKTree, max_distance
+
+class Search_Index_Tests(unittest.TestCase):
+    """
+    Test suite for testing the SearchIndex, the inverted index of the words in the updates
+    used by the API's search endpoint.
+
+    Test Cases
+    ==========
+    test_search_index:
+        testing the records' texts, rebuilt from their compact updates rather than kept, and the index's vocabulary, postings and record ids.
+    test_term_scores:
+        testing each term's matching records and scores are the same as scoring every record's words.
+    test_similar_words:
+        testing the BK-tree and vocabulary scan find the same words similar to a term as scoring every vocabulary word.
+    test_partial_term_scores:
+        testing the vocabulary scoring of a term stops at the deadline, with the fraction of the vocabulary scored.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """ Build the updates dataset, record store and search index once for all tests. """
+        cls.updates_store = UpdatesStore(Updates().all, version="test")
+        cls.search_index = SearchIndex(cls.updates_store)
+
+    def scan_scores(self, term: str, likeness: int) -> dict:
+        """ Get the matching records and scores of the term by checking the text of every record, as per the iso3166-updates search function. """
+        word_pattern = re.compile(re.escape(term) if re.search(r'\W', term) else r'\b{}\b'.format(re.escape(term)))
+        scores = {}
+        for record_id, record in enumerate(self.updates_store.records):
+            combined_text = f"{record.update['Change']} {record.update.get('Description of Change', '')}".lower()
+            if (word_pattern.search(combined_text)):
+                scores[record_id] = 100
+            else:
+                words = re.findall(r'\w+', combined_text)
+                if (words and max(fuzz.ratio(term, word) for word in words) >= likeness):
+                    scores[record_id] = max(fuzz.ratio(term, word) for word in words)
+        return scores
+
+#     @unittest.skip("")
+    def test_search_index(self):
+        """ Testing the records' texts, rebuilt from their compact updates rather than kept, and the index's vocabulary, postings and record ids. """
+#1.) a lowercased text per record, in dataset order, rebuilt from its compact update
+        for record_id, record in enumerate(self.updates_store.records):
+            self.assertEqual(self.search_index.record_id(record), record_id, "Expected record id to be its index in dataset order.")
+            self.assertEqual(self.search_index.text(record_id), f"{record.update['Change']} {record.update.get('Description of Change', '')}".lower(), 
+                "Expected lowercased text of the record's Change and Description of Change.")
+        self.assertFalse(hasattr(self.search_index, "texts"), "Expected texts of the records not kept.")
+#2.) vocabulary of distinct words
+        self.assertEqual(list(self.search_index.vocabulary), sorted(set(self.search_index.vocabulary)), "Expected sorted distinct vocabulary.")
+        self.assertEqual(len(self.search_index), len(self.search_index.vocabulary), "Expected length of vocabulary.")
+        self.assertIn("addition", self.search_index.vocabulary, "Expected addition in vocabulary.")
+#3.) postings of word positions
+        for record_id, positions in self.search_index.postings["addition"].items():
+            words = re.findall(r'\w+', self.search_index.text(record_id))
+            self.assertTrue(all(words[position] == "addition" for position in positions), "Expected posting positions of word.")
+            self.assertEqual(len(positions), words.count("addition"), "Expected a position per occurrence of word.")
+
+#     @unittest.skip("")
+    def test_term_scores(self):
+        """ Testing each term's matching records and scores are the same as scoring every record's words. """
+#1.) exact words and substrings
+        for term in ["addition", "paris", "new york", "fr-", "codes added: fr", "remark part 2", "-", "(", "xyzxyz"]:
+            self.assertEqual(self.search_index.term_scores(term), self.scan_scores(term, 100), f"Expected exact matches of {term} to match scan.")
+#2.) fuzzy matches
+        for term, likeness in [("addition", 90), ("subdivisons", 80), ("regon", 70), ("new yrok", 80), ("paris", 40)]:
+            self.assertEqual(self.search_index.term_scores(term, likeness), self.scan_scores(term, likeness),
+                f"Expected fuzzy matches of {term} with likeness {likeness} to match scan.")
+#3.) empty term matches every record with a word
+        self.assertEqual(self.search_index.term_scores(""), self.scan_scores("", 100), "Expected empty term to match every record with a word.")
+
+#     @unittest.skip("")
+    def test_similar_words(self):
+        """ Testing the BK-tree and vocabulary scan find the same words similar to a term as scoring every vocabulary word. """
+#1.) same words and scores as fuzz.ratio over the vocabulary, via the BK-tree at higher likeness scores and the scan at lower
+        for term in ["subdivison", "adition", "regon", "paris", "a", "xyzxyz"]:
+            for likeness in [100, 95, 90, 80, 60, 30]:
+                expected = sorted((word, fuzz.ratio(term, word)) for word in self.search_index.vocabulary if fuzz.ratio(term, word) >= likeness)
+                self.assertEqual(sorted(self.search_index.similar_words(term, likeness)), expected, 
+                    f"Expected similar words of {term} with likeness {likeness} to match scoring every word.")
+#2.) maximum Indel distance of a likeness score
+        self.assertEqual(max_distance(10, 100), 0, "Expected no distance at likeness of 100.")
+        self.assertEqual(max_distance(10, 90), 2, "Expected distance of 2 at likeness of 90.")
+        self.assertEqual(max_distance(10, 80), 5, "Expected distance of 5 at likeness of 80.")
+#3.) BK-tree search
+        bk_tree = BKTree(["book", "books", "cake", "boo", "cape", "cart"])
+        self.assertEqual(len(bk_tree), 6, "Expected a node per word.")
+        self.assertEqual(sorted(bk_tree.search("bok", 1)), ["book"], "Expected words within distance 1.")
+        self.assertEqual(sorted(bk_tree.search("bok", 2)), ["boo", "book", "books"], "Expected substituted character to be a distance of 2.")
+        self.assertEqual(sorted(bk_tree.search("cake", 2)), ["cake", "cape"], "Expected words within distance 2.")
+        self.assertEqual(BKTree([]).search("book", 2), [], "Expected no words in empty tree.")
+
+#     @unittest.skip("")
+    def test_partial_term_scores(self):
+        """ Testing the vocabulary scoring of a term stops at the deadline, with the fraction of the vocabulary scored. """
+#1.) same scores as term_scores before the deadline
+        for term, likeness in [("addition", 100), ("paris", 40), ("subdivison", 90)]:
+            self.assertEqual(self.search_index.partial_term_scores(term, likeness, time.monotonic() + 60), (self.search_index.term_scores(term, likeness), 1.0),
+                f"Expected complete scores of {term} with likeness {likeness}.")
+#2.) only exact matches once the deadline has passed, with none of the vocabulary scored
+        self.assertEqual(self.search_index.partial_term_scores("paris", 40, time.monotonic() - 1), (self.search_index.term_scores("paris"), 0),
+            "Expected only exact matches after deadline.")
+#3.) BK-tree search always finishes
+        self.assertEqual(self.search_index.partial_term_scores("subdivison", 90, time.monotonic() - 1), (self.search_index.term_scores("subdivison", 90), 1.0),
+            "Expected BK-tree search to finish after deadline.")
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
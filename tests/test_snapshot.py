@@ -0,0 +1,154 @@
+import unittest
+import os
+import sys
+import tempfile
+from datetime import date
+from iso3166_updates import *
+unittest.TestLoader.sortTestMethodsUsing = None
+
+#add the repo root to sys.path so the snapshot module can be imported directly
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from updates_store import UpdatesStore, SnapshotRecords
+from snapshot import Snapshot, SnapshotError, write_snapshot, open_snapshot
+
+class Snapshot_Tests(unittest.TestCase):
+    """
+    Test suite for testing the memory mapped binary snapshot of the updates dataset and its
+    indexes, that the API's workers load the updates store from.
+
+    Test Cases
+    ==========
+    test_write_open_snapshot:
+        testing a written snapshot opens with its version, counts and sections, and only for its dataset version.
+    test_invalid_snapshot:
+        testing missing, empty, truncated and non snapshot files aren't opened.
+    test_store_from_snapshot:
+        testing the updates store loaded from a snapshot has the same records and indexes, and answers queries the same, as the store built from the dataset.
+    test_snapshot_records:
+        testing the records of a store loaded from a snapshot are read in place from the snapshot as they're accessed.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """ Build the updates store and write its snapshot into a temporary directory once for all tests. """
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.snapshot_path = os.path.join(cls.temp_dir.name, "iso3166-updates.snapshot")
+        cls.updates_store = UpdatesStore(Updates().all, version="test")
+        cls.snapshot_size = write_snapshot(cls.updates_store, cls.snapshot_path)
+        cls.snapshot = Snapshot(cls.snapshot_path)
+        cls.snapshot_store = UpdatesStore.from_snapshot(cls.snapshot)
+
+    @classmethod
+    def tearDownClass(cls):
+        """ Remove the temporary directory of the snapshot. """
+        cls.temp_dir.cleanup()
+
+    def write_file(self, name: str, contents: bytes) -> str:
+        """ Write the contents into a file of the temporary directory, outputting its path. """
+        path = os.path.join(self.temp_dir.name, name)
+        with open(path, "wb") as test_file:
+            test_file.write(contents)
+        return path
+
+#     @unittest.skip("")
+    def test_write_open_snapshot(self):
+        """ Testing a written snapshot opens with its version, counts and sections, and only for its dataset version. """
+#1.) size, version and counts
+        self.assertEqual(os.path.getsize(self.snapshot_path), self.snapshot_size, "Expected size of written snapshot.")
+        self.assertEqual(self.snapshot.version, "test", "Expected dataset version of snapshot.")
+        self.assertEqual(self.snapshot.country_count, len(self.updates_store.country_codes), "Expected country count of snapshot.")
+        self.assertEqual(self.snapshot.record_count, len(self.updates_store.records), "Expected record count of snapshot.")
+        self.assertFalse(any(name.endswith(".tmp") for name in os.listdir(self.temp_dir.name)), "Expected no temporary file left behind.")
+#2.) sections are memoryviews of unsigned integers over the file
+        timeline_ordinals = self.snapshot.array("timeline_ordinals")
+        self.assertIsInstance(timeline_ordinals, memoryview, "Expected section to be a memoryview.")
+        self.assertEqual(timeline_ordinals.format, "I", "Expected section of unsigned integers.")
+        self.assertEqual(list(timeline_ordinals), list(self.updates_store.timeline_ordinals), "Expected timeline ordinals section.")
+        self.assertEqual(len(list(self.snapshot.records())), len(self.updates_store.records), "Expected fields of each record.")
+        self.assertEqual(self.snapshot.string(self.snapshot.record(0)[2]), self.updates_store.records[0].compact_update.change, "Expected string decoded via its id.")
+        self.assertIsNone(self.snapshot.string(0xFFFFFFFF), "Expected no string for the id of a missing string.")
+        with self.assertRaises(SnapshotError):
+            self.snapshot.array("unknown")
+#3.) opened only for its dataset version
+        self.assertIsNotNone(open_snapshot(self.snapshot_path), "Expected snapshot to open for any version.")
+        self.assertIsNotNone(open_snapshot(self.snapshot_path, version="test"), "Expected snapshot to open for its version.")
+        self.assertIsNone(open_snapshot(self.snapshot_path, version="1.0.0"), "Expected snapshot not to open for another version.")
+
+#     @unittest.skip("")
+    def test_invalid_snapshot(self):
+        """ Testing missing, empty, truncated and non snapshot files aren't opened. """
+#1.) missing file
+        missing_path = os.path.join(self.temp_dir.name, "missing.snapshot")
+        self.assertIsNone(open_snapshot(missing_path), "Expected missing snapshot not to open.")
+        with self.assertRaises(OSError):
+            Snapshot(missing_path)
+#2.) empty, truncated and non snapshot files
+        with open(self.snapshot_path, "rb") as snapshot_file:
+            contents = snapshot_file.read()
+        for name, invalid_contents in [("empty.snapshot", b""), ("header.snapshot", contents[:10]), ("truncated.snapshot", contents[:len(contents) // 2]),
+                                       ("json.snapshot", b'{"AD": []}' * 10), ("format.snapshot", contents[:8] + b"\0\0\0\0" + bytes([99]) + contents[13:])]:
+            invalid_path = self.write_file(name, invalid_contents)
+            with self.assertRaises(SnapshotError):
+                Snapshot(invalid_path)
+            self.assertIsNone(open_snapshot(invalid_path), f"Expected invalid snapshot {name} not to open.")
+
+#     @unittest.skip("")
+    def test_store_from_snapshot(self):
+        """ Testing the updates store loaded from a snapshot has the same records and indexes, and answers queries the same, as the store built from the dataset. """
+#1.) records, in dataset order, building the same updates
+        self.assertEqual(self.snapshot_store.version, "test", "Expected version of store.")
+        self.assertEqual(self.snapshot_store.country_codes, self.updates_store.country_codes, "Expected country codes of store.")
+        self.assertEqual(tuple(self.snapshot_store.records), self.updates_store.records, "Expected records of store.")
+        for country_code in ["AD", "FR", "GB", "TV"]:
+            self.assertEqual(self.snapshot_store.updates(country_code), self.updates_store.updates(country_code), f"Expected updates of {country_code}.")
+            self.assertEqual([self.snapshot_store.tagged_update(record) for record in self.snapshot_store[country_code]],
+                [self.updates_store.tagged_update(record) for record in self.updates_store[country_code]], f"Expected tagged updates of {country_code}.")
+        self.assertEqual(self.snapshot_store.latest_date, self.updates_store.latest_date, "Expected latest date of store.")
+#2.) indexes, read in place from the snapshot
+        self.assertIsInstance(self.snapshot_store.timeline_ordinals, memoryview, "Expected timeline to be read in place.")
+        self.assertEqual(list(self.snapshot_store.timeline_ordinals), list(self.updates_store.timeline_ordinals), "Expected timeline ordinals.")
+        self.assertEqual(list(self.snapshot_store.timeline_countries), list(self.updates_store.timeline_countries), "Expected timeline countries.")
+        self.assertEqual(list(self.snapshot_store.timeline_positions), list(self.updates_store.timeline_positions), "Expected timeline positions.")
+        self.assertEqual(tuple(self.snapshot_store.date_order_asc), self.updates_store.date_order_asc, "Expected ascending date order.")
+        self.assertEqual(tuple(self.snapshot_store.date_order_desc), self.updates_store.date_order_desc, "Expected descending date order.")
+        self.assertEqual(list(self.snapshot_store.years), list(self.updates_store.years), "Expected years of year index.")
+#3.) same answers to queries
+        self.assertEqual(self.snapshot_store.year_records(["2016"]), self.updates_store.year_records(["2016"]), "Expected year records for 2016.")
+        self.assertEqual(self.snapshot_store.year_records(["2004", "2009"], year_range=True), self.updates_store.year_records(["2004", "2009"], year_range=True),
+            "Expected year records for 2004-2009.")
+        self.assertEqual(self.snapshot_store.year_records(["2011"], year_less_than=True, country_codes=["NR", "MA"]),
+            self.updates_store.year_records(["2011"], year_less_than=True, country_codes=["NR", "MA"]), "Expected year records for NR,MA <2011.")
+        for start_date, end_date in [(date(2014, 4, 7), date(2016, 10, 16)), (date(2011, 12, 14), date(2011, 12, 20))]:
+            self.assertEqual(self.snapshot_store.date_range_records(start_date.toordinal(), end_date.toordinal()),
+                self.updates_store.date_range_records(start_date.toordinal(), end_date.toordinal()), f"Expected date range records for {start_date},{end_date}.")
+            self.assertEqual(self.snapshot_store.date_range_records(start_date.toordinal(), end_date.toordinal(), country_codes=["NO", "AD"]),
+                self.updates_store.date_range_records(start_date.toordinal(), end_date.toordinal(), country_codes=["NO", "AD"]),
+                f"Expected country date range records for {start_date},{end_date}.")
+        for descending in [True, False]:
+            self.assertEqual(self.snapshot_store.sort_by_date(self.snapshot_store.records_by_country, descending=descending, limit=25, offset=10),
+                self.updates_store.sort_by_date(self.updates_store.records_by_country, descending=descending, limit=25, offset=10),
+                f"Expected page of updates sorted by date, descending={descending}.")
+
+#     @unittest.skip("")
+    def test_snapshot_records(self):
+        """ Testing the records of a store loaded from a snapshot are read in place from the snapshot as they're accessed. """
+#1.) records, each country's records and date orders are sequences over the snapshot, not copies of the records
+        for records in [self.snapshot_store.records, self.snapshot_store["FR"], self.snapshot_store.date_order_desc]:
+            self.assertIsInstance(records, SnapshotRecords, "Expected records read in place from the snapshot.")
+        self.assertEqual(len(self.snapshot_store["FR"]), len(self.updates_store["FR"]), "Expected number of country's records.")
+#2.) indexing and slicing build the records as they're accessed
+        for index in [0, 5, -1]:
+            self.assertEqual(self.snapshot_store["FR"][index], self.updates_store["FR"][index], f"Expected record at index {index}.")
+            self.assertEqual(self.snapshot_store.date_order_asc[index], self.updates_store.date_order_asc[index], f"Expected record of date order at index {index}.")
+        self.assertEqual(self.snapshot_store["FR"][2:6], self.updates_store["FR"][2:6], "Expected slice of country's records.")
+        self.assertEqual(self.snapshot_store.records[-3:], self.updates_store.records[-3:], "Expected slice of records.")
+        with self.assertRaises(IndexError):
+            self.snapshot_store["FR"][len(self.updates_store["FR"])]
+#3.) each access builds a new record, with the same update, and dates parsed on demand
+        self.assertIsNot(self.snapshot_store["AD"][0], self.snapshot_store["AD"][0], "Expected record built on each access.")
+        self.assertEqual(self.snapshot_store.updates("AD"), self.updates_store.updates("AD"), "Expected updates of AD.")
+        date_issued = self.updates_store["AD"][0].compact_update.date_issued
+        self.assertEqual(self.snapshot_store.dates_of(date_issued), self.updates_store.dates_of(date_issued), "Expected dates of Date Issued.")
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
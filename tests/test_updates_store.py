@@ -0,0 +1,251 @@
+import unittest
+import os
+import sys
+from datetime import date
+from iso3166_updates import *
+unittest.TestLoader.sortTestMethodsUsing = None
+
+#add the repo root to sys.path so the updates store module can be imported directly
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from updates_store import UpdatesStore, UpdateRecord, CompactUpdate, parse_date_issued, measure_footprint
+
+class Updates_Store_Tests(unittest.TestCase):
+    """
+    Test suite for testing the pre-parsed, immutable UpdatesStore that the API builds from
+    the iso3166-updates dataset on load.
+
+    Test Cases
+    ==========
+    test_parse_date_issued:
+        testing parsing of the original and corrected dates from the Date Issued attribute.
+    test_store_records:
+        testing the store holds a record per update, in dataset order, building the original update objects.
+    test_store_dates_of:
+        testing the parsed dates lookup for seen and unseen Date Issued strings.
+    test_year_index:
+        testing the year index returns the same updates as a full scan, for each form of year input.
+    test_date_timeline:
+        testing the date timeline returns the same updates as a full scan over original and corrected dates.
+    test_sort_by_date:
+        testing the pre-sorted date orders and merge of per-country runs match a stable sort of the updates, and pages of them.
+    test_newest_date:
+        testing the newest original or corrected publication date of updates and of the whole store.
+    test_compact_update:
+        testing compact updates build the original update objects, sharing their repeated strings, with a smaller footprint than the dicts.
+    """
+    @classmethod
+    def setUpClass(cls):
+        """ Build the updates dataset and record store once for all tests. """
+        cls.all_iso3166_updates = Updates().all
+        cls.updates_store = UpdatesStore(cls.all_iso3166_updates, version="test")
+
+#     @unittest.skip("")
+    def test_parse_date_issued(self):
+        """ Testing parsing of the original and corrected dates from the Date Issued attribute. """
+#1.)
+        self.assertEqual(parse_date_issued("2016-11-15"), (date(2016, 11, 15), None), "Expected original date only.")
+#2.)
+        self.assertEqual(parse_date_issued("2011-12-13 (corrected 2011-12-15)"), (date(2011, 12, 13), date(2011, 12, 15)),
+            "Expected original and corrected dates.")
+#3.)
+        self.assertEqual(parse_date_issued("2010-02-03 (corrected 2010-02-19)."), (date(2010, 2, 3), date(2010, 2, 19)),
+            "Expected trailing full stop to be ignored.")
+#4.)
+        with self.assertRaises(ValueError):
+            parse_date_issued("abcdef")
+
+#     @unittest.skip("")
+    def test_store_records(self):
+        """ Testing the store holds a record per update, in dataset order, building the original update objects. """
+#1.)
+        total_updates = sum(len(updates) for updates in self.all_iso3166_updates.values())
+        self.assertEqual(len(self.updates_store), total_updates, f"Expected {total_updates} records in store, got {len(self.updates_store)}.")
+        self.assertEqual(list(self.updates_store.records_by_country), list(self.all_iso3166_updates),
+            "Expected store countries to be in the same order as the dataset.")
+#2.)
+        for country_code, updates in self.all_iso3166_updates.items():
+            records = self.updates_store[country_code]
+            self.assertIsInstance(records, tuple, f"Expected records of {country_code} to be an immutable tuple.")
+            self.assertEqual(len(records), len(updates), f"Expected a record per update for {country_code}.")
+            for position, (record, update) in enumerate(zip(records, updates)):
+                self.assertIsInstance(record, UpdateRecord, f"Expected UpdateRecord, got {type(record)}.")
+                self.assertEqual(record.update, update, "Expected record to build the original update object.")
+                self.assertEqual((record.country_code, record.position), (country_code, position), "Expected record country and position to match.")
+                self.assertEqual(record.year, record.date_issued.year, "Expected record year to match its original date.")
+                self.assertEqual(record.ordinal, record.date_issued.toordinal(), "Expected record ordinal to match its original date.")
+                self.assertTrue(update["Date Issued"].startswith(record.date_issued.isoformat()),
+                    f"Expected parsed date to match Date Issued: {update['Date Issued']}.")
+#3.)
+        corrected_records = [record for record in self.updates_store.records if record.corrected_date is not None]
+        self.assertGreater(len(corrected_records), 0, "Expected some records to have a corrected date.")
+        for record in corrected_records:
+            self.assertIn("corrected", record.update["Date Issued"], "Expected corrected date only for corrected updates.")
+            self.assertEqual(record.corrected_ordinal, record.corrected_date.toordinal(), "Expected corrected ordinal to match corrected date.")
+#4.)
+        with self.assertRaises(AttributeError):
+            self.updates_store.records[0].year = 1900
+
+#     @unittest.skip("")
+    def test_store_dates_of(self):
+        """ Testing the parsed dates lookup for seen and unseen Date Issued strings. """
+#1.)
+        self.assertEqual(self.updates_store.dates_of("2011-12-13 (corrected 2011-12-15)"), (date(2011, 12, 13), date(2011, 12, 15)),
+            "Expected parsed dates from store.")
+#2.)
+        self.assertEqual(self.updates_store.dates_of("1990-01-01"), (date(1990, 1, 1), None), "Expected unseen date string to be parsed.")
+
+#     @unittest.skip("")
+    def test_year_index(self):
+        """ Testing the year index returns the same updates as a full scan, for each form of year input. """
+        def scan(condition, country_codes=None):
+            output = {}
+            for country_code in (country_codes if country_codes is not None else self.all_iso3166_updates):
+                matches = [record for record in self.updates_store[country_code] if condition(record.year)]
+                if matches:
+                    output[country_code] = matches
+            return output
+#1.) single year and list of years
+        self.assertEqual(self.updates_store.year_records(["2016"]), scan(lambda y: y == 2016), "Expected year index to match scan for 2016.")
+        self.assertEqual(self.updates_store.year_records(["2010", "2015"]), scan(lambda y: y in (2010, 2015)), "Expected year index to match scan for 2010,2015.")
+#2.) year range
+        self.assertEqual(self.updates_store.year_records(["2004", "2009"], year_range=True), scan(lambda y: 2004 <= y <= 2009),
+            "Expected year index to match scan for 2004-2009.")
+#3.) greater than and less than
+        self.assertEqual(self.updates_store.year_records(["2017"], year_greater_than=True), scan(lambda y: y >= 2017),
+            "Expected year index to match scan for >2017.")
+        self.assertEqual(self.updates_store.year_records(["2002"], year_less_than=True), scan(lambda y: y < 2002),
+            "Expected year index to match scan for <2002.")
+#4.) not equal
+        self.assertEqual(self.updates_store.year_records(["2011", "2020"], year_not_equal=True), scan(lambda y: y not in (2011, 2020)),
+            "Expected year index to match scan for <>2011,2020.")
+#5.) restricted to countries, in input order
+        self.assertEqual(self.updates_store.year_records(["2011"], year_less_than=True, country_codes=["NR", "MA", "MH"]),
+            scan(lambda y: y < 2011, ["NR", "MA", "MH"]), "Expected year index to match scan for NR,MA,MH <2011.")
+        self.assertEqual(list(self.updates_store.year_records(["2000"], year_greater_than=True, country_codes=["FR", "DE"])), ["FR", "DE"],
+            "Expected countries to follow the input order.")
+#6.) no matching years
+        self.assertEqual(self.updates_store.year_records(["1996"], year_less_than=True), {}, "Expected no updates before 1996.")
+
+#     @unittest.skip("")
+    def test_date_timeline(self):
+        """ Testing the date timeline returns the same updates as a full scan over original and corrected dates. """
+        def scan(start_date, end_date, country_codes=None):
+            output = {}
+            start_ordinal, end_ordinal = start_date.toordinal(), end_date.toordinal()
+            for country_code in (country_codes if country_codes is not None else self.all_iso3166_updates):
+                matches = [record for record in self.updates_store[country_code] if (start_ordinal <= record.ordinal <= end_ordinal) or 
+                           (record.corrected_ordinal is not None and start_ordinal <= record.corrected_ordinal <= end_ordinal)]
+                if matches:
+                    output[country_code] = matches
+            return output
+        date_ranges = [(date(2014, 4, 7), date(2016, 10, 16)), (date(2009, 8, 17), date(2011, 11, 12)), (date(2022, 1, 1), date.today()),
+                       (date(2011, 12, 14), date(2011, 12, 20)), (date(2011, 12, 13), date(2011, 12, 15)), (date(1990, 1, 1), date(1995, 1, 1))]
+#1.) all countries
+        for start_date, end_date in date_ranges:
+            self.assertEqual(self.updates_store.date_range_records(start_date.toordinal(), end_date.toordinal()), scan(start_date, end_date),
+                f"Expected date timeline to match scan for {start_date},{end_date}.")
+#2.) restricted to countries
+        for start_date, end_date in date_ranges:
+            self.assertEqual(self.updates_store.date_range_records(start_date.toordinal(), end_date.toordinal(), country_codes=["NO", "AD", "PW"]),
+                scan(start_date, end_date, ["NO", "AD", "PW"]), f"Expected country date timelines to match scan for {start_date},{end_date}.")
+#3.) corrected date only within range, updates not duplicated when both dates within range
+        corrected_only = self.updates_store.date_range_records(date(2011, 12, 14).toordinal(), date(2011, 12, 20).toordinal())
+        self.assertGreater(len(corrected_only), 0, "Expected updates with a corrected date within the range.")
+        both_dates = self.updates_store.date_range_records(date(2011, 12, 13).toordinal(), date(2011, 12, 15).toordinal())
+        for country_code, records in both_dates.items():
+            positions = [record.position for record in records]
+            self.assertEqual(len(positions), len(set(positions)), f"Expected no duplicate updates for {country_code}.")
+
+#     @unittest.skip("")
+    def test_sort_by_date(self):
+        """ Testing the pre-sorted date orders and merge of per-country runs match a stable sort of the updates, and pages of them. """
+        def stable_sort(records_by_country, descending):
+            tagged = [(record, {**record.update, "Country Code": country_code}) for country_code, records in records_by_country.items() for record in records]
+            return [update for _, update in sorted(tagged, key=lambda item: item[0].ordinal, reverse=descending)]
+        def sort_by_date(records_by_country, descending):
+            return [self.updates_store.tagged_update(record) for record in self.updates_store.sort_by_date(records_by_country, descending=descending)]
+        subsets = [self.updates_store.records_by_country, 
+                   {country_code: self.updates_store[country_code] for country_code in ["MA", "FR", "DE", "NR"]},
+                   self.updates_store.year_records(["2016", "2012"]), 
+                   self.updates_store.date_range_records(date(2009, 8, 17).toordinal(), date(2016, 10, 16).toordinal())]
+#1.) descending and ascending, for all and subsets of the records
+        for records_by_country in subsets:
+            for descending in (True, False):
+                self.assertEqual(sort_by_date(records_by_country, descending), stable_sort(records_by_country, descending),
+                    f"Expected sorted updates to match a stable sort, descending={descending}.")
+#2.) sorted updates have the country code attribute
+        for update in sort_by_date(subsets[1], True):
+            self.assertIn(update["Country Code"], ["MA", "FR", "DE", "NR"], "Expected Country Code attribute in sorted update.")
+#3.) limit and offset select the page of the sorted records
+        for records_by_country in subsets:
+            for descending in (True, False):
+                full_sorted = self.updates_store.sort_by_date(records_by_country, descending=descending)
+                for limit, offset in [(1, 0), (20, 0), (10, 15), (5, len(full_sorted) - 2), (5, len(full_sorted) + 10)]:
+                    self.assertEqual(self.updates_store.sort_by_date(records_by_country, descending=descending, limit=limit, offset=offset), 
+                        full_sorted[offset:offset + limit], f"Expected page of sorted records for limit={limit}, offset={offset}.")
+                self.assertEqual(self.updates_store.sort_by_date(records_by_country, descending=descending, offset=3), full_sorted[3:], 
+                    "Expected sorted records after offset.")
+#4.) page starting after a record is the rest of the sorted records after it
+        for records_by_country in subsets:
+            for descending in (True, False):
+                full_sorted = self.updates_store.sort_by_date(records_by_country, descending=descending)
+                for index in [0, 7, len(full_sorted) // 2, len(full_sorted) - 1]:
+                    after = (full_sorted[index].ordinal, full_sorted[index].country_code, full_sorted[index].position)
+                    self.assertEqual(self.updates_store.sort_by_date(records_by_country, descending=descending, limit=10, after=after), 
+                        full_sorted[index + 1:index + 11], f"Expected page of sorted records after index {index}, descending={descending}.")
+        with self.assertRaises(ValueError):
+            self.updates_store.sort_by_date(subsets[1], after=(0, "AD", 0))
+#5.) no records
+        self.assertEqual(self.updates_store.sort_by_date({}), [], "Expected no sorted records.")
+
+#     @unittest.skip("")
+    def test_newest_date(self):
+        """ Testing the newest original or corrected publication date of updates and of the whole store. """
+#1.) newest date of a country's updates
+        ad_updates = self.all_iso3166_updates["AD"]
+        self.assertEqual(self.updates_store.newest_date(ad_updates), max(record.date_issued for record in self.updates_store["AD"]), 
+            "Expected newest date of Andorra's updates.")
+#2.) corrected date is newer than the original date
+        self.assertEqual(self.updates_store.newest_date([{"Date Issued": "2011-12-13 (corrected 2011-12-15)"}, {"Date Issued": "2011-12-14"}]), 
+            date(2011, 12, 15), "Expected corrected date to be the newest date.")
+#3.) updates without a publication date
+        self.assertIsNone(self.updates_store.newest_date([{"Change": "abc"}]), "Expected no newest date for updates without Date Issued.")
+        self.assertIsNone(self.updates_store.newest_date([]), "Expected no newest date for no updates.")
+#4.) newest date of all updates
+        self.assertEqual(self.updates_store.latest_date, self.updates_store.newest_date(record.update for record in self.updates_store.records), 
+            "Expected latest date of store to be the newest date of all updates.")
+
+#     @unittest.skip("")
+    def test_compact_update(self):
+        """ Testing compact updates build the original update objects, sharing their repeated strings, with a smaller footprint than the dicts. """
+        test_update = {"Change": "Addition of region.", "Description of Change": "", "Date Issued": "2016-11-15", "Source": "Online Browsing Platform (OBP)."}
+#1.) update object built in the same key order, with the Country Code appended
+        compact_update = CompactUpdate(test_update)
+        self.assertEqual(list(compact_update.to_dict().items()), list(test_update.items()), "Expected update object built from compact update.")
+        self.assertEqual(compact_update.to_dict("AD"), {**test_update, "Country Code": "AD"}, "Expected Country Code appended to update object.")
+        self.assertEqual(self.updates_store.tagged_update(self.updates_store["AD"][0]), {**self.all_iso3166_updates["AD"][0], "Country Code": "AD"}, 
+            "Expected tagged update of record.")
+        self.assertEqual(self.updates_store.updates("AD"), self.all_iso3166_updates["AD"], "Expected update objects of country.")
+#2.) missing and additional attributes
+        self.assertEqual(CompactUpdate({"Change": "abc", "Edition": "1"}).to_dict(), {"Change": "abc", "Edition": "1"}, "Expected missing attributes to be omitted.")
+#3.) repeated strings shared via the string table
+        strings = {}
+        first_update, second_update = CompactUpdate(dict(test_update), strings), CompactUpdate({key: "".join(value) for key, value in test_update.items()}, strings)
+        self.assertIs(first_update.source, second_update.source, "Expected repeated Source string to be shared.")
+        self.assertEqual(first_update, second_update, "Expected equal compact updates.")
+        sources = [record.compact_update.source for record in self.updates_store.records]
+        self.assertEqual(len({id(source) for source in sources}), len(set(sources)), "Expected each distinct Source string held once.")
+#4.) immutable
+        with self.assertRaises(AttributeError):
+            compact_update.change = "abc"
+        with self.assertRaises(AttributeError):
+            compact_update.date = "2016-11-15"
+#5.) compact updates smaller than the dicts
+        footprint = measure_footprint(self.all_iso3166_updates)
+        self.assertEqual(footprint["updates"], len(self.updates_store), "Expected footprint of every update.")
+        self.assertLess(footprint["compact_bytes"], footprint["dicts_bytes"], "Expected compact updates to be smaller than the dicts.")
+        self.assertGreater(footprint["search_index_bytes"], 0, "Expected footprint of the search index, excluding the store.")
+
+if __name__ == '__main__':
+    #run all unit tests
+    unittest.main(verbosity=2)
@@ -0,0 +1,815 @@
+import re
+import sys
+import heapq
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import date, datetime
+from functools import lru_cache
+from itertools import chain, islice
+from types import MappingProxyType
+from typing import NamedTuple
+
+'''
+The "Date Issued" attribute of each update is a YYYY-MM-DD string, optionally followed by a
+parenthesised corrected publication date, e.g "2011-12-13 (corrected 2011-12-15)". Rather than
+each endpoint re-parsing these strings on every request, the UpdatesStore below parses every
+update's publication date once, when the dataset is loaded, into an immutable UpdateRecord.
+
+Each API worker holds the whole dataset in memory, so it's held compactly: rather than a dict per
+update, each UpdateRecord holds a CompactUpdate, whose attributes are in slots, and every string
+attribute is dictionary encoded via the store's table of distinct strings, so the long "Source"
+URLs, repeated "Date Issued" strings and recurring "Change" texts are each held once, shared by all
+the updates with them. The update objects output by the API are only built from the compact updates
+when a response is serialized. Running this module with --measure reports the memory footprint of
+the dataset as plain dicts and as the compact store, as well as of the search endpoint's index of it.
+'''
+
+#attributes of an update object, in output order, and the CompactUpdate slot holding each
+_UPDATE_ATTRIBUTES = (("Change", "change"), ("Description of Change", "description"), ("Date Issued", "date_issued"), ("Source", "source"))
+
+class CompactUpdate():
+    """
+    Compact, immutable form of an update object, with its attributes held in slots rather
+    than a dict, and its strings shared with the other updates via the store's string table.
+    An attribute missing from the update is None, and any attributes other than the standard
+    ones are held as (key, value) pairs.
+
+    Parameters
+    ==========
+    :update: dict
+        update object, as it appears in the updates dataset.
+    :strings: dict (default=None)
+        table of distinct strings, each mapped to itself, that the update's strings are
+        looked up in, and added to if not present. By default the strings aren't shared.
+
+    Methods
+    =======
+    from_attributes(change, description, date_issued, source, extra):
+        create the compact update from its attribute values, e.g as read from a snapshot.
+    to_dict(country_code):
+        build the update object, as output by the API, optionally with its Country Code appended.
+    """
+    __slots__ = ("change", "description", "date_issued", "source", "extra")
+
+    def __init__(self, update: dict, strings: dict|None=None) -> None:
+
+        strings = {} if strings is None else strings
+        encode = lambda value: strings.setdefault(value, value) if isinstance(value, str) else value
+        for key, slot in _UPDATE_ATTRIBUTES:
+            object.__setattr__(self, slot, encode(update.get(key)))
+        object.__setattr__(self, "extra", tuple((sys.intern(key), encode(value)) for key, value in update.items() 
+                                                if key not in dict(_UPDATE_ATTRIBUTES)))
+
+    @classmethod
+    def from_attributes(cls, change: str|None, description: str|None, date_issued: str|None, source: str|None, extra: tuple=()) -> "CompactUpdate":
+        """ Create the compact update from its attribute values, None if missing, and (key, value) pairs of any other attributes. """
+        compact_update = cls.__new__(cls)
+        for slot, value in zip(cls.__slots__, (change, description, date_issued, source, tuple(extra))):
+            object.__setattr__(compact_update, slot, value)
+        return compact_update
+
+    def to_dict(self, country_code: str|None=None) -> dict:
+        """ Build the update object, as output by the API, with its Country Code attribute appended if input. """
+        update = {key: getattr(self, slot) for key, slot in _UPDATE_ATTRIBUTES if getattr(self, slot) is not None}
+        update.update(self.extra)
+        if (country_code is not None):
+            update["Country Code"] = country_code
+        return update
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"CompactUpdate is immutable, cannot set {name}.")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, CompactUpdate):
+            return NotImplemented
+        return all(getattr(self, slot) == getattr(other, slot) for slot in self.__slots__)
+
+    def __hash__(self) -> int:
+        return hash(tuple(getattr(self, slot) for slot in self.__slots__))
+
+    def __repr__(self) -> str:
+        return f"CompactUpdate(change={self.change!r}, date_issued={self.date_issued!r})"
+
+class UpdateRecord(NamedTuple):
+    """
+    Immutable record of a single ISO 3166 update. The update is held as a CompactUpdate,
+    alongside its pre-parsed publication date attributes, with the update object only
+    built, via the update property, when it's output.
+
+    Attributes
+    ==========
+    :country_code: str
+        ISO 3166-1 alpha-2 code of the country the update belongs to.
+    :position: int
+        index of the update within its country's list of updates.
+    :compact_update: CompactUpdate
+        compact form of the update object.
+    :date_issued: date
+        original publication date of the update.
+    :corrected_date: date|None
+        corrected publication date of the update, if applicable.
+    :year: int
+        year of the original publication date.
+    :ordinal: int
+        proleptic Gregorian ordinal of the original publication date.
+    :corrected_ordinal: int|None
+        proleptic Gregorian ordinal of the corrected publication date, if applicable.
+    """
+    country_code: str
+    position: int
+    compact_update: CompactUpdate
+    date_issued: date
+    corrected_date: date|None
+    year: int
+    ordinal: int
+    corrected_ordinal: int|None
+
+    @property
+    def update(self) -> dict:
+        """ Update object, as it appears in the updates dataset, built from the compact update. """
+        return self.compact_update.to_dict()
+
+def parse_date_issued(date_issued: str) -> tuple[date, date|None]:
+    """
+    Parse the original and, if applicable, corrected publication dates from an
+    update's "Date Issued" attribute.
+
+    Parameters
+    ==========
+    :date_issued: str
+        publication date string, e.g "2016-11-15" or "2011-12-13 (corrected 2011-12-15)".
+
+    Returns
+    =======
+    :original_date: date
+        original publication date.
+    :corrected_date: date|None
+        corrected publication date, None if there isn't one.
+
+    Raises
+    ======
+    ValueError:
+        Original or corrected date not in the expected YYYY-MM-DD format.
+    """
+    #remove "corrected" date, whitespace and any trailing full stops from the original date
+    original_date = datetime.strptime(re.sub("[(].*[)]", "", date_issued).replace(' ', "").
+                                      replace(".", '').replace('\n', ''), '%Y-%m-%d').date()
+
+    #parse corrected date from within the parentheses, if applicable
+    corrected_date = None
+    corrected_match = re.search(r"corrected\s*(\d{4}-\d{2}-\d{2})", date_issued)
+    if (corrected_match):
+        corrected_date = datetime.strptime(corrected_match.group(1), '%Y-%m-%d').date()
+
+    return original_date, corrected_date
+
+@lru_cache(maxsize=4096)
+def parse_date_issued_cached(date_issued: str) -> tuple[date, date|None]:
+    """ Parse the publication dates of a "Date Issued" string, as per parse_date_issued, caching the parsed dates of the most recent strings. """
+    return parse_date_issued(date_issued)
+
+class SnapshotRecords(Sequence):
+    """
+    Read only sequence of update records of a snapshot, read in place from its memory mapped
+    file: each record is built from its fields and strings, decoded from the mapped file, when 
+    it's accessed, rather than every record being built when the snapshot is loaded, so no copy
+    of the records is held per worker. The sequence is either the records of a range of record
+    ids, e.g a country's records, or of an array of record ids, e.g a date order.
+
+    Parameters
+    ==========
+    :snapshot: Snapshot
+        opened snapshot of the updates dataset.
+    :country_codes: tuple
+        alpha-2 codes of the snapshot's countries, indexed by country index.
+    :start: int (default=0)
+        record id of the first record of the range.
+    :length: int (default=None)
+        number of records in the range, by default all records from the start.
+    :record_ids: memoryview (default=None)
+        record ids of the records, in order, rather than a range of record ids.
+    """
+    __slots__ = ("_snapshot", "_country_codes", "_start", "_length", "_record_ids")
+
+    def __init__(self, snapshot, country_codes: tuple, start: int=0, length: int|None=None, record_ids: memoryview|None=None) -> None:
+
+        self._snapshot = snapshot
+        self._country_codes = country_codes
+        self._start = start
+        self._record_ids = record_ids
+        if (record_ids is not None):
+            self._length = len(record_ids)
+        else:
+            self._length = snapshot.record_count - start if length is None else length
+
+    def _record(self, record_id: int) -> UpdateRecord:
+        """ Build the update record of the record id from its fields and strings in the snapshot. """
+        snapshot = self._snapshot
+        country, position, change, description, date_issued, source, ordinal, corrected_ordinal, extra_start, extra_count = snapshot.record(record_id)
+        extra = ()
+        if (extra_count):
+            extras = snapshot.array("extras")
+            extra = tuple((snapshot.string(extras[2 * i]), snapshot.string(extras[2 * i + 1])) for i in range(extra_start, extra_start + extra_count))
+        original_date = date.fromordinal(ordinal)
+        corrected_date = date.fromordinal(corrected_ordinal) if corrected_ordinal else None
+        compact_update = CompactUpdate.from_attributes(snapshot.string(change), snapshot.string(description), snapshot.string(date_issued), 
+                                                       snapshot.string(source), extra)
+        return UpdateRecord(self._country_codes[country], position, compact_update, original_date, corrected_date, original_date.year, ordinal, corrected_ordinal or None)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(self._length)))
+        if (index < 0):
+            index += self._length
+        if not (0 <= index < self._length):
+            raise IndexError("SnapshotRecords index out of range.")
+        return self._record(self._record_ids[index] if self._record_ids is not None else self._start + index)
+
+    def __iter__(self):
+        return (self[index] for index in range(self._length))
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __repr__(self) -> str:
+        return f"SnapshotRecords(records={self._length})"
+
+class UpdatesStore():
+    """
+    Immutable, pre-indexed store of all ISO 3166 updates, built once from the updates
+    data when the dataset is loaded. Each update is held as an UpdateRecord with its
+    publication dates already parsed, so endpoints never have to re-parse the
+    "Date Issued" strings per request.
+
+    Parameters
+    ==========
+    :all_updates: dict
+        updates data for all countries, keyed by alpha-2 code.
+    :version: str (default="")
+        version of the updates dataset the store was built from.
+
+    Usage
+    =====
+    store = UpdatesStore(Updates().all)
+
+    #get all update records for France
+    store["FR"]
+
+    #get the year of each of Andorra's updates
+    [record.year for record in store["AD"]]
+
+    #get Andorra's update objects, as output by the API
+    store.updates("AD")
+
+    #load the store from a prebuilt snapshot instead, see snapshot.py
+    store = UpdatesStore.from_snapshot(Snapshot("iso3166-updates.snapshot"))
+    """
+    def __init__(self, all_updates: dict, version: str="") -> None:
+
+        self.version = version
+
+        #parsed original and corrected dates per distinct "Date Issued" string, shared across updates
+        parsed_dates = {}
+
+        #table of the distinct strings of all updates, each held once and shared by the compact updates
+        strings = {}
+
+        records = []
+        records_by_country = {}
+
+        #inverted index of year -> country -> positions of that country's updates issued in that year
+        year_index = {}
+
+        #iterate over all countries and their updates, creating a record per update
+        for country_code, updates in all_updates.items():
+            country_records = []
+            for position, update in enumerate(updates):
+                date_issued = update["Date Issued"]
+                if (date_issued not in parsed_dates):
+                    try:
+                        parsed_dates[date_issued] = parse_date_issued(date_issued)
+                    except ValueError:
+                        raise ValueError(f"Invalid Date Issued value for country {country_code}: {date_issued}.")
+                original_date, corrected_date = parsed_dates[date_issued]
+
+                country_records.append(UpdateRecord(sys.intern(country_code), position, CompactUpdate(update, strings), original_date, corrected_date, 
+                                                    original_date.year, original_date.toordinal(), corrected_date.toordinal() if corrected_date else None))
+                year_index.setdefault(original_date.year, {}).setdefault(country_code, []).append(position)
+
+            records_by_country[sys.intern(country_code)] = tuple(country_records)
+            records.extend(country_records)
+
+        #all records in dataset order (alphabetically by country code, then per country order)
+        self.records = tuple(records)
+        self.records_by_country = MappingProxyType(records_by_country)
+        self._parsed_dates = MappingProxyType(parsed_dates)
+        self._country_order = MappingProxyType({country_code: i for i, country_code in enumerate(records_by_country)})
+
+        #timeline of (date ordinal, country, position) entries sorted by date, an update has an entry for its original 
+        #date and another for its corrected date, if applicable, held as parallel sequences, the ordinals for binary searching
+        timeline = sorted(((ordinal, self._country_order[record.country_code], record.position) for record in records
+                           for ordinal in {record.ordinal, record.corrected_ordinal} if ordinal is not None))
+        self.timeline_ordinals = tuple(entry[0] for entry in timeline)
+        self.timeline_countries = tuple(entry[1] for entry in timeline)
+        self.timeline_positions = tuple(entry[2] for entry in timeline)
+
+        #alpha-2 codes of all countries in dataset order
+        self.country_codes = tuple(records_by_country)
+
+        #newest original or corrected publication date of all updates, None if there are no updates
+        self.latest_date = date.fromordinal(self.timeline_ordinals[-1]) if self.timeline_ordinals else None
+
+        #per country sub-timelines of (date ordinals, positions), sorted by date
+        timelines_by_country = {country_code: ([], []) for country_code in records_by_country}
+        for ordinal, country_index, position in timeline:
+            country_ordinals, country_positions = timelines_by_country[self.country_codes[country_index]]
+            country_ordinals.append(ordinal)
+            country_positions.append(position)
+        self.timelines_by_country = MappingProxyType({country_code: (tuple(country_ordinals), tuple(country_positions))
+                                                      for country_code, (country_ordinals, country_positions) in timelines_by_country.items()})
+
+        #all records pre-sorted by original publication date, ascending and descending, with updates published on 
+        #the same date kept in dataset order, as per a stable sort
+        self.date_order_asc = tuple(sorted(records, key=lambda record: record.ordinal))
+        self.date_order_desc = tuple(sorted(records, key=lambda record: record.ordinal, reverse=True))
+
+        #rank of each update within its country's updates sorted by date, ascending and descending, indexed by position
+        date_ranks = {}
+        for country_code, country_records in records_by_country.items():
+            ranks_asc, ranks_desc = [0] * len(country_records), [0] * len(country_records)
+            for rank, record in enumerate(sorted(country_records, key=lambda record: record.ordinal)):
+                ranks_asc[record.position] = rank
+            for rank, record in enumerate(sorted(country_records, key=lambda record: record.ordinal, reverse=True)):
+                ranks_desc[record.position] = rank
+            date_ranks[country_code] = (tuple(ranks_asc), tuple(ranks_desc))
+        self.date_ranks = MappingProxyType(date_ranks)
+
+        #freeze year index, distinct years kept in ascending order
+        self.year_index = MappingProxyType({year: MappingProxyType({country_code: tuple(positions) for country_code, positions in year_index[year].items()})
+                                            for year in sorted(year_index)})
+        self.years = tuple(self.year_index)
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "UpdatesStore":
+        """
+        Load the store from a binary snapshot of its records and indexes, as written by 
+        snapshot.write_snapshot, rather than building it from the updates data. The date 
+        timeline, per country timelines, date ranks and year index are the snapshot's arrays, 
+        memoryviews over its memory mapped file, and the records, each country's records and
+        the date orders are SnapshotRecords, building each record from its fields and strings
+        in the mapped file when it's accessed. No JSON or "Date Issued" strings are parsed, no
+        records are sorted, and no records or strings are copied into the worker on load.
+
+        Parameters
+        ==========
+        :snapshot: Snapshot
+            opened snapshot of the updates dataset.
+
+        Returns
+        =======
+        :updates_store: UpdatesStore
+            store of the snapshot's records and indexes.
+        """
+        store = cls.__new__(cls)
+        store.version = snapshot.version
+        countries = snapshot.array("countries")
+        store.country_codes = tuple(sys.intern(snapshot.string(countries[i])) for i in range(0, len(countries), 3))
+        store._country_order = MappingProxyType({country_code: i for i, country_code in enumerate(store.country_codes)})
+
+        #records, each country's records and the date orders, read in place from the snapshot
+        store.records = SnapshotRecords(snapshot, store.country_codes)
+        store.records_by_country = MappingProxyType({store.country_codes[i // 3]: SnapshotRecords(snapshot, store.country_codes, countries[i + 1], countries[i + 2])
+                                                     for i in range(0, len(countries), 3)})
+        store.date_order_asc = SnapshotRecords(snapshot, store.country_codes, record_ids=snapshot.array("date_order_asc"))
+        store.date_order_desc = SnapshotRecords(snapshot, store.country_codes, record_ids=snapshot.array("date_order_desc"))
+
+        #"Date Issued" strings are parsed when their dates are first needed, see dates_of
+        store._parsed_dates = MappingProxyType({})
+
+        #date timeline, read in place from the snapshot
+        store.timeline_ordinals = snapshot.array("timeline_ordinals")
+        store.timeline_countries = snapshot.array("timeline_countries")
+        store.timeline_positions = snapshot.array("timeline_positions")
+        store.latest_date = date.fromordinal(store.timeline_ordinals[-1]) if len(store.timeline_ordinals) else None
+
+        #per country timelines and date ranks, slices of the snapshot's arrays
+        country_timelines, country_ordinals, country_positions = snapshot.array("country_timelines"), snapshot.array("country_timeline_ordinals"), snapshot.array("country_timeline_positions")
+        store.timelines_by_country = MappingProxyType({country_code: (country_ordinals[country_timelines[2 * i]:country_timelines[2 * i] + country_timelines[2 * i + 1]],
+                                                                      country_positions[country_timelines[2 * i]:country_timelines[2 * i] + country_timelines[2 * i + 1]])
+                                                       for i, country_code in enumerate(store.country_codes)})
+        date_ranks_asc, date_ranks_desc = snapshot.array("date_ranks_asc"), snapshot.array("date_ranks_desc")
+        store.date_ranks = MappingProxyType({store.country_codes[i // 3]: (date_ranks_asc[countries[i + 1]:countries[i + 1] + countries[i + 2]], 
+                                                                            date_ranks_desc[countries[i + 1]:countries[i + 1] + countries[i + 2]])
+                                             for i in range(0, len(countries), 3)})
+
+        #year index, each year's countries' positions being slices of the snapshot's array
+        years, year_positions = snapshot.array("years"), snapshot.array("year_positions")
+        year_index = {}
+        for i in range(0, len(years), 4):
+            year_index.setdefault(years[i], {})[store.country_codes[years[i + 1]]] = year_positions[years[i + 2]:years[i + 2] + years[i + 3]]
+        store.year_index = MappingProxyType({year: MappingProxyType(year_index[year]) for year in sorted(year_index)})
+        store.years = tuple(store.year_index)
+        return store
+
+    def dates_of(self, date_issued: str) -> tuple[date, date|None]:
+        """
+        Get the parsed original and corrected publication dates for a "Date Issued"
+        string. Dates seen at load time are returned from the store, otherwise the
+        string is parsed, the parsed dates of recent strings being cached, e.g for a
+        store loaded from a snapshot, which doesn't parse any strings on load.
+
+        Parameters
+        ==========
+        :date_issued: str
+            publication date string of an update.
+
+        Returns
+        =======
+        :original_date: date
+            original publication date.
+        :corrected_date: date|None
+            corrected publication date, None if there isn't one.
+        """
+        parsed = self._parsed_dates.get(date_issued)
+        if (parsed is None):
+            parsed = parse_date_issued_cached(date_issued)
+        return parsed
+
+    def newest_date(self, updates) -> date|None:
+        """
+        Get the newest original or corrected publication date of the input updates, 
+        e.g for the Last-Modified date of a response. Updates without a "Date Issued" 
+        attribute are skipped. Update records are read via their pre-parsed dates.
+
+        Parameters
+        ==========
+        :updates: iterable
+            update objects or update records.
+
+        Returns
+        =======
+        :newest_date: date|None
+            newest publication date, None if no updates have a publication date.
+        """
+        newest = None
+        for update in updates:
+            if isinstance(update, UpdateRecord):
+                latest = max(update.date_issued, update.corrected_date) if update.corrected_date else update.date_issued
+                if (newest is None or latest > newest):
+                    newest = latest
+                continue
+            date_issued = update.get("Date Issued") if isinstance(update, dict) else None
+            if not date_issued:
+                continue
+            try:
+                original_date, corrected_date = self.dates_of(date_issued)
+            except ValueError:
+                continue
+            latest = max(original_date, corrected_date) if corrected_date else original_date
+            if (newest is None or latest > newest):
+                newest = latest
+        return newest
+
+    def select_years(self, year: list, year_range: bool=False, year_greater_than: bool=False, year_less_than: bool=False,
+                     year_not_equal: bool=False) -> list[int]:
+        """
+        Get the distinct years in the year index that match the parsed year parameter,
+        as output by the validate_year function. Years are compared as strings, as
+        per the year parameter. In the case of a list of years, a year is repeated
+        as many times as it is input.
+
+        Parameters
+        ==========
+        :year: list
+            parsed and validated list of year strings.
+        :year_range: bool (default=False)
+            get years within the range of the 2 years, inclusive.
+        :year_greater_than: bool (default=False)
+            get years greater than or equal to the year.
+        :year_less_than: bool (default=False)
+            get years less than the year.
+        :year_not_equal: bool (default=False)
+            get years not equal to any of the years.
+
+        Returns
+        =======
+        :selected_years: list
+            years in the year index matching the year parameter, ascending.
+        """
+        selected_years = []
+        for year_ in self.years:
+            temp_year = str(year_)
+            if (year_range):
+                if (temp_year >= year[0] and temp_year <= year[1]):
+                    selected_years.append(year_)
+            elif (year_greater_than):
+                if (temp_year >= year[0]):
+                    selected_years.append(year_)
+            elif (year_less_than):
+                if (temp_year < year[0]):
+                    selected_years.append(year_)
+            elif (year_not_equal):
+                if (temp_year not in year):
+                    selected_years.append(year_)
+            else:
+                selected_years.extend([year_] * year.count(temp_year))
+
+        return selected_years
+
+    def year_records(self, year: list, year_range: bool=False, year_greater_than: bool=False, year_less_than: bool=False,
+                     year_not_equal: bool=False, country_codes: list|None=None) -> dict[str, list[UpdateRecord]]:
+        """
+        Get the update records published in the years matching the parsed year parameter,
+        grouped per country, using the year index. Only the buckets of the matching years
+        are visited, so the cost is proportional to the size of the result rather than the
+        size of the dataset.
+
+        Parameters
+        ==========
+        :year: list
+            parsed and validated list of year strings, as output by validate_year.
+        :year_range: bool (default=False)
+            get updates within the range of the 2 years, inclusive.
+        :year_greater_than: bool (default=False)
+            get updates greater than or equal to the year.
+        :year_less_than: bool (default=False)
+            get updates less than the year.
+        :year_not_equal: bool (default=False)
+            get updates not equal to any of the years.
+        :country_codes: list|None (default=None)
+            alpha-2 codes to restrict the updates to, the output follows their order. By
+            default the updates for all countries are returned, ordered by country code.
+
+        Returns
+        =======
+        :year_records: dict
+            update records per country, in their per country order, countries without any
+            matching updates are excluded.
+        """
+        return self.records_at(self.year_positions(year, year_range, year_greater_than, year_less_than, year_not_equal, country_codes))
+
+    def year_positions(self, year: list, year_range: bool=False, year_greater_than: bool=False, year_less_than: bool=False,
+                       year_not_equal: bool=False, country_codes: list|None=None) -> dict[str, list[int]]:
+        """ 
+        Get the per country positions of the update records published in the years matching the parsed year parameter, 
+        as per year_records, without building the records, e.g for a store loaded from a snapshot, whose records are 
+        built as they're accessed.
+        """
+        selected_years = self.select_years(year, year_range, year_greater_than, year_less_than, year_not_equal)
+
+        #union of the positions in each matching year bucket, per country
+        if (country_codes is None):
+            positions_by_country = {}
+            for year_ in selected_years:
+                for country_code, positions in self.year_index[year_].items():
+                    positions_by_country.setdefault(country_code, []).extend(positions)
+            country_codes = sorted(positions_by_country, key=self._country_order.__getitem__)
+        else:
+            positions_by_country = {country_code: list(chain.from_iterable(self.year_index[year_].get(country_code, ()) for year_ in selected_years))
+                                    for country_code in country_codes}
+
+        return {country_code: sorted(positions_by_country[country_code]) for country_code in country_codes if positions_by_country.get(country_code)}
+
+    def date_range_records(self, start_ordinal: int, end_ordinal: int, country_codes: list|None=None) -> dict[str, list[UpdateRecord]]:
+        """
+        Get the update records whose original or corrected publication date falls within
+        the input date range, inclusive, grouped per country. The range is found using 
+        two binary searches over the date timeline, or each country's sub-timeline, so 
+        the cost is O(log n + k) for k matching updates. An update whose original and 
+        corrected dates are both within the range is only returned once.
+
+        Parameters
+        ==========
+        :start_ordinal: int
+            proleptic Gregorian ordinal of the start date of the range.
+        :end_ordinal: int
+            proleptic Gregorian ordinal of the end date of the range.
+        :country_codes: list|None (default=None)
+            alpha-2 codes to restrict the updates to, the output follows their order. By
+            default the updates for all countries are returned, ordered by country code.
+
+        Returns
+        =======
+        :date_range_records: dict
+            update records per country, in their per country order, countries without any
+            matching updates are excluded.
+        """
+        return self.records_at(self.date_range_positions(start_ordinal, end_ordinal, country_codes))
+
+    def date_range_positions(self, start_ordinal: int, end_ordinal: int, country_codes: list|None=None) -> dict[str, list[int]]:
+        """ 
+        Get the per country positions of the update records whose original or corrected publication date falls within the 
+        input date range, inclusive, as per date_range_records, without building the records.
+        """
+        positions_by_country = {}
+
+        #slice of the global timeline between the start and end dates
+        if (country_codes is None):
+            lower, upper = bisect_left(self.timeline_ordinals, start_ordinal), bisect_right(self.timeline_ordinals, end_ordinal)
+            for country_index, position in zip(self.timeline_countries[lower:upper], self.timeline_positions[lower:upper]):
+                positions_by_country.setdefault(country_index, set()).add(position)
+            country_codes = [self.country_codes[country_index] for country_index in sorted(positions_by_country)]
+            positions_by_country = {self.country_codes[country_index]: positions for country_index, positions in positions_by_country.items()}
+        #slice of each country's sub-timeline between the start and end dates
+        else:
+            for country_code in country_codes:
+                country_ordinals, country_positions = self.timelines_by_country.get(country_code, ((), ()))
+                lower, upper = bisect_left(country_ordinals, start_ordinal), bisect_right(country_ordinals, end_ordinal)
+                positions_by_country[country_code] = set(country_positions[lower:upper])
+
+        return {country_code: sorted(positions_by_country[country_code]) for country_code in country_codes if positions_by_country.get(country_code)}
+
+    def records_at(self, positions_by_country: dict[str, list[int]]) -> dict[str, list[UpdateRecord]]:
+        """ Get the update records at the per country positions, e.g as output by year_positions, grouped per country. """
+        records_by_country = {}
+        for country_code, positions in positions_by_country.items():
+            country_records = self.records_by_country[country_code]
+            records_by_country[country_code] = [country_records[position] for position in positions]
+        return records_by_country
+
+    def sort_by_date(self, records_by_country: dict, descending: bool=True, limit: int|None=None, offset: int=0,
+                     after: tuple[int, str, int]|None=None) -> list[UpdateRecord]:
+        """
+        Sort update records by their original publication date. If the full dataset of
+        records is input then the pre-sorted order is returned, otherwise each country's
+        records are ordered by their pre-computed per country date ranks and the resulting
+        runs are combined using a k-way merge. Updates published on the same date keep the
+        order of the input countries, then their per country order, as per a stable sort.
+
+        If a limit is input, only the page of sorted records from offset to offset+limit
+        is produced: the pre-sorted order is sliced, or the merge stops once the page is
+        full, with each run truncated to the page's end as no run can contribute more.
+
+        The sorted order is a total order on the (date, input country, position) key of each
+        record, so a page can also be started after the key of the last record of a previous 
+        page, as per keyset pagination. The start of the page is found by a binary search of
+        the pre-sorted order, or of each run, rather than skipping all the records before it.
+
+        Parameters
+        ==========
+        :records_by_country: dict
+            update records per country, e.g the output of year_records. The store's own 
+            records_by_country mapping can be input to sort the full dataset.
+        :descending: bool (default=True)
+            sort latest first, else earliest first.
+        :limit: int (default=None)
+            maximum number of sorted records to output, all records output if None.
+        :offset: int (default=0)
+            number of sorted records to skip before outputting.
+        :after: tuple (default=None)
+            (date ordinal, country code, position) of the record the page starts after, 
+            e.g the last record of the previous page, by default the page starts from the
+            first sorted record.
+
+        Returns
+        =======
+        :sorted_records: list
+            flattened list of update records sorted by publication date.
+
+        Raises
+        ======
+        ValueError:
+            the country of the after record isn't in the input records.
+        """
+        #end index of the page of sorted records
+        stop = None if limit is None else offset + limit
+
+        #index of each input country, the tie breaker between updates published on the same date
+        if (records_by_country is self.records_by_country):
+            country_order = self._country_order
+        else:
+            country_order = {country_code: i for i, country_code in enumerate(records_by_country)} if after is not None else {}
+
+        #sort key of the record the page starts after
+        if (after is not None):
+            after_ordinal, after_country_code, after_position = after
+            if (after_country_code not in country_order):
+                raise ValueError(f"Country code of the record to start after not found in the input records: {after_country_code}.")
+            after_key = (-after_ordinal if descending else after_ordinal, country_order[after_country_code], after_position)
+            sort_key = lambda record: (-record.ordinal if descending else record.ordinal, country_order[record.country_code], record.position)
+
+        #full dataset, return page of the pre-sorted records, starting after the after record
+        if (records_by_country is self.records_by_country):
+            date_order = self.date_order_desc if descending else self.date_order_asc
+            start = 0 if after is None else bisect_right(date_order, after_key, key=sort_key)
+            return list(date_order[start + offset:None if stop is None else start + stop])
+
+        #order each country's records by date using their pre-computed ranks, dropping those up to the after record
+        runs = []
+        for country_code, records in records_by_country.items():
+            ranks = self.date_ranks[country_code][1 if descending else 0]
+            run = sorted(records, key=lambda record: ranks[record.position])
+            if (after is not None):
+                run = run[bisect_right(run, after_key, key=sort_key):]
+            runs.append(run[:stop])
+
+        #lazy k-way merge of the per country runs, on ties earlier runs are output first, stopping once the page is full
+        if (descending):
+            merged = heapq.merge(*runs, key=lambda record: -record.ordinal)
+        else:
+            merged = heapq.merge(*runs, key=lambda record: record.ordinal)
+        return list(islice(merged, offset, stop))
+
+    def country_index(self, country_code: str) -> int:
+        """ Get the index of a country in the dataset order of countries, via its alpha-2 code. """
+        return self._country_order[country_code]
+
+    def tagged_update(self, record: UpdateRecord) -> dict:
+        """ Get the update object of an update record with its Country Code attribute appended, as output when sorting by date. """
+        return record.compact_update.to_dict(record.country_code)
+
+    def updates(self, country_code: str) -> list[dict]:
+        """ Get the update objects of a country using its alpha-2 code, as they appear in the updates dataset. """
+        return [record.update for record in self.records_by_country[country_code]]
+
+    def __getitem__(self, country_code: str) -> tuple[UpdateRecord, ...]:
+        """ Get all update records for a country using its alpha-2 code. """
+        return self.records_by_country[country_code]
+
+    def __contains__(self, country_code: str) -> bool:
+        return country_code in self.records_by_country
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __repr__(self) -> str:
+        return f"UpdatesStore(version={self.version!r}, countries={len(self.records_by_country)}, records={len(self.records)})"
+
+def deep_sizeof(obj, seen: set|None=None) -> int:
+    """
+    Get the memory footprint of an object in bytes, the size of the object plus the sizes of all
+    the objects it references, via its items or slots, each shared object only counted once.
+
+    Parameters
+    ==========
+    :obj: object
+        object to measure.
+    :seen: set (default=None)
+        ids of the objects already counted, by default none.
+
+    Returns
+    =======
+    :size: int
+        memory footprint in bytes.
+    """
+    seen = set() if seen is None else seen
+    size = 0
+    objs = [obj]
+    while objs:
+        obj = objs.pop()
+        if (id(obj) in seen or isinstance(obj, type)):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, (dict, MappingProxyType)):
+            objs.extend(obj.keys())
+            objs.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            objs.extend(obj)
+        elif isinstance(obj, (date, str, bytes, int, float)) or obj is None:
+            continue
+        elif hasattr(obj, "__slots__"):
+            objs.extend(getattr(obj, slot) for slot in obj.__slots__ if hasattr(obj, slot))
+        if hasattr(obj, "__dict__"):
+            objs.append(vars(obj))
+    return size
+
+def measure_footprint(all_updates: dict) -> dict:
+    """
+    Measure the memory footprint of the updates dataset as plain dicts, i.e each update's dict and
+    its strings, and as the compact updates of an UpdatesStore built from it, as well as the footprint
+    of the store's update records as a whole, i.e with their pre-parsed dates, and of the SearchIndex
+    of the store, excluding the store itself.
+
+    Parameters
+    ==========
+    :all_updates: dict
+        updates data for all countries, keyed by alpha-2 code.
+
+    Returns
+    =======
+    :footprint: dict
+        number of updates, the bytes of the dicts, of the compact updates and the ratio of the two, and the bytes of the records 
+        and of the search index.
+    """
+    from search_index import SearchIndex
+
+    updates_store = UpdatesStore(all_updates)
+    dicts_size = deep_sizeof(all_updates)
+    compact_size = deep_sizeof([record.compact_update for record in updates_store.records])
+    return {"updates": len(updates_store), "dicts_bytes": dicts_size, "compact_bytes": compact_size, "ratio": round(compact_size / dicts_size, 3),
+            "records_bytes": deep_sizeof(updates_store.records_by_country), "search_index_bytes": deep_sizeof(SearchIndex(updates_store), {id(updates_store)})}
+
+if __name__ == "__main__":
+    if ("--measure" in sys.argv[1:]):
+        from iso3166_updates import Updates
+
+        #report the memory footprint of the updates dataset as plain dicts, before, and as compact records, after
+        footprint = measure_footprint(Updates().all)
+        print(f"updates: {footprint['updates']}")
+        print(f"before (dicts): {footprint['dicts_bytes']:,} bytes")
+        print(f"after (compact updates): {footprint['compact_bytes']:,} bytes ({footprint['ratio']:.1%})")
+        print(f"update records, with their pre-parsed dates: {footprint['records_bytes']:,} bytes")
+        print(f"search index: {footprint['search_index_bytes']:,} bytes")
+    else:
+        print("usage: python updates_store.py --measure")